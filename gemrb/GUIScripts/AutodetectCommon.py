@@ -16,22 +16,49 @@
 # Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 #
 
+# AutodetectCommon.py - game type detection shared by the */Autodetect.py
+# the core runs each of those, which add their signature through AddSignature.
+# Files are looked up in one index of GamePath and GamePath/data, with the
+# resource manager as fallback, so every file is probed only once. The hints
+# are stored with the mtimes of the game and script dirs and of the dirs and
+# key file the fallback searches (see SaveResult), so restarting the same
+# install just replays them.
+
 import os
 import GemRB
-from GUIDefines import SV_GAMEPATH
+from GUIDefines import SV_GAMEPATH, SV_SAVEPATH, SV_OVERRIDEPATH, SV_CDPATHS
 
-fdict = {}
+# bump when a signature changes, so stored results are redone
+Version = 1
+ResultFile = "gemrb-autodetect.txt"
 
-# Create dict of files in GamePath and GamePath/data
 GamePath = GemRB.GetSystemVariable (SV_GAMEPATH)
-for file in os.listdir (GamePath):
-    ufile = file.upper()
-    if ufile == 'DATA':
-        for file2 in os.listdir (os.path.join(GamePath, file)):
-            fdict[file2.upper()] = 1
-    else:
-        fdict[ufile] = 1
+fdict = None
+Resources = {}
+
+# result of this detection: (type, weight) of every matching signature and
+# the GemRB attributes set by them
+Hints = []
+Flags = {}
+# hints replayed from an earlier start, False if there were none
+Stored = None
+
+# Create dict of files in GamePath and GamePath/data
+def GetFileIndex ():
+    global fdict
 
+    if fdict is not None:
+        return fdict
+
+    fdict = {}
+    for file in os.listdir (GamePath):
+        ufile = file.upper()
+        if ufile == 'DATA':
+            for file2 in os.listdir (os.path.join(GamePath, file)):
+                fdict[file2.upper()] = 1
+        else:
+            fdict[ufile] = 1
+    return fdict
 
 #
 # Return True if all given files/resrefs exist
@@ -40,10 +67,92 @@ for file in os.listdir (GamePath):
 #
 
 def CheckFiles(files):
+    index = GetFileIndex ()
     for name, ext, ftype in files:
-        res = (name+'.'+ext).upper() in fdict or GemRB.HasResource (name, ftype)
-        if not res:
+        if (name+'.'+ext).upper() in index:
+            continue
+        key = (name.upper(), ftype)
+        if key not in Resources:
+            Resources[key] = GemRB.HasResource (name, ftype)
+        if not Resources[key]:
             return False
 
     return True
 
+def AddSignature (gameType, weight, files, flags = {}):
+    """Hints gameType with weight if all its files are present.
+
+    flags maps GemRB attributes to files, which set them when present too.
+    The attributes are always set, False if the signature didn't match."""
+
+    if not LoadResult () and CheckFiles (files):
+        Hints.append ((gameType, weight))
+        GemRB.AddGameTypeHint (gameType, weight)
+        for flag, flagFiles in flags.items ():
+            Flags[flag] = CheckFiles (flagFiles)
+
+    for flag in flags:
+        setattr (GemRB, flag, Flags.get (flag, False))
+
+def GetResultPath ():
+    path = GemRB.GetSystemVariable (SV_SAVEPATH)
+    if not isinstance (path, str):
+        return None
+    return os.path.join (path, ResultFile)
+
+def GetResultKey ():
+    stamps = []
+    paths = [GamePath, os.path.dirname (os.path.abspath (__file__))]
+    paths += [os.path.join (GamePath, data) for data in ("data", "Data", "DATA")]
+    # where HasResource looks, besides the bifs listed in chitin.key
+    paths += [GemRB.GetSystemVariable (SV_OVERRIDEPATH), os.path.join (GamePath, "chitin.key")]
+    paths += list(GemRB.GetSystemVariable (SV_CDPATHS))
+    for path in paths:
+        try:
+            stamps.append (str (os.stat (path).st_mtime_ns))
+        except OSError:
+            stamps.append ("-")
+    return "\t".join ([str(Version), GamePath] + stamps)
+
+def LoadResult ():
+    """Replays a stored detection of this install, only reading it once."""
+    global Stored
+
+    if Stored is not None:
+        return Stored
+
+    Stored = False
+    path = GetResultPath ()
+    try:
+        with open (path) as f:
+            lines = f.read ().split ("\n")
+    except (OSError, TypeError):
+        return Stored
+
+    if lines[0] != GetResultKey ():
+        return Stored
+
+    for line in lines[1:]:
+        fields = line.split ("\t")
+        if fields[0] == "hint":
+            GemRB.AddGameTypeHint (fields[1], int (fields[2]))
+        elif fields[0] == "flag":
+            Flags[fields[1]] = fields[2] == "1"
+    Stored = True
+    return Stored
+
+def SaveResult ():
+    """Stores a fresh detection for the next start, called once the game type is set."""
+
+    path = GetResultPath ()
+    if Stored or not Hints or not path:
+        return
+
+    lines = [GetResultKey ()]
+    lines += ["hint\t%s\t%d" % hint for hint in Hints]
+    lines += ["flag\t%s\t%d" % (flag, value) for flag, value in Flags.items ()]
+    try:
+        with open (path, "w") as f:
+            f.write ("\n".join (lines) + "\n")
+    except OSError:
+        pass
@@ -0,0 +1,187 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# Bytecode.py - optional precompiled startup of the GUIScripts
+# by default every launch compiles the scripts from source; the environment
+# variable GEMRB_BYTECODE selects one of the alternatives:
+# - "cache": keep bytecode in the usual __pycache__ directories or below
+#   GEMRB_BYTECODE_PATH. BuildCache precompiles everything with source
+#   hashes, so edited scripts are detected even if their mtime is unreliable
+# - "bundle": import from zips made by BuildBundle, which are looked up in
+#   GEMRB_BYTECODE_PATH or this directory. bytecode-common.zip holds the
+#   shared scripts Main.py imports before the game type is known, while
+#   bytecode-<gametype>.zip has everything the game uses. A bundle records
+#   the size and mtime of its sources and is ignored as soon as any of them
+#   changes, so the scripts are compiled from source again
+#
+# set GEMRB_BYTECODE_REPORT to print a summary of the startup, which the
+# console command "bytecode()" shows too
+#
+# only the standard library may be imported here, since this runs before
+# anything else is set up
+
+import importlib.util
+import marshal
+import os
+import sys
+import time
+import zipfile
+
+Mode = None
+Verbose = False
+BundlePaths = []
+Summary = None
+StartTime = time.perf_counter ()
+StartWallTime = time.time ()
+
+ScriptsDir = os.path.dirname (os.path.abspath (__file__))
+# game types sharing the scripts of another, like the core does
+GameDirs = {"how": "iwd", "bg2ee": "bg2"}
+ManifestName = "MANIFEST"
+
+def Setup ():
+	"""Selects the startup mode. Run from Main.py before the bulk of the imports."""
+	global Mode, Verbose
+
+	Verbose = bool(os.environ.get ("GEMRB_BYTECODE_REPORT"))
+	Mode = os.environ.get ("GEMRB_BYTECODE")
+	if Mode == "cache":
+		path = os.environ.get ("GEMRB_BYTECODE_PATH")
+		if path:
+			sys.pycache_prefix = path
+		sys.dont_write_bytecode = False
+	elif Mode == "bundle":
+		# the game type is only known later, so start with the shared scripts
+		UseBundle (None)
+	else:
+		Mode = None
+
+def GetSourceDirs (gameType):
+	"""Returns the script directories in import order, the game specific one first.
+
+	With no gameType, only the shared scripts are returned."""
+
+	if not gameType:
+		return [ScriptsDir]
+
+	gameDir = os.path.join (ScriptsDir, GameDirs.get (gameType, gameType))
+	if os.path.isdir (gameDir):
+		return [gameDir, ScriptsDir]
+	return [ScriptsDir]
+
+def GetSources (gameType):
+	"""Maps module names to their source files, as the import system would resolve them."""
+
+	sources = {}
+	for path in GetSourceDirs (gameType):
+		for name in os.listdir (path):
+			if not name.endswith (".py"):
+				continue
+			sources.setdefault (name[:-3], os.path.join (path, name))
+	return sources
+
+def GetManifest (sources):
+	lines = []
+	for module in sorted (sources):
+		stat = os.stat (sources[module])
+		lines.append ("%s\t%s\t%d\t%d" % (module, sources[module], stat.st_size, stat.st_mtime_ns))
+	return "\n".join (lines)
+
+def GetBundlePath (gameType):
+	path = os.environ.get ("GEMRB_BYTECODE_PATH") or ScriptsDir
+	return os.path.join (path, "bytecode-" + (gameType or "common") + ".zip")
+
+def UseBundle (gameType):
+	"""Puts the bundle in front of the import path, if it matches the sources.
+
+	A game bundle takes precedence over the shared one, like its scripts do."""
+
+	if Mode != "bundle":
+		return False
+
+	path = GetBundlePath (gameType)
+	try:
+		with zipfile.ZipFile (path) as bundle:
+			manifest = bundle.read (ManifestName).decode ("utf-8")
+	except (OSError, KeyError, zipfile.BadZipFile):
+		print ("Bytecode: no usable bundle at " + path + ", using the sources")
+		return False
+
+	if manifest != GetManifest (GetSources (gameType)):
+		print ("Bytecode: the sources changed since " + path + " was built, using them instead")
+		return False
+
+	sys.path.insert (0, path)
+	BundlePaths.append (path)
+	return True
+
+def BuildBundle (gameType, path=None):
+	"""Compiles the scripts of gameType (or the shared ones, if None) into a zip of bytecode."""
+
+	path = path or GetBundlePath (gameType)
+	sources = GetSources (gameType)
+	with zipfile.ZipFile (path, "w", zipfile.ZIP_DEFLATED) as bundle:
+		for module, source in sources.items ():
+			with open (source, "rb") as f:
+				data = f.read ()
+			code = compile (data, source, "exec", dont_inherit=True)
+			# unchecked hash based pyc, the manifest does the validation
+			header = importlib.util.MAGIC_NUMBER + (1).to_bytes (4, "little") + importlib.util.source_hash (data)
+			bundle.writestr (module + ".pyc", header + marshal.dumps (code))
+		bundle.writestr (ManifestName, GetManifest (sources))
+	return path
+
+def BuildCache (gameType):
+	"""Precompiles every script into the bytecode cache, validated by source hash."""
+
+	import compileall
+	import py_compile
+
+	ok = True
+	for path in GetSourceDirs (gameType):
+		ok = compileall.compile_dir (path, maxlevels=0, quiet=1, invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH) and ok
+	return ok
+
+def LoadedFromBytecode (module):
+	path = getattr (module, "__file__", None) or ""
+	if any (path.startswith (bundle) for bundle in BundlePaths):
+		return True
+
+	cached = getattr (module, "__cached__", None)
+	if Mode != "cache" or not cached:
+		return False
+	# anything written during this run was compiled from source
+	try:
+		return os.stat (cached).st_mtime < StartWallTime
+	except OSError:
+		return False
+
+def Finish ():
+	"""Records the startup summary, once all the startup scripts are loaded. Run from Main.Init."""
+	global Summary
+
+	def IsScript (m):
+		path = getattr (m, "__file__", None)
+		return path and (path.startswith (ScriptsDir) or any (path.startswith (bundle) for bundle in BundlePaths))
+
+	scripts = [m for m in list(sys.modules.values ()) if IsScript (m)]
+	precompiled = sum (1 for m in scripts if LoadedFromBytecode (m))
+	elapsed = (time.perf_counter () - StartTime) * 1000
+	Summary = "Bytecode: %d scripts loaded in %.1f ms, %d of them precompiled (mode: %s)" % (len(scripts), elapsed, precompiled, Mode or "source")
+	if Verbose:
+		print (Summary)
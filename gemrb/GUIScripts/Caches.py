@@ -0,0 +1,54 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# Caches.py - bookkeeping for the script-side caches of game data
+# modules register a reset function, which is run whenever a game is loaded
+# or an expansion enabled, since either can bring different data along
+
+import GemRB
+
+ResetHandlers = []
+
+def Register (handler):
+	"""Runs handler every time a game is loaded or an expansion enabled. Usable as a decorator."""
+
+	if handler not in ResetHandlers:
+		ResetHandlers.append (handler)
+	return handler
+
+def Reset ():
+	for handler in ResetHandlers:
+		handler ()
+
+def Install ():
+	"""Hooks Reset into GemRB.LoadGame and GemRB.GameSetExpansion, so no caller needs to remember it."""
+
+	for name in ("LoadGame", "GameSetExpansion"):
+		EngineFunction = getattr (GemRB, name)
+		if getattr (EngineFunction, "ResetsCaches", False):
+			continue
+		setattr (GemRB, name, ResetFirst (EngineFunction))
+
+def ResetFirst (EngineFunction):
+	def wrapper (*args):
+		Reset ()
+		return EngineFunction (*args)
+
+	wrapper.ResetsCaches = True
+	wrapper.__doc__ = EngineFunction.__doc__
+	return wrapper
@@ -17,8 +17,13 @@
 #
 # the place for preloading the most commonly used tables
 # helps with code deduplication, reduced log spam and tiny lookup savings
+import bisect
+import re
+
 import GemRB
+import Caches
 from ie_restype import RES_2DA
+from GUIDefines import GTV_STR, GTV_INT
 
 # these two are only used in SetEncumbranceLabels, but that is called very often
 StrMod = StrModEx = None
@@ -28,34 +33,242 @@ WeapProfs = CharProfs = None
 
 Loaded = False
 
-def Load():
+# mimics strtol with base 0, which is what the engine uses to decide if a field is numeric
+_NumberPattern = re.compile (r"\s*([+-]?)(0[xX][0-9a-fA-F]+|0[0-7]*|[1-9][0-9]*)")
+
+def _ParseNumber (field):
+	match = _NumberPattern.match (field)
+	if not match:
+		return None
+	sign, digits = match.groups ()
+	if digits[0:2] in ("0x", "0X"):
+		value = int (digits, 16)
+	else:
+		value = int (digits, 8 if digits[0] == "0" else 10)
+	return -value if sign == "-" else value
+
+class CachedTable(object):
+	"""Read-only snapshot of a GTable with the same lookup methods.
+
+	All the cells are copied over on first use, so lookups don't cross into
+	the engine anymore and FindValue is a dictionary lookup instead of a scan.
+	Value types that need the engine (GTV_STAT, GTV_REF) are still passed through."""
+
+	def __init__(self, table):
+		self.Table = table
+		self.Invalidate ()
+
+	def __bool__(self):
+		return bool(self.Table)
+
+	@property
+	def ID(self):
+		return self.Table.ID
+
+	def Invalidate(self):
+		self.Snapshot = False
+		self.RowNames = self.ColumnNames = ()
+		self.RowIndices = self.ColumnIndices = {}
+		self.ColumnCounts = ()
+		self.Fields = self.Values = ()
+		self.Lookups = {}
+		self.Default = None
+		self.DefaultValue = None
+
+	def SetTable(self, table):
+		self.Table = table
+		self.Invalidate ()
+
+	def Load(self):
+		if self.Snapshot:
+			return
+
+		table = self.Table
+		rowCount = table.GetRowCount ()
+		self.RowNames = tuple(table.GetRowName (row) for row in range(rowCount))
+		self.ColumnCounts = tuple(table.GetColumnCount (row) for row in range(rowCount))
+
+		columnNames = []
+		while True:
+			name = table.GetColumnName (len(columnNames))
+			if not name:
+				break
+			columnNames.append (name)
+		self.ColumnNames = tuple(columnNames)
+
+		# first occurrence wins, just like the engine's linear search
+		self.RowIndices = {}
+		for row, name in enumerate(self.RowNames):
+			self.RowIndices.setdefault (name.lower (), row)
+		self.ColumnIndices = {}
+		for col, name in enumerate(self.ColumnNames):
+			self.ColumnIndices.setdefault (name.lower (), col)
+
+		self.Default = table.GetValue (rowCount, 0, GTV_STR)
+		self.DefaultValue = self._Natural (self.Default)
+		# column-major, so the reverse lookups can work on a single array
+		self.Fields = tuple(tuple(table.GetValue (row, col, GTV_STR) for row in range(rowCount)) for col in range(len(columnNames)))
+		self.Values = tuple(tuple(self._Natural (field) for field in column) for column in self.Fields)
+		self.Lookups = {}
+		self.Snapshot = True
+
+	@staticmethod
+	def _Natural(field):
+		number = _ParseNumber (field)
+		return field if number is None else number
+
+	def _RowIndex(self, row):
+		if isinstance(row, str):
+			return self.RowIndices.get (row.lower (), -1)
+		return row
+
+	def _ColumnIndex(self, col):
+		if isinstance(col, str):
+			return self.ColumnIndices.get (col.lower (), -1)
+		return col
+
+	def _Field(self, row, col, values):
+		if row < 0 or col < 0 or row >= len(self.RowNames) or col >= len(values):
+			return None
+		if col >= self.ColumnCounts[row]:
+			return None
+		return values[col][row]
+
+	def GetValue(self, row, col, vtype = -1):
+		if vtype not in (-1, GTV_STR, GTV_INT) or type(row) is not type(col) or not isinstance(row, (int, str)):
+			# stat and strref translation, mixed indices and errors are the engine's business
+			return self.Table.GetValue (row, col, vtype)
+
+		self.Load ()
+		row = self._RowIndex (row)
+		col = self._ColumnIndex (col)
+		if vtype == GTV_STR:
+			field = self._Field (row, col, self.Fields)
+			return self.Default if field is None else field
+
+		value = self._Field (row, col, self.Values)
+		if value is None:
+			value = self.DefaultValue
+		if vtype == GTV_INT and isinstance(value, str):
+			return 0
+		return value
+
+	def _Lookup(self, col):
+		# lazily built reverse index: value -> sorted rows
+		if col in self.Lookups:
+			return self.Lookups[col]
+
+		numbers = {}
+		strings = {}
+		for row in range(len(self.RowNames)):
+			field = self._Field (row, col, self.Fields)
+			value = self._Field (row, col, self.Values)
+			if field is None:
+				field = self.Default
+				value = self.DefaultValue
+			strings.setdefault (field.lower (), []).append (row)
+			if not isinstance(value, str):
+				numbers.setdefault (value, []).append (row)
+		self.Lookups[col] = (numbers, strings)
+		return self.Lookups[col]
+
+	def FindValue(self, col, value, start = 0):
+		if not isinstance(col, (int, str)) or not isinstance(value, (int, str)):
+			return self.Table.FindValue (col, value, start)
+
+		self.Load ()
+		col = self._ColumnIndex (col)
+		if col < 0:
+			col = len(self.Fields) # every field reads as the default
+		numbers, strings = self._Lookup (col)
+		if isinstance(value, str):
+			rows = strings.get (value.lower ())
+		else:
+			rows = numbers.get (value)
+		if not rows:
+			return None
+
+		idx = bisect.bisect_left (rows, start)
+		if idx == len(rows):
+			return None
+		return rows[idx]
+
+	def GetRowIndex(self, name):
+		self.Load ()
+		row = self.RowIndices.get (name.lower (), -1)
+		return None if row == -1 else row
+
+	def GetRowName(self, row):
+		self.Load ()
+		if row < 0 or row >= len(self.RowNames):
+			return ""
+		return self.RowNames[row]
+
+	def GetColumnIndex(self, name):
+		self.Load ()
+		col = self.ColumnIndices.get (name.lower (), -1)
+		return None if col == -1 else col
+
+	def GetColumnName(self, col):
+		self.Load ()
+		if col < 0 or col >= len(self.ColumnNames):
+			return ""
+		return self.ColumnNames[col]
+
+	def GetRowCount(self):
+		self.Load ()
+		return len(self.RowNames)
+
+	def GetColumnCount(self, row = 0):
+		self.Load ()
+		if row < 0 or row >= len(self.ColumnCounts):
+			return 0
+		return self.ColumnCounts[row]
+
+def _LoadTable (name, table):
+	handle = GemRB.LoadTable (name, False, True)
+	if table is None:
+		return CachedTable (handle)
+	table.SetTable (handle)
+	return table
+
+def _LoadOptionalTable (name, table):
+	if GemRB.HasResource (name, RES_2DA):
+		return _LoadTable (name, table)
+	return None
+
+def Load(reload = False):
 	global Classes, KitList, ClassSkills, Races, NextLevel
 	global Pdolls, StrModEx, StrMod, SpellDisplay, Aligns
 	global ItemType, WeapProfs, CharProfs
 	global Loaded
 
-	if Loaded:
+	if Loaded and not reload:
 		return
 
-	Classes = GemRB.LoadTable ("classes", False, True)
-	ClassSkills = GemRB.LoadTable ("clskills", False, True)
-	Races = GemRB.LoadTable ("races", False, True)
-	NextLevel = GemRB.LoadTable ("xplevel", False, True)
-	StrMod = GemRB.LoadTable ("strmod", False, True)
-	StrModEx = GemRB.LoadTable ("strmodex", False, True)
-	SpellDisplay = GemRB.LoadTable ("spldisp", False, True)
-	ItemType = GemRB.LoadTable ("itemtype", False, True)
+	# reloading refreshes the existing objects, so their snapshots get dropped
+	# even where modules kept a direct reference
+	Classes = _LoadTable ("classes", Classes)
+	ClassSkills = _LoadTable ("clskills", ClassSkills)
+	Races = _LoadTable ("races", Races)
+	NextLevel = _LoadTable ("xplevel", NextLevel)
+	StrMod = _LoadTable ("strmod", StrMod)
+	StrModEx = _LoadTable ("strmodex", StrModEx)
+	SpellDisplay = _LoadTable ("spldisp", SpellDisplay)
+	ItemType = _LoadTable ("itemtype", ItemType)
 
 	# tables that are only in some games, but not optional there
-	if GemRB.HasResource ("kitlist", RES_2DA):
-		KitList = GemRB.LoadTable ("kitlist", False, True)
-	if GemRB.HasResource ("pdolls", RES_2DA):
-		Pdolls = GemRB.LoadTable ("pdolls", False, True)
-	if GemRB.HasResource ("aligns", RES_2DA):
-		Aligns = GemRB.LoadTable ("aligns", False, True)
-	if GemRB.HasResource ("weapprof", RES_2DA):
-		WeapProfs = GemRB.LoadTable ("weapprof", False, True)
-	if GemRB.HasResource ("charprof", RES_2DA):
-		CharProfs = GemRB.LoadTable ("charprof", False, True)
+	KitList = _LoadOptionalTable ("kitlist", KitList)
+	Pdolls = _LoadOptionalTable ("pdolls", Pdolls)
+	Aligns = _LoadOptionalTable ("aligns", Aligns)
+	WeapProfs = _LoadOptionalTable ("weapprof", WeapProfs)
+	CharProfs = _LoadOptionalTable ("charprof", CharProfs)
 
 	Loaded = True
+
+@Caches.Register
+def Reload ():
+	"""Refreshes the loaded tables, since a game or an expansion may bring different ones."""
+
+	if Loaded:
+		Load (True)
@@ -69,6 +69,47 @@ def ex(cmd):
 def ev(trigger):
 	GemRB.EvaluateString(trigger)
 
+def caps():
+	import GameCheck
+	for key, value in sorted(GameCheck.GetCapabilities().items()):
+		print (key + ": " + str(value))
+
+def prof(on=1):
+	import Profiler
+	if on:
+		Profiler.Enable()
+	else:
+		Profiler.Disable()
+
+def profdump(path=None):
+	import Profiler
+	Profiler.Dump(path)
+
+def bytecode():
+	import Bytecode
+	print(Bytecode.Summary)
+
+def constbench():
+	import Constants
+	print ("\n".join(Constants.Benchmark()))
+
+def retained():
+	import GUIClasses
+	for key, value in sorted(GUIClasses.GetRetainedStats().items()):
+		print (key + ": " + str(value))
+
+def handles():
+	import GUIClasses
+	print (GUIClasses.HandleStats)
+
+def bindbench(button=None):
+	import MetaClasses
+	table = GemRB.LoadTable("classes")
+	calls = [(table, "GetRowCount", ()), (table, "GetValue", (0, 0))]
+	if button:
+		calls += [(button, "GetFrame", ()), (button, "SetFlags", (0, OP_OR))]
+	print ("\n".join(MetaClasses.Benchmark(calls)))
+
 # the actual function that the GemRB::Console calls
 def Exec(cmd):
 	import sys
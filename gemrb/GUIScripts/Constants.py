@@ -0,0 +1,210 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# Constants.py - frozen tables of the constant modules
+# GUIDefines, ie_stats and the like only assign constants, but since the
+# scripts are run without bytecode, every start compiles them again. Freeze
+# stores their final namespaces in one marshalled table (in the user's cache
+# directory or at GEMRB_CONSTANTS_PATH), which Install serves to the imports
+# instead. Each entry records the size and mtime of its source and is ignored
+# once that changes; Update then refreshes the table after the game started.
+#
+# the source files stay the reference, keep them synchronized with the core
+# headers as before. Run Benchmark to compare both ways of importing them.
+#
+# only the standard library may be imported here, since this runs before
+# anything else is set up
+
+import importlib.abc
+import importlib.util
+import marshal
+import os
+import sys
+import time
+import zlib
+
+Modules = ("GUIDefines", "ie_stats", "ie_spells", "ie_restype", "ie_slots", "ie_action", "ie_modal", "ie_feats", "ie_sounds")
+ScriptsDir = os.path.dirname (os.path.abspath (__file__))
+
+def GetCacheDir ():
+	if os.name == "nt":
+		base = os.environ.get ("LOCALAPPDATA") or os.path.expanduser ("~")
+	elif sys.platform == "darwin":
+		base = os.path.join (os.path.expanduser ("~"), "Library", "Caches")
+	else:
+		base = os.environ.get ("XDG_CACHE_HOME") or os.path.join (os.path.expanduser ("~"), ".cache")
+	return os.path.join (base, "gemrb")
+
+# the installed scripts may be read-only, so the table lives with the user,
+# one per scripts directory
+TablePath = os.environ.get ("GEMRB_CONSTANTS_PATH") or \
+	os.path.join (GetCacheDir (), "constants-%08x.dat" % zlib.crc32 (ScriptsDir.encode ("utf-8")))
+# bump when the table layout changes
+Version = 1
+
+# name -> namespace of the valid frozen modules
+Table = {}
+# modules that had to be imported from source
+Missed = []
+
+def GetSource (name):
+	return os.path.join (ScriptsDir, name + ".py")
+
+def GetStamp (path):
+	stat = os.stat (path)
+	return (stat.st_size, stat.st_mtime_ns)
+
+def GetNamespace (name, source=None):
+	"""Runs the source of a constant module, returning its public names."""
+
+	path = GetSource (name)
+	if source is None:
+		with open (path) as f:
+			source = f.read ()
+	namespace = {}
+	exec (compile (source, path, "exec", dont_inherit=True), namespace)
+	return {key: value for key, value in namespace.items () if not key.startswith ("__")}
+
+def LoadTable ():
+	try:
+		with open (TablePath, "rb") as f:
+			version, entries = marshal.load (f)
+	except (OSError, EOFError, ValueError, TypeError):
+		return {}
+	if version != Version:
+		return {}
+
+	table = {}
+	for name, (stamp, namespace) in entries.items ():
+		try:
+			if GetStamp (GetSource (name)) == stamp:
+				table[name] = namespace
+		except OSError:
+			pass
+	return table
+
+def Freeze (path=None):
+	"""Writes the table of all constant modules, returning its path."""
+
+	entries = {}
+	for name in Modules:
+		source = GetSource (name)
+		try:
+			namespace = GetNamespace (name)
+			marshal.dumps (namespace)
+		except (OSError, ValueError):
+			# missing or not just plain constants
+			continue
+		entries[name] = (GetStamp (source), namespace)
+
+	path = path or TablePath
+	directory = os.path.dirname (path)
+	if directory:
+		os.makedirs (directory, exist_ok=True)
+	with open (path, "wb") as f:
+		marshal.dump ((Version, entries), f)
+	return path
+
+class ConstantsLoader (importlib.abc.MetaPathFinder, importlib.abc.Loader):
+	def find_spec (self, name, path=None, target=None):
+		if path is not None or name not in Modules:
+			return None
+		if name not in Table:
+			Missed.append (name)
+			return None
+		# a game specific override in front of us wins, like for a normal import
+		for entry in sys.path:
+			if os.path.abspath (entry or ".") == ScriptsDir:
+				break
+			if os.path.exists (os.path.join (entry, name + ".py")):
+				return None
+
+		spec = importlib.util.spec_from_loader (name, self, origin=GetSource (name))
+		spec.has_location = True
+		return spec
+
+	def create_module (self, spec):
+		return None
+
+	def exec_module (self, module):
+		module.__dict__.update (Table[module.__name__])
+
+Loader = ConstantsLoader ()
+
+def Install ():
+	"""Serves the frozen modules to the imports. Run from Main.py before importing them."""
+
+	if Loader in sys.meta_path:
+		return
+	Table.update (LoadTable ())
+	sys.meta_path.insert (0, Loader)
+
+def Update ():
+	"""Refreshes a missing or stale table."""
+
+	if not Missed:
+		return
+	try:
+		Freeze ()
+	except OSError as error:
+		print ("Constants: could not save the table to " + TablePath + ": " + str(error))
+		return
+	del Missed[:]
+
+def Benchmark (repeat=50):
+	"""Compares importing the constant modules from source and from the table.
+
+	Returns the report lines with the time and the peak of allocated memory
+	per import, plus the cost of a star import of the module."""
+
+	import tracemalloc
+
+	lines = ["%-12s %6s %11s %11s %11s %11s %9s" % ("module", "names", "source ms", "frozen ms", "source KiB", "frozen KiB", "star ms")]
+	for name in Modules:
+		try:
+			with open (GetSource (name)) as f:
+				source = f.read ()
+		except OSError:
+			continue
+		frozen = marshal.dumps (GetNamespace (name, source))
+
+		def FromSource ():
+			return GetNamespace (name, source)
+		def FromTable ():
+			return marshal.loads (frozen)
+
+		results = []
+		for load in (FromSource, FromTable):
+			start = time.perf_counter ()
+			for i in range (repeat):
+				namespace = load ()
+			elapsed = (time.perf_counter () - start) * 1000 / repeat
+
+			tracemalloc.start ()
+			load ()
+			peak = tracemalloc.get_traced_memory ()[1] / 1024.0
+			tracemalloc.stop ()
+			results += [elapsed, peak]
+
+		start = time.perf_counter ()
+		for i in range (repeat):
+			exec ("from " + name + " import *", {})
+		star = (time.perf_counter () - start) * 1000 / repeat
+
+		lines.append ("%-12s %6d %11.3f %11.3f %11.1f %11.1f %9.4f" % ((name, len(namespace), results[0], results[2], results[1], results[3], star)))
+	return lines
@@ -28,6 +28,9 @@ from GUIDefines import *
 HideOnClose = False
 ContainerWindow = None
 Container = None
+ContainerPC = 0
+GroundList = None
+InventoryList = None
 if GameCheck.IsIWD2():
 	leftdiv = 5
 	ground_size = 10
@@ -39,11 +42,11 @@ if GameCheck.IsPST():
 	import GUICommonWindows
 
 def UpdateContainerWindow ():
-	global Container
+	global Container, ContainerPC
 
 	Window = ContainerWindow
 
-	pc = GemRB.GameGetFirstSelectedPC ()
+	pc = ContainerPC = GemRB.GameGetFirstSelectedPC ()
 	if GameCheck.IsPST():
 		GUICommon.SetEncumbranceLabels (Window, 54, None, pc)
 	else:
@@ -58,72 +61,70 @@ def UpdateContainerWindow ():
 	ScrollBar = Window.GetControl (52)
 	Count = max (0, (LeftCount - ground_size + leftdiv - 1) // leftdiv)
 	ScrollBar.SetVarAssoc ("LeftTopIndex", GemRB.GetVar ("LeftTopIndex"), 0, Count)
+	GroundList.SetCount (LeftCount)
 
-	inventory_slots = GemRB.GetSlots (pc, 0x8000)
-	RightCount = len(inventory_slots)
+	InventoryList.SetModel (GemRB.GetSlots (pc, 0x8000))
+	RightCount = InventoryList.Count
 	ScrollBar = Window.GetControl (53)
 	Count = max (0, (RightCount - 4 + 1) // 2)
 	ScrollBar.SetVarAssoc ("RightTopIndex", GemRB.GetVar ("RightTopIndex"), 0, Count)
 
+	# shade the inventory icon if it is full
+	Button = Window.GetControl (54)
+	if Button:
+		free_slots = GemRB.GetSlots (pc, 0x8000, -1)
+		if free_slots == ():
+			Button.SetState (IE_GUI_BUTTON_PRESSED)
+		else:
+			Button.SetState (IE_GUI_BUTTON_LOCKED)
+
 	RedrawContainerWindow ()
 
 def RedrawContainerWindow ():
-	Window = ContainerWindow
+	if GemRB.GameGetFirstSelectedPC () != ContainerPC:
+		UpdateContainerWindow ()
+		return
 
 	# scroll in multiples of the number of columns
-	LeftTopIndex = GemRB.GetVar ("LeftTopIndex") * leftdiv
-	RightTopIndex = GemRB.GetVar ("RightTopIndex") * 2
-	pc = GemRB.GameGetFirstSelectedPC ()
-	inventory_slots = GemRB.GetSlots (pc, 0x8000)
-	RightCount = len(inventory_slots)
+	GroundList.Scroll (GemRB.GetVar ("LeftTopIndex") * leftdiv)
+	InventoryList.Scroll (GemRB.GetVar ("RightTopIndex") * 2)
 
-	for i in range (ground_size):
-		#this is an autoselected container, but we could use PC too
-		Slot = GemRB.GetContainerItem (0, i+LeftTopIndex)
-		Button = Window.GetControl (i)
-		if Slot:
-			Button.SetVarAssoc ("LeftIndex", LeftTopIndex+i)
-			callback = TakeItemContainer
-		else:
-			Button.SetVarAssoc ("LeftIndex", -1)
-			callback = None
-		if GameCheck.IsPST():
-			GUICommonWindows.SetItemButton (Window, Button, Slot, callback, None)
-		else:
-			InventoryCommon.UpdateInventorySlot (pc, Button, Slot, "container")
+def DrawGroundItem (i, index, Slot):
+	Window = ContainerWindow
 
-	for i in range (4):
-		if i+RightTopIndex < RightCount:
-			Slot = GemRB.GetSlotItem (pc, inventory_slots[i+RightTopIndex])
-		else:
-			Slot = None
-		Button = Window.GetControl (i+10)
+	Button = GroundList.GetViews (i)[0]
+	if Slot:
+		Button.SetVarAssoc ("LeftIndex", index)
+		callback = TakeItemContainer
+	else:
+		Button.SetVarAssoc ("LeftIndex", -1)
+		callback = None
+	if GameCheck.IsPST():
+		GUICommonWindows.SetItemButton (Window, Button, Slot, callback, None)
+	else:
+		InventoryCommon.UpdateInventorySlot (ContainerPC, Button, Slot, "container")
 
-		#pst had a redundant call here, reenable if it turns out it isn't redundant:
-		#GUICommonWindows.SetItemButton (Window, Button, Slot, None, None)
+def DrawInventoryItem (i, index, Slot):
+	Window = ContainerWindow
 
-		if Slot:
-			Button.SetVarAssoc ("RightIndex", RightTopIndex+i)
-			callback = DropItemContainer
-		else:
-			Button.SetVarAssoc ("RightIndex", -1)
-			callback = None
-		if GameCheck.IsPST():
-			GUICommonWindows.SetItemButton (Window, Button, Slot, callback, None)
-		else:
-			InventoryCommon.UpdateInventorySlot (pc, Button, Slot, "inventory")
+	Button = InventoryList.GetViews (i)[0]
 
-	# shade the inventory icon if it is full
-	Button = Window.GetControl (54)
-	if Button:
-		free_slots = GemRB.GetSlots (pc, 0x8000, -1)
-		if free_slots == ():
-			Button.SetState (IE_GUI_BUTTON_PRESSED)
-		else:
-			Button.SetState (IE_GUI_BUTTON_LOCKED)
+	#pst had a redundant call here, reenable if it turns out it isn't redundant:
+	#GUICommonWindows.SetItemButton (Window, Button, Slot, None, None)
+
+	if Slot:
+		Button.SetVarAssoc ("RightIndex", index)
+		callback = DropItemContainer
+	else:
+		Button.SetVarAssoc ("RightIndex", -1)
+		callback = None
+	if GameCheck.IsPST():
+		GUICommonWindows.SetItemButton (Window, Button, Slot, callback, None)
+	else:
+		InventoryCommon.UpdateInventorySlot (ContainerPC, Button, Slot, "inventory")
 
 def OpenContainerWindow ():
-	global ContainerWindow, Container
+	global ContainerWindow, Container, GroundList, InventoryList
 
 	if ContainerWindow:
 		return
@@ -181,6 +182,12 @@ def OpenContainerWindow ():
 			Button.SetFont ("NUMBER")
 			Button.SetFlags (IE_GUI_BUTTON_ALIGN_RIGHT | IE_GUI_BUTTON_ALIGN_BOTTOM, OP_OR)
 
+	#this is an autoselected container, but we could use PC too
+	Views = [(Window.GetControl (i),) for i in range (ground_size)]
+	GroundList = GUICommon.VirtualList (ground_size, lambda index: GemRB.GetContainerItem (0, index), DrawGroundItem, Views)
+	Views = [(Window.GetControl (i+10),) for i in range (4)]
+	InventoryList = GUICommon.VirtualList (4, lambda slot: GemRB.GetSlotItem (ContainerPC, slot), DrawInventoryItem, Views)
+
 	# left scrollbar (container)
 	ScrollBar = Window.GetControl (52)
 	ScrollBar.SetVisible(True) # unhide because in PST it is linked to a TextArea
@@ -19,9 +19,10 @@
 import _GemRB
 import GemRB
 import GameCheck
+import Caches
 
 from GUIDefines import *
-from MetaClasses import metaIDWrapper, add_metaclass
+from MetaClasses import metaIDWrapper, add_metaclass, BridgedMethods, Bindings, SetMethodFilter, CallbackFilter, CallbackArgument
 from GemRB import GetView, CreateView, RemoveView, RemoveScriptingRef
 
 DefaultScrollbars = {
@@ -89,16 +90,17 @@ class Scrollable(object):
 @add_metaclass(metaIDWrapper)
 class GView:
 	methods = {
-	'AddAlias': _GemRB.View_AddAlias,
-	'AddSubview': _GemRB.View_AddSubview,
-	'SetEventProxy': _GemRB.View_SetEventProxy,
-	'GetFrame': _GemRB.View_GetFrame,
-	'SetFrame': _GemRB.View_SetFrame,
-	'SetBackground': _GemRB.View_SetBackground,
-	'SetFlags': _GemRB.View_SetFlags,
-	'SetResizeFlags': _GemRB.View_SetResizeFlags,
-	'SetTooltip': _GemRB.View_SetTooltip,
-	'Focus': _GemRB.View_Focus
+		'AddAlias': _GemRB.View_AddAlias,
+		'AddSubview': _GemRB.View_AddSubview,
+		'SetEventProxy': _GemRB.View_SetEventProxy,
+		'GetFrame': _GemRB.View_GetFrame,
+		'RefreshAttributes': _GemRB.View_RefreshAttributes,
+		'SetFrame': _GemRB.View_SetFrame,
+		'SetBackground': _GemRB.View_SetBackground,
+		'SetFlags': _GemRB.View_SetFlags,
+		'SetResizeFlags': _GemRB.View_SetResizeFlags,
+		'SetTooltip': _GemRB.View_SetTooltip,
+		'Focus': _GemRB.View_Focus
 	}
 
 	__slots__ = ['SCRIPT_GROUP', 'Flags']
@@ -146,6 +148,11 @@ class GView:
 		frame['h'] -= (b + t)
 		return frame
 
+	@staticmethod
+	def Batch():
+		"""Returns the open FrameBatch or a new one, to be used as a context manager."""
+		return ActiveBatch or FrameBatch()
+
 	def SetVisible(self, visible):
 		self.SetFlags(IE_GUI_VIEW_INVISIBLE, OP_NAND if visible else OP_OR)
 		
@@ -160,6 +167,7 @@ class GView:
 			subview = self.GetControl (subview)
 		newID = subview.ID & 0x00000000ffffffff
 		frame = subview.GetFrame()
+		ViewChanged(subview)
 		RemoveView(subview, True)
 
 		return self.CreateSubview(newID, ctype, frame, args)
@@ -167,10 +175,13 @@ class GView:
 	def CreateSubview(self, newID, ctype, frame, *args):
 		view = CreateView(newID, ctype, frame, *args) # this will create an entry in the generic 'control' group
 		created = self.AddSubview(view) # this will move the reference into the our window's group
+		ViewChanged(created) # the id may have been used by a removed control
+		SubviewParents[GetViewKey(created)] = GetViewKey(self)
 		RemoveScriptingRef(view) # destroy the old reference just in case something tries to recycle the id while 'created' is still valid
 		return created
 
 	def RemoveSubview(self, view, delete=False):
+		ViewChanged(view)
 		return RemoveView(view, delete)
 
 	def CreateWorldMapControl(self, control, *args):
@@ -215,10 +226,11 @@ class GWindow(GView, Scrollable):
 	def DeleteControl(self, view):
 		if type(view) == int:
 			view = self.GetControl (view)
+		ViewChanged (view)
 		RemoveView (view, True)
 
 	def GetControl(self, newID):
-		return GetView(self, newID)
+		return GetControlHandle(self, newID)
 
 	def AliasControls (self, map):
 		for alias, cid in map.items():
@@ -229,7 +241,7 @@ class GWindow(GView, Scrollable):
 				print("no control with id=" + str(cid))
 
 	def GetControlAlias(self, alias): # see AliasControls()
-		return GetView(alias, self.ID)
+		return GetControlHandle(self, alias)
 
 	def ReparentSubview(self, view, newparent):
 		# reparenting assumes within the same window
@@ -241,9 +253,12 @@ class GWindow(GView, Scrollable):
 		frame['x'] -= parentFrame['x']
 		frame['y'] -= parentFrame['y']
 		view.SetFrame(frame)
-		return newparent.AddSubview(view, None, newID)
+		view = newparent.AddSubview(view, None, newID)
+		SubviewParents[GetViewKey(view)] = GetViewKey(newparent)
+		return view
 
 	def Close(self, *args):
+		ViewChanged(self)
 		RemoveView(self, False)
 
 class GControl(GView):
@@ -284,6 +299,24 @@ class GControl(GView):
 	def OnChange(self, handler):
 		self.SetAction(handler, IE_ACT_VALUE_CHANGE)
 
+	def Retain(self, *properties):
+		"""Skips repeated calls setting the same value, see RetainedProperties.
+
+		Without properties all but SetState are retained, since clicks
+		change the state of a button too."""
+		InstallRetainedState()
+		if not getattr(self, 'RetainsState', False):
+			self.__class__ = GetRetainedClass(type(self))
+		properties = frozenset(properties or DefaultRetained)
+		state = ControlStates.get(GetViewKey(self))
+		if state is None or state[0] != properties:
+			ControlStates[GetViewKey(self)] = (properties, {})
+
+	def Forget(self):
+		ControlStates.pop(GetViewKey(self), None)
+		if getattr(self, 'RetainsState', False):
+			self.__class__ = type(self).__bases__[0]
+
 class GLabel(GControl):
 	methods = {
 		'SetFont': _GemRB.Label_SetFont,
@@ -395,3 +428,436 @@ class GSaveGame:
 @add_metaclass(metaIDWrapper)
 class GSprite2D:
 	methods = {}
+
+###################################################
+# retained control state
+# update functions set the same values again on every refresh. Controls that
+# opted in with Retain() remember the arguments of the last call of each
+# property below and drop identical ones before they reach the engine. Retain
+# switches just that object to a subclass with the checking setters, so other
+# controls keep calling the engine directly. The engine changes controls on
+# its own too, so the engine setters listed in EngineSetters forget what they
+# touch, as does removing a view or loading its window again. Don't retain
+# properties that something else changes, eg. by calling the _GemRB functions
+# directly or through another object for the same control (GetControl hands
+# out the same one).
+
+# property -> index of the argument telling its instances apart
+RetainedProperties = {
+	'SetText': None,
+	'SetTooltip': None,
+	'SetFont': None,
+	'SetColor': 1,
+	'SetFlags': None,
+	'SetState': None,
+	'SetPicture': None,
+	'SetBorder': 0,
+	'EnableBorder': 0
+}
+DefaultRetained = frozenset(RetainedProperties) - frozenset(['SetState'])
+
+# properties whose value a call of the key also changes
+CoupledProperties = {
+	'SetFlags': ('SetText', 'SetState', 'SetPicture'),
+	'SetState': ('SetFlags',),
+	'SetPicture': ('SetFlags',),
+	'SetBorder': ('EnableBorder',),
+	'EnableBorder': ('SetBorder',)
+}
+
+# engine setters -> the properties they change, for windows on all their controls
+EngineTouched = ('SetText', 'SetTooltip', 'SetFlags', 'SetState', 'SetPicture', 'SetBorder', 'EnableBorder')
+EngineSetters = {
+	'SetupControls': EngineTouched,
+	'SetupEquipmentIcons': EngineTouched,
+	'SetActionIcon': EngineTouched,
+	'SetItemIcon': EngineTouched,
+	'SetSpellIcon': EngineTouched,
+	'SetBAM': ('SetPicture', 'SetFlags'),
+	'SetPLT': ('SetPicture', 'SetFlags'),
+	'SetAnimation': ('SetPicture', 'SetFlags'),
+	'SetSprites': ('SetState',),
+	'SetVarAssoc': ('SetState',),
+	'SetValue': ('SetState',),
+	'SetStatus': ('SetState',)
+}
+
+# (SCRIPT_GROUP, ID) -> (retained properties, {slot: (frozen args, result)})
+ControlStates = {}
+RetainedInstalled = False
+# class -> its subclass for retained controls
+RetainedClasses = {}
+ElidedCalls = {}
+PassedCalls = 0
+ForgottenSlots = 0
+
+def GetViewKey(view):
+	return (getattr(view, 'SCRIPT_GROUP', None), view.ID)
+
+def GetWindowKey(key):
+	"""Returns the key of the window holding the control of key, None for windows."""
+	group, ID = key
+	if not ID & 0x8000000000000000:
+		return None
+	return (group, (ID >> 32) & 0x7fffffff)
+
+def FreezeArgs(args):
+	# copies of the mutable arguments, so changing them later can't fool us
+	frozen = []
+	for arg in args:
+		if isinstance(arg, dict):
+			arg = tuple(sorted(arg.items()))
+		elif isinstance(arg, (list, bytearray)):
+			arg = tuple(arg)
+		frozen.append(arg)
+	return tuple(frozen)
+
+def ForgetSlots(slots, properties):
+	global ForgottenSlots
+
+	for slot in list(slots):
+		name = slot[0] if isinstance(slot, tuple) else slot
+		if name in properties:
+			del slots[slot]
+			ForgottenSlots += 1
+
+def ForgetView(view, properties=None):
+	"""Forgets the retained state of view, for windows of all their controls too."""
+	if not ControlStates:
+		return
+
+	key = GetViewKey(view)
+	keys = [key]
+	if GetWindowKey(key) is None:
+		keys += [k for k in ControlStates if GetWindowKey(k) == key]
+	for k in keys:
+		if properties is None:
+			ControlStates.pop(k, None)
+		elif k in ControlStates:
+			ForgetSlots(ControlStates[k][1], properties)
+
+def RetainedSetter(key, index):
+	def wrap(f):
+		def setter(self, *args, **kwargs):
+			global PassedCalls
+
+			state = ControlStates.get(GetViewKey(self))
+			if state is None:
+				return f(self, *args, **kwargs)
+
+			slots = state[1]
+			if key not in state[0]:
+				ForgetSlots(slots, CoupledProperties.get(key, ()))
+				return f(self, *args, **kwargs)
+
+			slot = key
+			if index is not None:
+				slot = (key, args[index] if len(args) > index else None)
+			frozen = FreezeArgs(args)
+			cached = slots.get(slot)
+			# toggling isn't idempotent
+			toggle = key == 'SetFlags' and len(args) > 1 and args[1] == OP_XOR
+			if cached is not None and cached[0] == frozen and not kwargs and not toggle:
+				ElidedCalls[key] = ElidedCalls.get(key, 0) + 1
+				return cached[1]
+
+			result = f(self, *args, **kwargs)
+			PassedCalls += 1
+			ForgetSlots(slots, CoupledProperties.get(key, ()))
+			slots[slot] = (frozen, result)
+			return result
+
+		setter.__doc__ = f.__doc__
+		return setter
+	return wrap
+
+def EngineSetter(properties):
+	def wrap(f):
+		def setter(self, *args, **kwargs):
+			ForgetView(self, properties)
+			return f(self, *args, **kwargs)
+
+		setter.__doc__ = f.__doc__
+		return setter
+	return wrap
+
+def LoadWindow(EngineFunction):
+	def wrapper(*args, **kwargs):
+		window = EngineFunction(*args, **kwargs)
+		if window:
+			ForgetView(window)
+			ControlHandles.pop(GetViewKey(window), None)
+		return window
+
+	wrapper.ForgetsViews = True
+	wrapper.__doc__ = EngineFunction.__doc__
+	return wrapper
+
+def InheritedMethod(c, key):
+	def f(self, *args, **kwargs):
+		return getattr(super(type(self), self), key)(*args, **kwargs)
+
+	f.__doc__ = getattr(c, key).__doc__
+	return f
+
+def GetRetainedClass(c):
+	"""Returns the subclass of c for retained controls, with the checking setters."""
+	retained = RetainedClasses.get(c)
+	if retained is not None:
+		return retained
+
+	classdict = {'__slots__': (), '__module__': __name__, 'RetainsState': True}
+	for key, index in RetainedProperties.items():
+		if hasattr(c, key):
+			classdict[key] = RetainedSetter(key, index)(InheritedMethod(c, key))
+	for key, properties in EngineSetters.items():
+		if hasattr(c, key):
+			classdict[key] = EngineSetter(properties)(InheritedMethod(c, key))
+	# no new slots, so objects can switch to it
+	retained = type.__new__(type(c), c.__name__, (c,), classdict)
+	RetainedClasses[c] = retained
+	return retained
+
+def InstallRetainedState():
+	"""Binds the window setters changing all controls, on the first use of Retain."""
+	global RetainedInstalled
+
+	if RetainedInstalled:
+		return
+	RetainedInstalled = True
+
+	for c, key, f in list(BridgedMethods):
+		if issubclass(c, GWindow) and key in EngineSetters:
+			SetMethodFilter(c, key, EngineSetter(EngineSetters[key]))
+
+@Caches.Register
+def ResetRetainedState():
+	ControlStates.clear()
+
+def GetRetainedStats():
+	elided = sum(ElidedCalls.values())
+	calls = elided + PassedCalls
+	return {
+		"Elided": elided, "Passed": PassedCalls, "Forgotten": ForgottenSlots,
+		"ElidedRate": elided / float(calls) if calls else 0.0,
+		"ElidedByProperty": dict(ElidedCalls), "Controls": len(ControlStates)
+	}
+
+###################################################
+# batched frame changes
+# SetSize, SetPos and the like each read the frame from the engine and write
+# it back. In a FrameBatch the frames are read once and the changes kept until
+# the outermost batch ends, so the engine gets one SetFrame per view:
+#
+# with GView.Batch () as batch:
+#	for button in buttons:
+#		button.SetSize (w, h)
+#		button.SetPos (x, y)
+#	batch.SetFlags (label, IE_GUI_VIEW_INVISIBLE, OP_OR)
+#
+# a pending size change makes the frames of the subviews of that view unknown
+# (the windows' controls and what was added by CreateSubview or
+# ReparentSubview), so reading one of them first applies the pending changes.
+# The engine sees the new frames only at the end, so avoid calls depending on
+# the layout within a batch; removing or adding views applies them too.
+
+ActiveBatch = None
+FramesInstalled = False
+# script created subview key -> key of its parent
+SubviewParents = {}
+BatchStats = {"Reads": 0, "Writes": 0, "CachedReads": 0, "CoalescedWrites": 0, "Flushes": 0}
+
+def IsSubviewOf(key, parent):
+	if GetWindowKey(parent) is None and GetWindowKey(key) == parent:
+		return True
+	while key in SubviewParents:
+		key = SubviewParents[key]
+		if key == parent:
+			return True
+	return False
+
+def BatchedGetFrame(f):
+	def GetFrame(self):
+		if ActiveBatch is None:
+			return f(self)
+		return ActiveBatch.GetFrame(self)
+
+	GetFrame.__doc__ = f.__doc__
+	return GetFrame
+
+def BatchedSetFrame(f):
+	def SetFrame(self, frame):
+		if ActiveBatch is None:
+			return f(self, frame)
+		return ActiveBatch.SetFrame(self, frame)
+
+	SetFrame.__doc__ = f.__doc__
+	return SetFrame
+
+class FrameBatch(object):
+	def __init__(self):
+		# key -> [view, frame, engine frame or None if unchanged]; in the order of the last change
+		self.Frames = {}
+		# key -> [view, [(flags, op), ...]]
+		self.Flags = {}
+		# keys of the views with a pending size change
+		self.Resized = set()
+		self.Depth = 0
+
+	def __enter__(self):
+		global ActiveBatch, FramesInstalled
+
+		if not FramesInstalled:
+			FramesInstalled = True
+			SetMethodFilter(GView, 'GetFrame', BatchedGetFrame)
+			SetMethodFilter(GView, 'SetFrame', BatchedSetFrame)
+
+		self.Depth += 1
+		ActiveBatch = self
+		return self
+
+	def __exit__(self, *args):
+		global ActiveBatch
+
+		self.Depth -= 1
+		if self.Depth == 0:
+			ActiveBatch = None
+			self.Flush()
+		return False
+
+	def GetFrame(self, view):
+		key = GetViewKey(view)
+		entry = self.Frames.get(key)
+		if entry is not None:
+			BatchStats["CachedReads"] += 1
+			return dict(entry[1])
+
+		if any(IsSubviewOf(key, resized) for resized in self.Resized):
+			self.Flush()
+
+		frame = Bindings[(GView, 'GetFrame')](view)
+		BatchStats["Reads"] += 1
+		self.Frames[key] = [view, dict(frame), None]
+		return frame
+
+	def SetFrame(self, view, frame):
+		key = GetViewKey(view)
+		entry = self.Frames.pop(key, None)
+		if entry is None:
+			engine = None
+		elif entry[2] is None:
+			engine = entry[1]
+		else:
+			engine = entry[2]
+			BatchStats["CoalescedWrites"] += 1
+		frame = dict(frame)
+		if not engine or engine['w'] != frame['w'] or engine['h'] != frame['h']:
+			self.Resized.add(key)
+			# the cached frames of its subviews may change with it
+			for k in [k for k, e in self.Frames.items() if e[2] is None and IsSubviewOf(k, key)]:
+				del self.Frames[k]
+		self.Frames[key] = [view, frame, engine or {}]
+
+	def SetFlags(self, view, flags, op=OP_SET):
+		"""Queues view.SetFlags, applied after the frames.
+
+		Repeated ORs or NANDs are merged, as are consecutive SETs."""
+		entry = self.Flags.setdefault(GetViewKey(view), [view, []])
+		queue = entry[1]
+		if queue and op == queue[-1][1] and op in (OP_OR, OP_NAND):
+			queue[-1] = (queue[-1][0] | flags, op)
+		elif queue and op == queue[-1][1] == OP_SET:
+			queue[-1] = (flags, op)
+		else:
+			queue.append((flags, op))
+
+	def SetVisible(self, view, visible):
+		self.SetFlags(view, IE_GUI_VIEW_INVISIBLE, OP_NAND if visible else OP_OR)
+
+	def Flush(self):
+		"""Applies the pending changes now."""
+		SetFrame = Bindings[(GView, 'SetFrame')]
+		frames, self.Frames = self.Frames, {}
+		flags, self.Flags = self.Flags, {}
+		self.Resized.clear()
+		BatchStats["Flushes"] += 1
+
+		for view, frame, engine in frames.values():
+			if engine is not None and frame != engine:
+				SetFrame(view, frame)
+				BatchStats["Writes"] += 1
+		for view, queue in flags.values():
+			for args in queue:
+				view.SetFlags(*args)
+
+def ViewChanged(view):
+	"""Applies the batched frames and forgets what is known about view, when adding or removing views."""
+	if ActiveBatch is not None:
+		ActiveBatch.Flush()
+	ForgetView(view)
+	ForgetHandles(view)
+	SubviewParents.pop(GetViewKey(view), None)
+
+###################################################
+# control handles
+# GetView constructs a new wrapper on every call, so the windows keep the
+# controls they looked up by id or alias and return the same ones again. The
+# handles are dropped with the view or window they belong to (see
+# ViewChanged), when the window gets loaded again and on game load. The
+# attributes the core sets on construction (Flags, Value, VarName, HasFocus)
+# are refreshed on every reuse, as the core may have changed them in between.
+
+# window key -> {id or alias: control}
+ControlHandles = {}
+HandleStats = {"Hits": 0, "Misses": 0}
+
+def GetControlHandle(window, lookup):
+	handles = ControlHandles.get(GetViewKey(window))
+	if handles is not None and lookup in handles:
+		control = handles[lookup]
+		if control.RefreshAttributes():
+			HandleStats["Hits"] += 1
+			return control
+		# deleted behind our back
+		del handles[lookup]
+
+	if isinstance(lookup, str):
+		control = GetView(lookup, window.ID)
+	else:
+		control = GetView(window, lookup)
+	HandleStats["Misses"] += 1
+	# missing controls may get created later, so ask again next time
+	if control:
+		ControlHandles.setdefault(GetViewKey(window), {})[lookup] = control
+	return control
+
+def ForgetHandles(view):
+	if not ControlHandles:
+		return
+
+	key = GetViewKey(view)
+	window = GetWindowKey(key)
+	if window is None:
+		ControlHandles.pop(key, None)
+		return
+
+	handles = ControlHandles.get(window, {})
+	for lookup, control in list(handles.items()):
+		controlKey = GetViewKey(control)
+		if controlKey == key or IsSubviewOf(controlKey, key):
+			del handles[lookup]
+
+@Caches.Register
+def ResetControlHandles():
+	ControlHandles.clear()
+
+# callbacks may be bound methods of views, eg. window.Focus
+SetMethodFilter(GWindow, 'SetAction', CallbackFilter)
+SetMethodFilter(GControl, 'SetAction', CallbackFilter)
+
+if not getattr(GemRB.SetTimer, 'WrapsCallbacks', False):
+	GemRB.SetTimer = CallbackArgument(GemRB.SetTimer)
+	GemRB.SetTimedEvent = CallbackArgument(GemRB.SetTimedEvent)
+
+if not getattr(GemRB.LoadWindow, 'ForgetsViews', False):
+	GemRB.LoadWindow = LoadWindow(GemRB.LoadWindow)
@@ -823,6 +823,94 @@ def SafeStatEval (expression):
 
 	return eval(expression)
 
+# maps the visible part of a scrolled list onto a fixed set of buttons
+# GetRow(index) fetches the data of a model row, while Draw(i, index, row)
+# sets up the i-th button for it (row is None past the end of the list)
+# rows are fetched once and kept until Invalidate, so scrolling only queries
+# the newly exposed rows and leaves buttons already showing their row alone
+class VirtualList(object):
+	def __init__(self, size, GetRow, Draw, Views=None):
+		self.Size = size
+		self.GetRow = GetRow
+		self.Draw = Draw
+		self.Count = 0
+		self.TopIndex = 0
+		self.Model = None
+		self.Rows = {}
+		self.Shown = [None] * size
+		# the controls of each visible row, if given: scrolling moves them along
+		# with the rows they show, so only the rows scrolled into view are drawn
+		self.Views = Views
+		if Views:
+			self.Frames = [[View.GetFrame () for View in Row] for Row in Views]
+
+	def SetModel(self, model):
+		"""Lists the items of model, GetRow is then called with an item instead of its index."""
+
+		self.Model = model
+		self.SetCount (len(model))
+
+	def SetCount(self, count):
+		self.Count = count
+		self.Invalidate ()
+
+	def GetViews(self, i):
+		"""Returns the controls currently showing the ith visible row."""
+
+		return self.Views[i]
+
+	def Invalidate(self, index=None):
+		"""Forgets one model row or all of them; affected buttons are redrawn on the next Scroll."""
+
+		if index is None:
+			self.Rows.clear ()
+			self.Shown = [None] * self.Size
+			return
+
+		self.Rows.pop (index, None)
+		if index in self.Shown:
+			self.Shown[self.Shown.index (index)] = None
+
+	def GetRowData(self, index):
+		if index not in self.Rows:
+			key = index if self.Model is None else self.Model[index]
+			self.Rows[index] = self.GetRow (key)
+		return self.Rows[index]
+
+	def Shift(self, offset):
+		"""Moves the controls up (or down) by offset rows, wrapping around.
+
+		The controls keep what they show, so the rows still in view need no redraw."""
+
+		self.Views = self.Views[offset:] + self.Views[:offset]
+		self.Shown = self.Shown[offset:] + self.Shown[:offset]
+		for Row, Frames in zip(self.Views, self.Frames):
+			for View, Frame in zip(Row, Frames):
+				View.SetFrame (Frame)
+
+	def Scroll(self, TopIndex):
+		offset = TopIndex - self.TopIndex
+		self.TopIndex = TopIndex
+		if self.Views and 0 < abs(offset) < self.Size:
+			self.Shift (offset)
+
+		for i in range (self.Size):
+			index = TopIndex + i
+			if index >= self.Count:
+				index = -1
+			if self.Shown[i] == index:
+				continue
+
+			self.Shown[i] = index
+			if index == -1:
+				self.Draw (i, TopIndex + i, None)
+			else:
+				self.Draw (i, index, self.GetRowData (index))
+
+	def Redraw(self):
+		self.Shown = [None] * self.Size
+		self.Scroll (self.TopIndex)
+
 GameWindow = GUIClasses.GWindow(ID=0, SCRIPT_GROUP="GAMEWIN")
 GameControl = GUIClasses.GView(ID=0, SCRIPT_GROUP="GC")
 
@@ -23,6 +23,7 @@
 
 import GemRB
 from GUIDefines import *
+from GUIClasses import GView
 from ie_stats import *
 from ie_modal import *
 from ie_action import *
@@ -33,6 +34,7 @@ from GameCheck import MAX_PARTY_SIZE
 from Clock import UpdateClock, CreateClockButton
 import GameCheck
 import GUICommon
+import ItemCache
 import CommonTables
 import CommonWindow
 import Container
@@ -448,7 +450,7 @@ def SelectQuiverSlot():
 	slot_item = GemRB.GetSlotItem (pc, slot)
 	# HACK: implement SetEquippedAmmunition instead?
 	if not GemRB.IsDraggingItem ():
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		GemRB.DragItem (pc, slot, item["ItemIcon"]) #, 0, 0)
 		GemRB.DropDraggedItem (pc, slot)
 	GemRB.SetVar ("ActionLevel", UAW_STANDARD)
@@ -461,7 +463,7 @@ def SetupItemAbilities(pc, slot, only):
 		# CHIV: Could configure empty quickslots from the game screen ala spells heres
 		return
 
-	item = GemRB.GetItem (slot_item["ItemResRef"])
+	item = ItemCache.GetItem (slot_item["ItemResRef"])
 	Tips = item["Tooltips"]
 	Locations = item["Locations"]
 
@@ -487,7 +489,7 @@ def SetupItemAbilities(pc, slot, only):
 			if i < len(ammoslots):
 				ammoslot = GemRB.GetSlotItem (pc, ammoslots[i])
 				st = GemRB.GetSlotType (ammoslots[i])
-				ammoitem = GemRB.GetItem (ammoslot['ItemResRef']) # needed to show the ammo count
+				ammoitem = ItemCache.GetItem (ammoslot['ItemResRef']) # needed to show the ammo count
 				Tips = ammoitem["Tooltips"]
 				# if this item is valid ammo and was really found in a quiver slot
 				if ammoitem['Type'] == ammotype and st["Type"] == SLOT_QUIVER:
@@ -638,13 +640,15 @@ def UpdateActionsWindow ():
 	Selected = GemRB.GetSelectedSize()
 
 	#setting up the disabled button overlay (using the second border slot)
+	# (retained, so the values the setup below doesn't touch aren't pushed again)
 	for i in range (12):
 		Button = CurrentWindow.GetControl (i+ActionBarControlOffset)
+		Button.Retain ()
 		if GameCheck.IsBG1():
-			color = {'r' : 0, 'g' : 254, 'b' :0, 'a' : 255}
+			color = {'r': 0, 'g': 254, 'b': 0, 'a': 255}
 			Button.SetBorder (0, color, 0, 0, Button.GetInsetFrame(6,6,4,4))
 
-		color = {'r' : 50, 'g' : 30, 'b' :10, 'a' : 120}
+		color = {'r': 50, 'g': 30, 'b': 10, 'a': 120}
 		Button.SetBorder (1, color, 0, 1)
 		Button.SetFont ("NUMBER")
 		Button.SetText ("")
@@ -1225,10 +1229,10 @@ def UpdateAnimation ():
 		animid = "ZO"
 	else:
 		slot = GemRB.GetEquippedQuickSlot (pc)
-		item = GemRB.GetSlotItem (pc, slot )
+		item = GemRB.GetSlotItem (pc, slot)
 		animid = ""
 		if item:
-			item = GemRB.GetItem(item["ItemResRef"])
+			item = ItemCache.GetItem (item["ItemResRef"])
 			if item:
 				animid = item["AnimationType"]
 
@@ -1578,15 +1582,16 @@ def GetPortraitButtonPairs (Window, ExtraSlots=0, Mode="vertical"):
 
 	# move the buttons back up, to combine the freed space
 	if scale:
-		for i in range(PartySize - 1):
-			button = pairs[i]
-			button.SetSize (buttonWidth, buttonHeight)
-			if i == 0:
-				continue # don't move the first portrait
-			rect = button.GetFrame ()
-			x = rect["x"]
-			y = rect["y"]
-			button.SetPos (x, y-portraitGap*i)
+		with GView.Batch ():
+			for i in range(PartySize - 1):
+				button = pairs[i]
+				button.SetSize (buttonWidth, buttonHeight)
+				if i == 0:
+					continue # don't move the first portrait
+				rect = button.GetFrame ()
+				x = rect["x"]
+				y = rect["y"]
+				button.SetPos (x, y-portraitGap*i)
 
 	return pairs
 
@@ -1740,10 +1745,83 @@ def OpenPortraitWindow (needcontrols=0, pos=WINDOW_RIGHT|WINDOW_VCENTER):
 		AddHPLabel (Window, Button, i)
 		SetupButtonBorders (Window, Button, i)
 
+	# fresh buttons, so nothing can be skipped
+	InvalidatePortraitStates ()
 	UpdatePortraitWindow ()
 	SelectionChanged ()
 	return Window
 
+# snapshots of everything UpdatePortraitWindow reads per pc, indexed by pcID
+# buttons whose snapshot didn't change since the last update are left alone
+PortraitStates = {}
+
+# name, level-up flag and portrait icons of each pc, indexed by pcID
+# they don't change on their own, so they are only refetched when the pc is
+# invalidated: the core does it when one of them changes (see Actor.cpp)
+PortraitInputs = {}
+
+def InvalidatePortraitStates (pcID = None):
+	"""Forces the next UpdatePortraitWindow to redo one or all portraits."""
+
+	if pcID is None:
+		PortraitStates.clear ()
+		PortraitInputs.clear ()
+	else:
+		PortraitStates.pop (pcID, None)
+		PortraitInputs.pop (pcID, None)
+
+def GetPortraitInputs (pcID, ResRef):
+	"""Returns the memoized name, level-up flag and portrait icons of a pc.
+
+	The entry is tied to the portrait, so reordering the party doesn't mix them up."""
+
+	Inputs = PortraitInputs.get (pcID)
+	if Inputs and Inputs[0] == ResRef:
+		return Inputs
+
+	Inputs = (ResRef, GemRB.GetPlayerName (pcID, 1), LUCommon.CanLevelUp (pcID), bytes(GemRB.GetPlayerStates (pcID)))
+	PortraitInputs[pcID] = Inputs
+	return Inputs
+
+def GetPortraitState (pcID, pc, Inventory, indialog, PartySize):
+	"""Returns a comparable snapshot of the inputs for one portrait button.
+
+	The fetched portrait is returned too, so it doesn't need to be copied twice."""
+
+	InParty = pcID <= PartySize
+	if GameCheck.IsPST():
+		Portrait = GemRB.GetPlayerPortrait (pcID, 0)
+		if not Portrait["ResRef"]:
+			return (InParty, indialog, None), Portrait
+		HealthBar = GemRB.GetVar ('Health Bar Settings') & (1 << (pcID - 1))
+		Stats = tuple(GemRB.GetPlayerStat (pcID, stat) for stat in (IE_STATE_ID, IE_HITPOINTS, IE_MAXHITPOINTS))
+		return (InParty, indialog, Portrait["ResRef"], Stats, HealthBar), Portrait
+
+	Portrait = GemRB.GetPlayerPortrait (pcID, 1)
+	if not Portrait["Sprite"] and not Portrait["ResRef"]:
+		# the button is blanked, nothing else matters
+		return (InParty, indialog, None), Portrait
+
+	state = GemRB.GetPlayerStat (pcID, IE_STATE_ID)
+	Hide = Inventory and pc != pcID
+	if Portrait["Sprite"] and state & STATE_DEAD:
+		import GUISTORE
+		Hide = Hide or (GUISTORE.StoreWindow and not GUISTORE.StoreHealWindow)
+	if Hide:
+		return (InParty, indialog, None), Portrait
+
+	Flags = ()
+	if GameCheck.IsBG2():
+		Flags = (pc == pcID and GemRB.GetStore() != None, GemRB.GameGetSelectedPCSingle(1) == pcID)
+
+	Stats = (state, GemRB.GetPlayerStat (pcID, IE_HITPOINTS), GemRB.GetPlayerStat (pcID, IE_MAXHITPOINTS))
+	State = (
+		InParty, indialog, Portrait["Sprite"] is not None, Stats,
+		GemRB.GetVar ("Old Portrait Health"), Flags,
+		GetPortraitInputs (pcID, Portrait["ResRef"])
+	)
+	return State, Portrait
+
 def UpdatePortraitWindow ():
 	"""Updates all of the portraits."""
 
@@ -1754,13 +1832,19 @@ def UpdatePortraitWindow ():
 	Inventory = GemRB.GetVar ("Inventory")
 	GSFlags = GemRB.GetGUIFlags()
 	indialog = GSFlags & GS_DIALOG
+	PartySize = GemRB.GetPartySize ()
 
 	PortraitButtons = GetPortraitButtonPairs (Window)
 	for i, Button in PortraitButtons.items():
 		pcID = i + 1
+		State, Portrait = GetPortraitState (pcID, pc, Inventory, indialog, PartySize)
+		if PortraitStates.get (pcID) == State:
+			continue
+		PortraitStates[pcID] = State
+
 		if indialog:
 			Button.SetHotKey(None)
-		if (pcID <= GemRB.GetPartySize()):
+		if (pcID <= PartySize):
 			Button.SetAction(lambda btn, pc=pcID: GemRB.GameControlLocateActor(pc), IE_ACT_MOUSE_ENTER);
 			Button.SetAction(lambda: GemRB.GameControlLocateActor(-1), IE_ACT_MOUSE_LEAVE);
 			if (i < 6 and not indialog):
@@ -1770,7 +1854,6 @@ def UpdatePortraitWindow ():
 			UpdateAnimatedPortrait(Window, i)
 			continue
 
-		Portrait = GemRB.GetPlayerPortrait (pcID, 1)
 		pic = Portrait["Sprite"]
 		Hide = False
 		if Inventory and pc != pcID:
@@ -1815,7 +1898,8 @@ def UpdatePortraitWindow ():
 			elif GemRB.GameGetSelectedPCSingle(1) == pcID:
 				flag = talk
 
-		if LUCommon.CanLevelUp (pcID):
+		_, _, LevelUp, effects = GetPortraitInputs (pcID, Portrait["ResRef"])
+		if LevelUp:
 			if GameCheck.IsBG2():
 				flag = flag + blank + bytearray([255])
 			else:
@@ -1834,8 +1918,6 @@ def UpdatePortraitWindow ():
 		FlagLabel.SetText(flag)
 
 		#add effects on the portrait
-		effects = GemRB.GetPlayerStates (pcID)
-
 		numCols = 4 if GameCheck.IsIWD2() else 3
 		numEffects = len(effects)
 
@@ -2001,7 +2083,7 @@ def MinimizePortraits(): #bg2
 
 def SetItemButton (Window, Button, Slot, PressHandler, RightPressHandler): #relates to pst containers
 	if Slot != None:
-		Item = GemRB.GetItem (Slot['ItemResRef'])
+		Item = ItemCache.GetItem (Slot['ItemResRef'])
 		identified = Slot['Flags'] & IE_INV_ITEM_IDENTIFIED
 		Button.SetItemIcon (Slot['ItemResRef'],0)
 
@@ -2057,6 +2139,8 @@ def CheckLevelUp(pc):
 	if GameCheck.IsGemRBDemo ():
 		return
 	GemRB.SetVar ("CheckLevelUp"+str(pc), LUCommon.CanLevelUp (pc))
+	# the xp changed, so the level-up flag on the portrait may have too
+	InvalidatePortraitStates (pc)
 
 def ToggleAlwaysRun():
 	GemRB.GameControlToggleAlwaysRun()
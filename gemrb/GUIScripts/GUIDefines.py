@@ -221,6 +221,7 @@ GA_NO_SELF    = 2048
 GF_ALL_STRINGS_TAGGED = 1
 
 STRING_FLAGS_RESOLVE_TAGS = 16
+STRING_FLAGS_RAW = 32
 
 # Shadow color for ShowModal()
 # !!! Keep these synchronized with Interface.h !!!
@@ -331,6 +332,8 @@ SV_HEIGHT = 2
 SV_GAMEPATH = 3
 SV_TOUCH = 4
 SV_SAVEPATH = 5
+SV_OVERRIDEPATH = 6
+SV_CDPATHS = 7
 
 # GUIEnhancements bits
 GE_SCROLLBARS = 1
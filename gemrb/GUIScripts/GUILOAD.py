@@ -23,6 +23,7 @@
 
 import GemRB
 import LoadScreen
+import SaveGameCache
 import GameCheck
 import GUICommon
 
@@ -41,8 +42,9 @@ def OnLoad ():
 		
 	GUICommon.SetSaveDir ()
 	LoadWindow = GemRB.LoadWindow (0, "GUILOAD")
+	LoadWindow.SetAction (SaveGameCache.BrowserClosed, ACTION_WINDOW_CLOSED)
 
-	CancelButton=LoadWindow.GetControl (34)
+	CancelButton = LoadWindow.GetControl (34)
 	CancelButton.SetText (13727)
 	CancelButton.OnPress (LoadWindow.Close)
 	CancelButton.MakeEscape()
@@ -98,7 +100,7 @@ def ScrollBarUpdated (sb):
 			if GameCheck.IsBG1 ():
 				ChapterTitle = GemRB.GetString (16202 + int(GemRB.GetToken ("CHAPTER0")))
 				SlotDate = ChapterTitle + ". " + SlotDate
-			PreviewButton.SetPicture (Games[ActPos].GetPreview())
+			PreviewButton.SetPicture (SaveGameCache.GetPreview (Games[ActPos]))
 		else:
 			Button1.SetState (IE_GUI_BUTTON_DISABLED)
 			Button2.SetState (IE_GUI_BUTTON_DISABLED)
@@ -113,9 +115,11 @@ def ScrollBarUpdated (sb):
 		for j in range (min(6, MAX_PARTY_SIZE)):
 			Button = LoadWindow.GetControl (40 + i*min(6, MAX_PARTY_SIZE) + j)
 			if ActPos < len(Games):
-				Button.SetPicture (Games[ActPos].GetPortrait (j))
+				Button.SetPicture (SaveGameCache.GetPortrait (Games[ActPos], j))
 			else:
 				Button.SetPicture (None)
+
+	SaveGameCache.Prefetch (Games, sb.Value, 4, min(6, MAX_PARTY_SIZE))
 	return
 	
 def OpenLoadMsgWindow (btn):
@@ -191,6 +195,7 @@ def DeleteGameConfirm (btn):
 
 	TopIndex = GemRB.GetVar ("TopIndex")
 	Pos = TopIndex + btn.Value
+	SaveGameCache.Invalidate (Games[Pos])
 	GemRB.DeleteSaveGame(Games[Pos])
 	del Games[Pos]
 
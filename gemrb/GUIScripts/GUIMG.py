@@ -146,7 +146,7 @@ def UpdateMageWindow (MageWindow):
 				Button.OnRightPress (OpenMageSpellInfoWindow)
 				MageMemorizedSpellList.append (ms['SpellResRef'])
 				Button.EnableBorder (0, ms['Flags'] == 0)
-				spell = GemRB.GetSpell (ms['SpellResRef'])
+				spell = Spellbook.GetSpell (ms['SpellResRef'])
 				if not spell:
 					print("Missing memorised spell!", ms['SpellResRef'])
 					continue
@@ -179,7 +179,7 @@ def UpdateMageWindow (MageWindow):
 		Button.OnPress (OnMageMemorizeSpell)
 		Button.OnRightPress (OpenMageSpellInfoWindow)
 		MageKnownSpellList.append (ks['SpellResRef'])
-		spell = GemRB.GetSpell (ks['SpellResRef'])
+		spell = Spellbook.GetSpell (ks['SpellResRef'])
 		if not spell:
 			print("Missing known spell!", ms['SpellResRef'])
 			continue
@@ -264,7 +264,7 @@ def OpenMageSpellInfoWindow ():
 	else:
 		ResRef = MageKnownSpellList[index - 100]
 
-	spell = GemRB.GetSpell (ResRef)
+	spell = Spellbook.GetSpell (ResRef)
 
 	Label = Window.GetControl (0x0fffffff)
 	Label.SetText (spell['SpellName'])
@@ -650,14 +650,14 @@ def ContingencyHelpSpell ():
 	i = GemRB.GetVar("PickedSpell")
 	spell = names[i]
 
-	if Spell1=="" and Count>0:
+	if Spell1 == "" and Count > 0:
 		Spell1 = spell
-	elif Spell2=="" and Count>1:
+	elif Spell2 == "" and Count > 1:
 		Spell2 = spell
-	elif Spell3=="" and Count>2:
+	elif Spell3 == "" and Count > 2:
 		Spell3 = spell
 
-	spl = GemRB.GetSpell(spell)
+	spl = Spellbook.GetSpell (spell)
 	ContingencyTextArea.SetText (spl["SpellDesc"])
 	UpdateSpellList ()
 	return
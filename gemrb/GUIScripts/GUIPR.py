@@ -26,6 +26,7 @@ import GameCheck
 import GUICommon
 import GUICommonWindows
 import CommonTables
+import Spellbook
 from GUIDefines import *
 from ie_stats import *
 from ie_action import ACT_CAST
@@ -120,7 +121,7 @@ def UpdatePriestWindow (Window):
 			else:
 				Button.OnPress (OnPriestUnmemorizeSpell)
 			Button.OnRightPress (OpenPriestSpellInfoWindow)
-			spell = GemRB.GetSpell (ms['SpellResRef'])
+			spell = Spellbook.GetSpell (ms['SpellResRef'])
 			Button.SetTooltip (spell['SpellName'])
 			PriestMemorizedSpellList.append (ms['SpellResRef'])
 			Button.EnableBorder (0, ms['Flags'] == 0)
@@ -145,7 +146,7 @@ def UpdatePriestWindow (Window):
 		Button.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
 		Button.OnPress (OnPriestMemorizeSpell)
 		Button.OnRightPress (OpenPriestSpellInfoWindow)
-		spell = GemRB.GetSpell (ks['SpellResRef'])
+		spell = Spellbook.GetSpell (ks['SpellResRef'])
 		Button.SetTooltip (spell['SpellName'])
 		PriestKnownSpellList.append (ks['SpellResRef'])
 		Button.SetVarAssoc ("SpellButton", 100 + i)
@@ -205,7 +206,7 @@ def OpenPriestSpellInfoWindow ():
 	else:
 		ResRef = PriestKnownSpellList[index - 100]
 
-	spell = GemRB.GetSpell (ResRef)
+	spell = Spellbook.GetSpell (ResRef)
 
 	if GameCheck.IsBG2():
 		Label = Window.GetControl (0x0fffffff)
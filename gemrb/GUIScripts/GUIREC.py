@@ -27,6 +27,8 @@ import CommonTables
 import LUCommon
 import LevelUp
 import DualClass
+import StringCache
+import Caches
 import GUIRECCommon
 import PartyReform
 from GUIDefines import *
@@ -275,27 +277,46 @@ def GA (pc, stat, col):
 # Basic full stat printout function for record sheet
 # LevelDiff is used only from the level up code and holds the level
 # difference for each class
+# the text is cached per party slot together with the actor's stats revision
+# (see GemRB.GetPlayerRevision) and the few inputs it doesn't cover, while the
+# tokens set when building it are restored on a reuse
+StatOverviewCache = {}
+StatOverviewTokens = ("CLASS", "LEVEL", "EXPERIENCE", "NEXTLEVEL", "SPELLLEVEL")
+
 def GetStatOverview (pc, LevelDiff=[0,0,0]):
+	key = (GemRB.GetPlayerRevision (pc), tuple (LevelDiff), GemRB.GameGetReputation (), GemRB.GetPlayerScript (pc))
+	cached = StatOverviewCache.get (pc)
+	if cached and cached[0] == key:
+		for token, value in cached[2]:
+			GemRB.SetToken (token, value)
+		return cached[1]
+
 	cdet = GemRB.GetCombatDetails (pc, 0)
 
 	outputtext = GetClassTitles (pc,LevelDiff)
-	outputtext+= GetEffectIcons (pc,LevelDiff)
-	outputtext+= GetProficiencies (pc, cdet)
-	outputtext+= GetLore (pc)
-	outputtext+= GetMagicResistance (pc)
-	outputtext+= GetPartyReputation (pc)
-	outputtext+= GetSkills (pc)
-	outputtext+= GetActiveAIscript (pc)
-	outputtext+= GetSavingThrows (pc)
-	outputtext+= GetWeaponProficiencies (pc)
-	outputtext+= GetACBonuses (pc)
-	outputtext+= GetAbilityBonuses (pc)
-	outputtext+= GetBonusSpells (pc)
-	outputtext+= GetResistances (pc)
-	outputtext+= GetWeaponStyleBonuses (pc, cdet)
-
+	outputtext += GetEffectIcons (pc,LevelDiff)
+	outputtext += GetProficiencies (pc, cdet)
+	outputtext += GetLore (pc)
+	outputtext += GetMagicResistance (pc)
+	outputtext += GetPartyReputation (pc)
+	outputtext += GetSkills (pc)
+	outputtext += GetActiveAIscript (pc)
+	outputtext += GetSavingThrows (pc)
+	outputtext += GetWeaponProficiencies (pc)
+	outputtext += GetACBonuses (pc)
+	outputtext += GetAbilityBonuses (pc)
+	outputtext += GetBonusSpells (pc)
+	outputtext += GetResistances (pc)
+	outputtext += GetWeaponStyleBonuses (pc, cdet)
+
+	tokens = [(token, GemRB.GetToken (token)) for token in StatOverviewTokens]
+	StatOverviewCache[pc] = (key, outputtext, [t for t in tokens if t[1] is not None])
 	return outputtext
 
+@Caches.Register
+def ResetStatOverview ():
+	StatOverviewCache.clear ()
+
 ########################################################################
 # The following functions have been split into categories,
 # so that they can be used for eg mouse over events  if desired
@@ -742,13 +763,13 @@ def GetWeaponStyleBonuses(pc, cdet):
 def TypeSetStats(stats, pc=0):
 	# everyone but bg1 has it somewhere
 	if GameCheck.IsBG2():
-		str_None = GemRB.GetString (61560)
+		str_None = StringCache.GetString (61560)
 	elif GameCheck.IsBG1():
 		str_None = -1
 	elif GameCheck.IsPST():
-		str_None = GemRB.GetString (41275)
+		str_None = StringCache.GetString (41275)
 	else:
-		str_None = GemRB.GetString (17093)
+		str_None = StringCache.GetString (17093)
 
 	res = []
 	noP = False
@@ -763,38 +784,38 @@ def TypeSetStats(stats, pc=0):
 				res.append (strref + ' ' + '+' * val)
 			elif stattype == 'p': #a plus prefix if positive
 				if val > 0:
-					res.append (GemRB.GetString (strref) + ' +' + str (val) )
+					res.append (StringCache.GetString (strref) + ' +' + str (val))
 				else:
-					res.append (GemRB.GetString (strref) + ' ' + str (val) )
+					res.append (StringCache.GetString (strref) + ' ' + str (val))
 			elif stattype == 'r': #a plus prefix if positive, strref is an already resolved string
 				if val > 0:
-					res.append (strref + ' +' + str (val) )
+					res.append (strref + ' +' + str (val))
 				else:
-					res.append (strref + ' ' + str (val) )
+					res.append (strref + ' ' + str (val))
 			elif stattype == 's': #both base and (modified) stat, but only if they differ
 				base = GB (pc, val)
 				stat = GS (pc, val)
-				base_str = GemRB.GetString (strref) + ': ' + str(stat)
+				base_str = StringCache.GetString (strref) + ': ' + str(stat)
 				if base == stat:
 					res.append (base_str)
 				else:
 					res.append (base_str + " (" + str(stat-base) + ")")
 			elif stattype == 'x': #x character before value
-				res.append (GemRB.GetString (strref) +': x' + str (val) )
+				res.append (StringCache.GetString (strref) + ': x' + str (val))
 			elif stattype == 'a': #value (portrait icon) + string
 				# '%' is the separator glyph in the states font
-				res.append ("[cap][int=" + str(val) + "]%[/cap][p]" + GemRB.GetString (strref) + "[/p]")
+				res.append ("[cap][int=" + str(val) + "]%[/cap][p]" + StringCache.GetString (strref) + "[/p]")
 				noP = True
 			elif stattype == 'b': #strref is an already resolved string
 				res.append (strref+": "+str (val))
 			elif stattype == 'c': #normal string
-				res.append (GemRB.GetString (strref))
+				res.append (StringCache.GetString (strref))
 			elif stattype == 'd': #strref is an already resolved string
 				res.append (strref)
 			elif stattype == '0': #normal value
-				res.append (GemRB.GetString (strref) + ': ' + str (val))
+				res.append (StringCache.GetString (strref) + ': ' + str (val))
 			else: #normal value + type character, for example percent sign
-				res.append (GemRB.GetString (strref) + ': ' + str (val) + stattype)
+				res.append (StringCache.GetString (strref) + ': ' + str (val) + stattype)
 		except:
 			if isinstance(s, str):
 				if s == len(s) * "\n": # check if the string is all newlines
@@ -804,7 +825,7 @@ def TypeSetStats(stats, pc=0):
 				else:
 					res.append (s);
 			else:
-				res.append (GemRB.GetString (s))
+				res.append (StringCache.GetString (s))
 
 	# effects only need a bump at the end
 	if noP:
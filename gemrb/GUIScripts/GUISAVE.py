@@ -26,6 +26,7 @@ import GameCheck
 import GUICommon
 import GUICommonWindows
 import LoadScreen
+import SaveGameCache
 from GameCheck import MAX_PARTY_SIZE
 from GUIDefines import *
 
@@ -52,9 +53,10 @@ def OpenSaveWindow ():
 	else:
 		if GameCheck.IsPST ():
 			ctrl_offset = (14, 18, 22, 0x10000004, 0x10000008, 13, 46, 1, 0x10000002, 6, 4, 5, 3)
-			strs = { 'cancel' : 4196, 'save' : 28645, 'delete' : 28640, 'empty' : 28647, 'overwrite' : 28644, 'yousure' : 28639 }
+			strs = {'cancel': 4196, 'save': 28645, 'delete': 28640, 'empty': 28647, 'overwrite': 28644, 'yousure': 28639}
 
 	SaveWindow = Window = GemRB.LoadWindow (0, "GUISAVE")
+	Window.SetAction (SaveGameCache.BrowserClosed, ACTION_WINDOW_CLOSED)
 
 	# Cancel button
 	CancelButton = Window.GetControl (ctrl_offset[6])
@@ -135,16 +137,18 @@ def ScrollBarPress ():
 
 		Button = Window.GetControl (1+i)
 		if ActPos < len(Games):
-			Button.SetPicture (Games[ActPos].GetPreview())
+			Button.SetPicture (SaveGameCache.GetPreview (Games[ActPos]))
 		else:
 			Button.SetPicture (None)
 
 		for j in range(min(6, MAX_PARTY_SIZE)):
 			Button = Window.GetControl (ctrl_offset[2] + i*min(6, MAX_PARTY_SIZE) + j)
 			if ActPos < len(Games):
-				Button.SetPicture (Games[ActPos].GetPortrait(j))
+				Button.SetPicture (SaveGameCache.GetPortrait (Games[ActPos], j))
 			else:
 				Button.SetPicture (None)
+
+	SaveGameCache.Prefetch (Games, Pos, num_rows, min(6, MAX_PARTY_SIZE))
 	return
 
 def QuickSavePressed ():
@@ -189,6 +193,7 @@ def ConfirmedSaveGame (Pos):
 	GUICommonWindows.CloseTopWindow ()
 
 	if Pos < len(Games):
+		SaveGameCache.Invalidate (Games[Pos])
 		GemRB.SaveGame (Games[Pos], Slotname, sav_version)
 	else:
 		GemRB.SaveGame (None, Slotname, sav_version)
@@ -212,7 +217,7 @@ def OpenConfirmWindow (btn):
 			GameDate = Games[Pos].GetGameDate ()
 
 		if AreaPreview:
-			AreaPreview.SetPicture (Games[Pos].GetPreview())
+			AreaPreview.SetPicture (SaveGameCache.GetPreview (Games[Pos]))
 	else:
 		Slotname = ""
 		GameDate = ""
@@ -233,7 +238,7 @@ def OpenConfirmWindow (btn):
 		if not Portrait:
 			continue
 		if Pos < len(Games):
-			Portrait.SetPicture (Games[Pos].GetPortrait(j))
+			Portrait.SetPicture (SaveGameCache.GetPortrait (Games[Pos], j))
 		else:
 			Portrait.SetPicture (None)
 
@@ -272,6 +277,7 @@ def DeleteGameConfirm (delIndex):
 
 	TopIndex = GemRB.GetVar ("TopIndex")
 	Pos = TopIndex + delIndex
+	SaveGameCache.Invalidate (Games[Pos])
 	GemRB.DeleteSaveGame (Games[Pos])
 	del Games[Pos]
 	if TopIndex > 0:
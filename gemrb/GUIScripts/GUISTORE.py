@@ -25,6 +25,8 @@ import GemRB
 import GameCheck
 import GUICommon
 import GUICommonWindows
+import ItemCache
+import StringCache
 from CommonWindow import AddScrollbarProxy
 from GUIDefines import *
 from ie_stats import *
@@ -66,6 +68,21 @@ MaxAmount = 0
 BuySum = 0
 SellSum = 0
 
+# pricing state of the shopping window, see PreparePrices
+PriceModifiers = None
+PriceCache = {}
+StoreRows = {}
+JewelryTypes = None
+
+# scrolled item lists of the shopping window and the rows they show
+LeftList = None
+RightList = None
+LeftFlags = []
+RightFlags = []
+RightRows = ()
+RightType = ITEM_PC
+ShopIdx = [0, 0, 0, 0]
+
 # 0 - Store
 # 1 - Tavern
 # 2 - Inn
@@ -177,15 +194,18 @@ def OpenStoreWindow ():
 			top.Focus()
 		return func()
 	
-	store_funcs = (lambda: ChangeStoreView(OpenStoreShoppingWindow),
-					lambda: ChangeStoreView(OpenStoreIdentifyWindow),
-					lambda: ChangeStoreView(OpenStoreStealWindow),
-					lambda: ChangeStoreView(OpenStoreHealWindow),
-					lambda: ChangeStoreView(OpenStoreDonateWindow),
-					lambda: ChangeStoreView(OpenStoreRumourWindow),
-					lambda: ChangeStoreView(OpenStoreRentWindow) )
+	store_funcs = (
+		lambda: ChangeStoreView(OpenStoreShoppingWindow),
+		lambda: ChangeStoreView(OpenStoreIdentifyWindow),
+		lambda: ChangeStoreView(OpenStoreStealWindow),
+		lambda: ChangeStoreView(OpenStoreHealWindow),
+		lambda: ChangeStoreView(OpenStoreDonateWindow),
+		lambda: ChangeStoreView(OpenStoreRumourWindow),
+		lambda: ChangeStoreView(OpenStoreRentWindow)
+	)
 	
 	Store = GemRB.GetStore ()
+	InvalidatePrices ()
 	#based on shop type, these buttons will change
 	store_buttons = Store['StoreButtons']
 	BarteringPC = GemRB.GameGetFirstSelectedPC ()
@@ -259,6 +279,7 @@ def OpenStoreWindow ():
 
 def InitStoreShoppingWindow (Window):
 	global LeftButton, RightButton, Inventory
+	global LeftList, RightList
 
 	Window.AddAlias('WINSHOP')
 	PositionStoreWinRelativeTo(Window)
@@ -299,14 +320,19 @@ def InitStoreShoppingWindow (Window):
 
 	Window.AliasControls (aliases)
 
+	Views = [(Window.GetControlAlias ('LBTN' + str(i)), Window.GetControlAlias ('LLBL' + str(i))) for i in range (ItemButtonCount)]
+	LeftList = GUICommon.VirtualList (ItemButtonCount, GetLeftRow, lambda i, index, Slot: DrawShopItem (Window, i, index, Slot, ITEM_STORE), Views)
+	Views = [(Window.GetControlAlias ('RBTN' + str(i)), Window.GetControlAlias ('RLBL' + str(i))) for i in range (ItemButtonCount)]
+	RightList = GUICommon.VirtualList (ItemButtonCount, GetRightRow, lambda i, index, Slot: DrawShopItem (Window, i, index, Slot, RightType), Views)
+
 	# left scrollbar
 	ScrollBarLeft = Window.GetControlAlias ('STOSBARL')
-	ScrollBarLeft.OnChange (lambda: RedrawStoreShoppingWindow(Window))
+	ScrollBarLeft.OnChange (lambda: ScrollStoreShoppingWindow(Window))
 	AddScrollbarProxy(Window, ScrollBarLeft, Window.GetControlAlias('LBTN0'))
 
 	# right scrollbar
 	ScrollBarRight = Window.GetControlAlias ('STOSBARR')
-	ScrollBarRight.OnChange (lambda: RedrawStoreShoppingWindow(Window))
+	ScrollBarRight.OnChange (lambda: ScrollStoreShoppingWindow(Window))
 	AddScrollbarProxy(Window, ScrollBarRight, Window.GetControlAlias('RBTN0'))
 
 	if GemRB.GetVar ("Inventory"):
@@ -437,10 +463,11 @@ def UpdateStoreShoppingWindow (Window):
 	Store = GemRB.GetStore ()
 	pc = GetPC()
 	Bag = GemRB.GetStore (STORE_BAG)
+	InvalidatePrices ()
 
 	LeftCount = Store['StoreItemCount'] - ItemButtonCount
-	if LeftCount<0:
-		LeftCount=0
+	if LeftCount < 0:
+		LeftCount = 0
 	ScrollBar = Window.GetControlAlias ('STOSBARL')
 	ScrollBar.SetVarAssoc ("LeftTopIndex", GemRB.GetVar ("LeftTopIndex"), 0, LeftCount)
 	LeftTopIndex = GemRB.GetVar ("LeftTopIndex")
@@ -634,6 +661,7 @@ def UpdateStoreStealWindow (Window):
 
 	#reget store in case of a change
 	Store = GemRB.GetStore ()
+	InvalidatePrices ()
 	LeftCount = Store['StoreItemCount']
 	ScrollBar = Window.GetControlAlias ('SWLSBAR')
 	ScrollBar.SetVarAssoc ("LeftTopIndex", 0, 0, max(0, LeftCount - ItemButtonCount))
@@ -1088,7 +1116,7 @@ def BuyPressed ():
 		Flags = GemRB.IsValidStoreItem (pc, i-1, ITEM_STORE)&SHOP_SELECT
 		if Flags:
 			Slot = GemRB.GetStoreItem (i-1)
-			Item = GemRB.GetItem (Slot['ItemResRef'])
+			Item = ItemCache.GetItem (Slot['ItemResRef'])
 			Price = GetRealPrice (pc, "sell", Item, Slot) * Slot['Purchased']
 			if Price <= 0:
 				Price = Slot['Purchased']
@@ -1157,7 +1185,7 @@ def OpenBag (Window):
 	pc = GemRB.GameGetSelectedPCSingle ()
 	RightIndex = GemRB.GetVar ("RightIndex")
 	Slot = GemRB.GetSlotItem (pc, inventory_slots[RightIndex])
-	Item = GemRB.GetItem (Slot['ItemResRef'])
+	Item = ItemCache.GetItem (Slot['ItemResRef'])
 	if Item['Function'] & ITM_F_CONTAINER:
 		GemRB.SetVar ("RightIndex", 0)
 		GemRB.SetVar ("RightTopIndex", 0)
@@ -1194,22 +1222,19 @@ def UnselectBag ():
 
 def RedrawStoreShoppingWindow (Window):
 	global BuySum, SellSum
+	global LeftFlags, RightFlags, RightRows, RightType
 
 	UpdateStoreCommon (Window, "STOTITLE", "STONAME", "STOGOLD")
 	pc = GemRB.GameGetSelectedPCSingle ()
+	PreparePrices (pc)
 
-	LeftTopIndex = GemRB.GetVar ("LeftTopIndex")
-	LeftIndex = GemRB.GetVar ("LeftIndex")
-	RightTopIndex = GemRB.GetVar ("RightTopIndex")
-	RightIndex = GemRB.GetVar ("RightIndex")
-	idx = [ LeftTopIndex, RightTopIndex, LeftIndex, RightIndex ]
 	LeftCount = Store['StoreItemCount']
+	LeftFlags = [GemRB.IsValidStoreItem (pc, i, ITEM_STORE) for i in range (LeftCount)]
 	BuySum = 0
 	selected_count = 0
 	for i in range (LeftCount):
-		if GemRB.IsValidStoreItem (pc, i, ITEM_STORE) & SHOP_SELECT:
-			Slot = GemRB.GetStoreItem (i)
-			Item = GemRB.GetItem (Slot['ItemResRef'])
+		if LeftFlags[i] & SHOP_SELECT:
+			Slot, Item = GetStoreRow (pc, i, ITEM_STORE, LeftFlags[i])
 			selected_count += 1
 			if Inventory:
 				Price = 1
@@ -1220,21 +1245,18 @@ def RedrawStoreShoppingWindow (Window):
 			BuySum = BuySum + Price
 
 	if Bag:
-		RightCount = Bag['StoreItemCount']
+		RightType = ITEM_BAG
+		RightRows = range (Bag['StoreItemCount'])
 	else:
-		RightCount = len(inventory_slots)
+		RightType = ITEM_PC
+		RightRows = inventory_slots
+	RightCount = len(RightRows)
+	RightFlags = [GemRB.IsValidStoreItem (pc, index, RightType) for index in RightRows]
 	SellSum = 0
 	for i in range (RightCount):
-		if Bag:
-			Flags = GemRB.IsValidStoreItem (pc, i, ITEM_BAG)
-		else:
-			Flags = GemRB.IsValidStoreItem (pc, inventory_slots[i], ITEM_PC)
+		Flags = RightFlags[i]
 		if Flags & SHOP_SELECT:
-			if Bag:
-				Slot = GemRB.GetStoreItem (i, STORE_BAG)
-			else:
-				Slot = GemRB.GetSlotItem (pc, inventory_slots[i])
-			Item = GemRB.GetItem (Slot['ItemResRef'])
+			Slot, Item = GetStoreRow (pc, RightRows[i], RightType, Flags)
 			if Inventory:
 				Price = 1
 			else:
@@ -1287,27 +1309,10 @@ def RedrawStoreShoppingWindow (Window):
 			CloseBagButton.SetState (IE_GUI_BUTTON_LOCKED)
 			CloseBagButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_OR)
 
-	for i in range (ItemButtonCount):
-		if i+LeftTopIndex<LeftCount:
-			Slot = GemRB.GetStoreItem (i+LeftTopIndex)
-		else:
-			Slot = None
-		Button = Window.GetControlAlias ('LBTN' + str(i))
-		Label = Window.GetControlAlias ('LLBL' + str(i))
-		Button.SetVarAssoc ("LeftIndex", LeftTopIndex+i)
-		SetupItems (pc, Slot, Button, Label, i, ITEM_STORE, idx)
-
-		if i+RightTopIndex<RightCount:
-			if Bag:
-				Slot = GemRB.GetStoreItem (i+RightTopIndex, STORE_BAG)
-			else:
-				Slot = GemRB.GetSlotItem (pc, inventory_slots[i+RightTopIndex])
-		else:
-			Slot = None
-		Button = Window.GetControlAlias ('RBTN' + str(i))
-		Label = Window.GetControlAlias ('RLBL' + str(i))
-		Button.SetVarAssoc ("RightIndex", RightTopIndex+i)
-		SetupItems (pc, Slot, Button, Label, i, ITEM_BAG if Bag else ITEM_PC, idx)
+	# selection and amounts may have changed, so redraw every visible row
+	LeftList.SetCount (LeftCount)
+	RightList.SetCount (RightCount)
+	ScrollStoreShoppingWindow (Window)
 
 	if GameCheck.IsPST():
 		GUICommon.SetEncumbranceLabels (Window, 25, None, pc)
@@ -1315,6 +1320,39 @@ def RedrawStoreShoppingWindow (Window):
 		GUICommon.SetEncumbranceLabels (Window, 0x10000043, 0x10000044, pc)
 	return
 
+def ScrollStoreShoppingWindow (Window):
+	"""Only redraws the item rows which got scrolled into view."""
+	global ShopIdx
+
+	LeftTopIndex = GemRB.GetVar ("LeftTopIndex")
+	LeftIndex = GemRB.GetVar ("LeftIndex")
+	RightTopIndex = GemRB.GetVar ("RightTopIndex")
+	RightIndex = GemRB.GetVar ("RightIndex")
+	ShopIdx = [LeftTopIndex, RightTopIndex, LeftIndex, RightIndex]
+
+	LeftList.Scroll (LeftTopIndex)
+	RightList.Scroll (RightTopIndex)
+	return
+
+def GetLeftRow (index):
+	pc = GemRB.GameGetSelectedPCSingle ()
+	return GetStoreRow (pc, index, ITEM_STORE, LeftFlags[index])[0]
+
+def GetRightRow (index):
+	pc = GemRB.GameGetSelectedPCSingle ()
+	return GetStoreRow (pc, RightRows[index], RightType, RightFlags[index])[0]
+
+def DrawShopItem (Window, i, index, Slot, storetype):
+	pc = GemRB.GameGetSelectedPCSingle ()
+	if storetype == ITEM_STORE:
+		Button, Label = LeftList.GetViews (i)
+		Button.SetVarAssoc ("LeftIndex", index)
+	else:
+		Button, Label = RightList.GetViews (i)
+		Button.SetVarAssoc ("RightIndex", index)
+	SetupItems (pc, Slot, Button, Label, i, storetype, ShopIdx)
+	return
+
 def OpenItemAmountWindow (ShopWin, store = STORE_MAIN):
 	global MaxAmount
 
@@ -1433,7 +1471,7 @@ def RedrawStoreIdentifyWindow (Window):
 		Button.SetVarAssoc ("Index", TopIndex+i)
 		if Slot:
 			Flags = GemRB.IsValidStoreItem (pc, inventory_slots[TopIndex+i], ITEM_PC)
-			Item = GemRB.GetItem (Slot['ItemResRef'])
+			Item = ItemCache.GetItem (Slot['ItemResRef'])
 			Button.SetItemIcon (Slot['ItemResRef'], 0)
 			if Item['MaxStackAmount'] > 1:
 				Button.SetText (str(Slot['Usages0']))
@@ -1496,7 +1534,7 @@ def IdentifyPressed (Window):
 	for i in toID:
 		GemRB.ChangeStoreItem (pc, inventory_slots[i], SHOP_ID)
 		Slot = GemRB.GetSlotItem (pc, inventory_slots[i])
-		Item = GemRB.GetItem (Slot['ItemResRef'])
+		Item = ItemCache.GetItem (Slot['ItemResRef'])
 		# FIXME: some items have the title, some don't - figure it out
 		TextArea.Append(Item['ItemNameIdentified'])
 		TextArea.Append("\n\n")
@@ -1514,14 +1552,14 @@ def InfoIdentifyWindow ():
 	if Index >= Count:
 		return
 	Slot = GemRB.GetSlotItem (pc, inventory_slots[Index])
-	Item = GemRB.GetItem (Slot['ItemResRef'])
+	Item = ItemCache.GetItem (Slot['ItemResRef'])
 	InfoWindow (Slot, Item)
 	return
 
 def InfoLeftWindow ():
 	Index = GemRB.GetVar ("LeftIndex")
 	Slot = GemRB.GetStoreItem (Index)
-	Item = GemRB.GetItem (Slot['ItemResRef'])
+	Item = ItemCache.GetItem (Slot['ItemResRef'])
 	InfoWindow (Slot, Item)
 	return
 
@@ -1529,14 +1567,14 @@ def InfoRightWindow ():
 	Index = GemRB.GetVar ("RightIndex")
 	if Bag:
 		Slot = GemRB.GetStoreItem (Index, STORE_BAG)
-		Item = GemRB.GetItem (Slot['ItemResRef'])
+		Item = ItemCache.GetItem (Slot['ItemResRef'])
 	else:
 		pc = GemRB.GameGetSelectedPCSingle ()
 		Count = len(inventory_slots)
 		if Index >= Count:
 			return
 		Slot = GemRB.GetSlotItem (pc, inventory_slots[Index])
-		Item = GemRB.GetItem (Slot['ItemResRef'])
+		Item = ItemCache.GetItem (Slot['ItemResRef'])
 	InfoWindow (Slot, Item)
 	return
 
@@ -1624,9 +1662,10 @@ def RedrawStoreStealWindow (Window):
 	LeftIndex = GemRB.GetVar ("LeftIndex")
 	RightTopIndex = GemRB.GetVar ("RightTopIndex")
 	RightIndex = GemRB.GetVar ("RightIndex")
-	idx = [ LeftTopIndex, RightTopIndex, LeftIndex, RightIndex ]
+	idx = [LeftTopIndex, RightTopIndex, LeftIndex, RightIndex]
 	LeftCount = Store['StoreItemCount']
 	pc = GemRB.GameGetSelectedPCSingle ()
+	PreparePrices (pc)
 	RightCount = len(inventory_slots)
 	for i in range (ItemButtonCount):
 		Slot = GemRB.GetStoreItem (i+LeftTopIndex)
@@ -1683,10 +1722,10 @@ def SetupItems (pc, Slot, Button, Label, i, storetype, idx, steal=0):
 		RightTopIndex = idx[1]
 		LeftIndex = idx[2]
 
-		Item = GemRB.GetItem (Slot['ItemResRef'])
+		Item = ItemCache.GetItem (Slot['ItemResRef'])
 		Button.SetItemIcon (Slot['ItemResRef'], 0)
-		if Item['MaxStackAmount']>1:
-			Button.SetText ( str(Slot['Usages0']) )
+		if Item['MaxStackAmount'] > 1:
+			Button.SetText (str(Slot['Usages0']))
 		else:
 			Button.SetText ("")
 		Button.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
@@ -1748,29 +1787,29 @@ def SetupItems (pc, Slot, Button, Label, i, storetype, idx, steal=0):
 				Button.SetState (IE_GUI_BUTTON_DISABLED)
 
 		if Flags & SHOP_ID:
-			Name = GemRB.GetString (Item['ItemName'])
+			Name = StringCache.GetString (Item['ItemName'])
 			Button.EnableBorder (0, 1)
 			if not steal and storetype != ITEM_STORE:
 				Price = 1
 		else:
-			Name = GemRB.GetString (Item['ItemNameIdentified'])
+			Name = StringCache.GetString (Item['ItemNameIdentified'])
 			Button.EnableBorder (0, 0)
 
 		GemRB.SetToken ("ITEMNAME", Name)
 		if Inventory or (storetype == ITEM_STORE and steal):
 			if GameCheck.IsIWD1() or GameCheck.IsIWD2():
-				LabelText = GemRB.GetString (24890)
+				LabelText = StringCache.GetString (24890)
 			elif GameCheck.IsBG2():
-				LabelText = GemRB.GetString (28337)
+				LabelText = StringCache.GetString (28337)
 			elif steal:
 				LabelText = Name
 			else:
 				LabelText = ""
 		else:
-			GemRB.SetToken ("ITEMCOST", str(Price) )
-			LabelText = GemRB.GetString (strrefs["itemnamecost"])
+			GemRB.SetToken ("ITEMCOST", str(Price))
+			LabelText = StringCache.GetString (strrefs["itemnamecost"])
 		if GameCheck.IsPST():
-			LabelText = GemRB.GetString (strrefs["itemnamecost"])
+			LabelText = StringCache.GetString (strrefs["itemnamecost"])
 		if (storetype == ITEM_STORE and not steal) or storetype == ITEM_BAG:
 			if Slot["Amount"] != -1:
 				LabelText = LabelText + " (" + str(Slot["Amount"]) + ")"
@@ -1791,25 +1830,88 @@ def GetRealCurePrice (cure):
 		return 150 * raisingPrice // 100
 	return cure['Price']
 
+def InvalidatePrices ():
+	"""Forgets cached rows and prices, needed whenever the store contents change."""
+	PriceCache.clear ()
+	StoreRows.clear ()
+	return
+
+def GetStoreRow (pc, index, storetype, Flags):
+	"""Returns the (Slot, Item) pair of a store, bag or inventory row.
+
+	Selecting a row changes its purchased amount, so rows are refetched
+	when their selection differs from the cached one."""
+	key = (storetype, index)
+	selected = Flags & SHOP_SELECT
+	row = StoreRows.get (key)
+	if row and row[0] == selected:
+		return row[1:]
+
+	if storetype == ITEM_STORE:
+		Slot = GemRB.GetStoreItem (index)
+	elif storetype == ITEM_BAG:
+		Slot = GemRB.GetStoreItem (index, STORE_BAG)
+	else:
+		Slot = GemRB.GetSlotItem (pc, index)
+	Item = ItemCache.GetItem (Slot['ItemResRef']) if Slot else None
+	StoreRows[key] = (selected, Slot, Item)
+	return Slot, Item
+
+def GetJewelryTypes ():
+	global JewelryTypes
+
+	if JewelryTypes is None:
+		JewelryTypes = frozenset (CommonTables.ItemType.GetRowIndex (t) for t in ("GEM", "RING", "AMULET"))
+	return JewelryTypes
+
+def PreparePrices (pc):
+	"""Gathers the price modifiers once per redraw, dropping stale prices if they changed."""
+	global PriceModifiers
+
+	# modifiers from store properties (in percent)
+	BuyMod = Store['BuyMarkup']
+	SellMod = Store['SellMarkup']
+	if GemRB.HasFeat(pc, FEAT_MERCANTILE_BACKGROUND):
+		BuyMod -= 5
+		SellMod += 5
+
+	# charisma modifier (in percent)
+	SellMod += GemRB.GetAbilityBonus (IE_CHR, GemRB.GetPlayerStat (BarteringPC, IE_CHR) - 1, 0)
+
+	# reputation modifier (in percent, but absolute)
+	RepMod = None
+	if RepModTable and not (Store['StoreFlags'] & SHOP_NOREPADJ):
+		RepMod = RepModTable.GetValue (0, GemRB.GameGetReputation() // 10 - 1)
+
+	Modifiers = (pc, BuyMod, SellMod, RepMod, Store['Depreciation'])
+	if Modifiers != PriceModifiers:
+		if PriceModifiers and PriceModifiers[0] != pc:
+			StoreRows.clear ()
+		PriceModifiers = Modifiers
+		PriceCache.clear ()
+	return
+
 def GetRealPrice (pc, mode, Item, Slot):
+	if PriceModifiers is None or PriceModifiers[0] != pc:
+		PreparePrices (pc)
+
+	# the price only depends on the item, its charges and the store stock
+	key = (mode, Slot['ItemResRef'].lower (), Slot['Usages0'])
+	if key not in PriceCache:
+		PriceCache[key] = _GetRealPrice (mode, Item, Slot)
+	return PriceCache[key]
+
+def _GetRealPrice (mode, Item, Slot):
+	BuyMod, SellMod, RepMod, Depreciation = PriceModifiers[1:]
+
 	# get the base from the item
 	price = Item['Price']
 
-	if Item['MaxStackAmount']>1:
+	if Item['MaxStackAmount'] > 1:
 		price = price * Slot['Usages0']
-	elif Item['MaxCharge']>0:
+	elif Item['MaxCharge'] > 0:
 		price = price * Slot['Usages0'] // Item['MaxCharge']
 
-	# modifier from store properties (in percent)
-	if mode == "buy":
-		mod = Store['BuyMarkup']
-		if GemRB.HasFeat(pc, FEAT_MERCANTILE_BACKGROUND):
-			mod -= 5
-	else:
-		mod = Store['SellMarkup']
-		if GemRB.HasFeat(pc, FEAT_MERCANTILE_BACKGROUND):
-			mod += 5
-
 	# depreciation works like this:
 	# - if you sell the item the first time, SellMarkup is used;
 	# - if you sell the item the second time, SellMarkup-DepreciationRate is used;
@@ -1820,23 +1922,19 @@ def GetRealPrice (pc, mode, Item, Slot):
 	# separately will produce less gold then selling them at the same time.
 	# We don't care who is the seller, so if the store already has 2 items, there'll be no gain
 	if mode == "buy":
+		mod = BuyMod
 		count = GemRB.FindStoreItem (Slot["ItemResRef"])
 		if count:
 			# jewelry doesn't suffer from deprecation, at least in BG2
-			if Item['Type'] in [CommonTables.ItemType.GetRowIndex ("GEM"),
-			                    CommonTables.ItemType.GetRowIndex ("RING"),
-			                    CommonTables.ItemType.GetRowIndex ("AMULET")]:
+			if Item['Type'] in GetJewelryTypes ():
 				count = 0
 			# give at least 20 %
-			mod -= count * Store['Depreciation']
+			mod -= count * Depreciation
 			mod = max(mod, 20)
 	else:
-		# charisma modifier (in percent)
-		mod += GemRB.GetAbilityBonus (IE_CHR, GemRB.GetPlayerStat (BarteringPC, IE_CHR) - 1, 0)
-
-		# reputation modifier (in percent, but absolute)
-		if RepModTable and not (Store['StoreFlags'] & SHOP_NOREPADJ):
-			mod = mod * RepModTable.GetValue (0, GemRB.GameGetReputation() // 10 - 1) // 100
+		mod = SellMod
+		if RepMod is not None:
+			mod = mod * RepMod // 100
 
 	effprice = price * mod // 100
 	#in bg2 even 1gp items can be sold for at least 1gp
@@ -21,6 +21,7 @@
 import os
 
 import GemRB
+import Caches
 from ie_restype import RES_WMP, RES_ARE, RES_2DA
 from GUIDefines import SV_GAMEPATH
 
@@ -56,29 +57,52 @@ def IsBG2Demo ():
 def IsGemRBDemo ():
 	return GemRB.GameType == "demo"
 
+# capability registry: every probe below runs once, until a game is
+# loaded or an expansion enabled; see GetCapabilities for an overview
+Capabilities = {}
+
+def HasCapability (key):
+	if key not in Capabilities:
+		Capabilities[key] = Probes[key] ()
+	return Capabilities[key]
+
+@Caches.Register
+def ResetCapabilities ():
+	Capabilities.clear ()
+
+def GetCapabilities ():
+	"""Probes everything and returns the results, eg. for inspection from the console."""
+
+	for key in Probes:
+		HasCapability (key)
+	return dict(Capabilities)
+
 def IsTOB ():
-	return GemRB.HasResource ("worldm25", RES_WMP) and GemRB.GetVar("oldgame") == 0
+	return HasCapability ("TOB") and GemRB.GetVar("oldgame") == 0
 
 def HasTOB ():
-	return GemRB.HasResource ("worldm25", RES_WMP)
+	return HasCapability ("TOB")
 
 def HasHOW ():
-	return GemRB.HasResource ("expmap", RES_WMP)
+	return HasCapability ("HOW")
 
 def HasTOTL ():
-	return GemRB.HasResource ("ar9700", RES_ARE)
+	return HasCapability ("TOTL")
 
 def HasBGT ():
-	return GemRB.HasResource ("ar7200", RES_ARE)
+	return HasCapability ("BGT")
 
 def HasTutu ():
-	return GemRB.HasResource ("fw0125", RES_ARE)
+	return HasCapability ("Tutu")
 
 def HasTOTSC ():
-	return GemRB.HasResource ("toscst", RES_2DA)
+	return HasCapability ("TOTSC")
 
-# there are no marker files, so check weidu.log
 def HasWideScreenMod ():
+	return HasCapability ("WideScreenMod")
+
+# there are no marker files, so check weidu.log
+def ProbeWideScreenMod ():
 	gamePath = GemRB.GetSystemVariable (SV_GAMEPATH)
 	weiduLogPath = os.path.join (gamePath, "weidu.log")
 	try:
@@ -96,3 +120,13 @@ def HasWideScreenMod ():
 
 	weiduLog.close ()
 	return ret
+
+Probes = {
+	"TOB": lambda: GemRB.HasResource ("worldm25", RES_WMP),
+	"HOW": lambda: GemRB.HasResource ("expmap", RES_WMP),
+	"TOTL": lambda: GemRB.HasResource ("ar9700", RES_ARE),
+	"BGT": lambda: GemRB.HasResource ("ar7200", RES_ARE),
+	"Tutu": lambda: GemRB.HasResource ("fw0125", RES_ARE),
+	"TOTSC": lambda: GemRB.HasResource ("toscst", RES_2DA),
+	"WideScreenMod": ProbeWideScreenMod,
+}
@@ -19,9 +19,11 @@
 import re
 
 import GemRB
+import Caches
 import CommonTables
 import GameCheck
 import GUICommon
+import ItemCache
 import Spellbook
 from GUIDefines import *
 from ie_stats import *
@@ -38,11 +40,20 @@ ErrorWindow = None
 ColorPicker = None
 StackAmount = 0
 
- # A map that defines which inventory slots are used per character (PST)
+# A map that defines which inventory slots are used per character (PST)
 SlotMap = None
 
 UpdateInventoryWindow = None
 
+# what each inventory slot was last drawn from, so refreshes skip the unchanged ones
+SlotSnapshots = {}
+SnapshotPC = None
+# the stats deciding the usability of items and the quick slot layout
+SnapshotStats = (IE_CLASS, IE_KIT, IE_MC_FLAGS, IE_LEVEL, IE_LEVEL2, IE_LEVEL3, IE_ALIGNMENT, IE_RACE, IE_STR, IE_STREXTRA, IE_INT, IE_WIS, IE_DEX, IE_CON, IE_CHR, IE_LORE)
+if GameCheck.IsIWD2():
+	# items check the use magic device skill and the levels of every class
+	SnapshotStats += (IE_MAGICDEVICE, IE_LEVELBARBARIAN, IE_LEVELBARD, IE_LEVELCLERIC, IE_LEVELDRUID, IE_LEVELFIGHTER, IE_LEVELMONK, IE_LEVELPALADIN, IE_LEVELRANGER, IE_LEVELSORCERER, IE_LEVELTHIEF, IE_LEVELMAGE)
+
 def OnDragItemGround (btn):
 	"""Drops and item to the ground."""
 	
@@ -51,9 +62,9 @@ def OnDragItemGround (btn):
 
 	GemRB.GetView ("MsgSys").SetText ("")
 
-	if GemRB.IsDraggingItem ()==0:
+	if GemRB.IsDraggingItem () == 0:
 		slot_item = GemRB.GetContainerItem (pc, slot)
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		GemRB.DragItem (pc, slot, item["ItemIcon"], 0, 1) #container
 		if GameCheck.IsPST():
 			GemRB.PlaySound (item["DescIcon"])
@@ -94,7 +105,7 @@ def OnDragItem (btn):
 	GemRB.GetView ("MsgSys").SetText ("")
 
 	if not GemRB.IsDraggingItem ():
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		GemRB.DragItem (pc, slot, item["ItemIcon"], 0, 0)
 		if slot == 2: # reset disguise
 			GemRB.SetGlobal ("APPEARANCE", "GLOBAL", 0)
@@ -105,9 +116,9 @@ def OnDragItem (btn):
 			SlotType["ResRef"] = ""
 			GemRB.DisplayString (61355, ColorWhite)
 
-		if SlotType["ResRef"]!="":
+		if SlotType["ResRef"] != "":
 			if slot_item:
-				item = GemRB.GetItem (slot_item["ItemResRef"])
+				item = ItemCache.GetItem (slot_item["ItemResRef"])
 				#drag items into a bag
 				if item["Function"] & ITM_F_CONTAINER:
 					#first swap them
@@ -130,7 +141,7 @@ def OnDragItem (btn):
 					GemRB.LeaveStore()
 
 			item = GemRB.GetSlotItem (0, 0)
-			itemData = GemRB.GetItem (item['ItemResRef'])
+			itemData = ItemCache.GetItem (item['ItemResRef'])
 			GemRB.DropDraggedItem (pc, slot)
 
 			# handle pst disguises
@@ -195,7 +206,7 @@ def DragItemAmount (slot_item, location = "inventory"):
 	if slot_item:
 		Text = ItemAmountWindow.GetControl (6)
 		Amount = Text.QueryInteger ()
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		GemRB.DragItem (pc, UsedSlot, item["ItemIcon"], Amount, location == "ground")
 	ItemAmountWindow.Close()
 	return
@@ -255,7 +266,7 @@ def GetItemDescription (item, itemtype):
 def DisplayItem (slotItem, itemtype):
 	global ItemInfoWindow
 
-	item = GemRB.GetItem (slotItem["ItemResRef"])
+	item = ItemCache.GetItem (slotItem["ItemResRef"])
 	
 	#window can be refreshed by cycling to next/prev item, so it may still exist
 	if not ItemInfoWindow:
@@ -466,7 +477,7 @@ def OpenItemInfoWindow (slot):
 		DisplayItem (GemRB.GetSlotItem (pc, 0), 1)
 		return
 
-	item = GemRB.GetItem (slotItem["ItemResRef"])
+	item = ItemCache.GetItem (slotItem["ItemResRef"])
 
 	if TryAutoIdentification(pc, item, slot, slotItem, True):
 		UpdateInventoryWindow ()
@@ -480,7 +491,7 @@ def OpenItemInfoWindow (slot):
 
 #auto identify when lore is high enough
 def TryAutoIdentification(pc, item, slot, slot_item, enabled=0):
-	if enabled and item["LoreToID"]<=GemRB.GetPlayerStat (pc, IE_LORE):
+	if enabled and item["LoreToID"] <= GemRB.GetPlayerStat (pc, IE_LORE):
 		GemRB.ChangeItemFlag (pc, slot, IE_INV_ITEM_IDENTIFIED, OP_OR)
 		slot_item["Flags"] |= IE_INV_ITEM_IDENTIFIED
 		return True
@@ -589,9 +600,54 @@ def OpenItemAmountWindow (btn, location = "inventory"):
 	Window.ShowModal (MODAL_SHADOW_GRAY)
 	return
 
+def GetSlotSnapshot (pc):
+	"""Returns what all of pc's inventory slots are drawn from."""
+
+	if GemRB.IsDraggingItem () == 1:
+		dragged = GemRB.GetSlotItem (0, 0)["ItemResRef"]
+	else:
+		dragged = ""
+	stats = tuple (GemRB.GetPlayerStat (pc, stat) for stat in SnapshotStats)
+	identify = GemRB.GetVar ("GUIEnhancements") & GE_TRY_IDENTIFY_ON_TRANSFER
+	return (dragged, GemRB.GetEquippedQuickSlot (pc), GemRB.GetEquippedAmmunition (pc), stats, identify, SlotMap and tuple (SlotMap))
+
+def UpdateSlots (pc, count):
+	"""Updates the first count slots, skipping those that would be drawn the same."""
+
+	global SnapshotPC
+
+	if pc != SnapshotPC:
+		ForgetSlots ()
+		SnapshotPC = pc
+
+	shared = GetSlotSnapshot (pc)
+	for slot in range (count):
+		if SlotMap is None:
+			slot_item = GemRB.GetSlotItem (pc, slot+1)
+		elif slot < len(SlotMap) and SlotMap[slot] != -1:
+			slot_item = GemRB.GetSlotItem (pc, SlotMap[slot]+1)
+		else:
+			slot_item = None
+
+		snapshot = (shared, slot_item)
+		if SlotSnapshots.get (slot) == snapshot:
+			continue
+		UpdateSlot (pc, slot)
+		SlotSnapshots[slot] = snapshot
+	return
+
+@Caches.Register
+def ForgetSlots ():
+	"""Makes the next UpdateSlots redraw every slot, eg. for a newly loaded window."""
+
+	SlotSnapshots.clear ()
+
 def UpdateSlot (pc, slot):
 	"""Updates a specific slot."""
 
+	# drawn outside of UpdateSlots, so its snapshot no longer holds
+	SlotSnapshots.pop (slot, None)
+
 	Window = GemRB.GetView("WIN_INV")
 
 	using_fists = slot_item = SlotType = None
@@ -641,7 +697,7 @@ def UpdateSlot (pc, slot):
 
 	# characters should auto-identify any item they recieve
 	if slot_item:
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		TryAutoIdentification(pc, item, slot+1, slot_item, GemRB.GetVar("GUIEnhancements")&GE_TRY_IDENTIFY_ON_TRANSFER)
 
 	UpdateInventorySlot (pc, Button, slot_item, "inventory", SlotType["Type"]&SLOT_INVENTORY == 0)
@@ -928,8 +984,8 @@ def DialogItemWindow ():
 	slot_item = GemRB.GetSlotItem (pc, slot)
 
 	ResRef = slot_item['ItemResRef']
-	item = GemRB.GetItem (ResRef)
-	dialog=item["Dialog"]
+	item = ItemCache.GetItem (ResRef)
+	dialog = item["Dialog"]
 	if ItemInfoWindow:
 		ItemInfoWindow.Close ()
 
@@ -1053,7 +1109,7 @@ def AbilitiesItemWindow ():
 	pc = GemRB.GameGetSelectedPCSingle ()
 	slot = GemRB.GetVar ("ItemButton")
 	slot_item = GemRB.GetSlotItem (pc, slot)
-	item = GemRB.GetItem (slot_item["ItemResRef"])
+	item = ItemCache.GetItem (slot_item["ItemResRef"])
 	Tips = item["Tooltips"]
 
 	GemRB.SetVar ("Ability", slot_item["Header"])
@@ -1110,7 +1166,7 @@ def UpdateInventorySlot (pc, Button, Slot, Type, Equipped=False):
 		Button.EnableBorder (2, 0)
 		return
 
-	item = GemRB.GetItem (Slot['ItemResRef'])
+	item = ItemCache.GetItem (Slot['ItemResRef'])
 	identified = Slot["Flags"] & IE_INV_ITEM_IDENTIFIED
 	magical = item["Enchantment"] > 0
 
@@ -0,0 +1,78 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# ItemCache.py - a bounded cache of GemRB.GetItem results
+# the inventory, store and container screens ask for the same item headers
+# on every repaint, while the headers only change with the loaded game
+# identification is a flag of the inventory slot, not of the header, so it
+# needs no invalidation: callers pick the identified or unidentified fields
+
+import collections
+
+import GemRB
+import Caches
+
+Items = collections.OrderedDict ()
+Size = 256
+Hits = 0
+Misses = 0
+
+def GetItem (resref):
+	"""Cached GemRB.GetItem. Returns a fresh copy, so callers can modify it."""
+	global Hits, Misses
+
+	key = resref.lower ()
+	if key in Items:
+		Items.move_to_end (key)
+		item = Items[key]
+		Hits += 1
+	else:
+		item = GemRB.GetItem (resref)
+		Items[key] = item
+		Misses += 1
+		if len(Items) > Size:
+			Items.popitem (last=False)
+
+	if item is None:
+		return None
+	return dict(item)
+
+def SetSize (size):
+	"""Changes the amount of remembered headers, dropping the oldest ones."""
+	global Size
+
+	Size = max (size, 1)
+	while len(Items) > Size:
+		Items.popitem (last=False)
+
+def Invalidate (resref=None):
+	"""Forgets one item header or all of them."""
+	global Hits, Misses
+
+	if resref is None:
+		Items.clear ()
+		Hits = Misses = 0
+	else:
+		Items.pop (resref.lower (), None)
+
+@Caches.Register
+def Reset ():
+	Invalidate ()
+
+def GetStats ():
+	return {"Hits": Hits, "Misses": Misses, "Count": len(Items), "Size": Size}
@@ -18,6 +18,8 @@
 #
 # LUCommon.py - common functions related to leveling up
 
+import collections
+
 import GemRB
 import GameCheck
 import GUICommon
@@ -89,9 +91,46 @@ def GetLevelDiff (actor, Level):
 
 	return LevelDiff
 
+# CanLevelUp is checked for every pc on every portrait refresh, so cache the
+# results keyed by all the stats the check depends on
+LevelUpCache = collections.OrderedDict ()
+LevelUpCacheSize = 32
+LevelUpStats = [
+	IE_XP, IE_XP_MAGE, IE_XP_THIEF, IE_LEVEL, IE_LEVEL2, IE_LEVEL3,
+	IE_CLASS, IE_KIT, IE_MC_FLAGS, IE_LEVELDRAIN
+]
+if GameCheck.IsIWD2():
+	# GetNextLevelExp and GetECL
+	LevelUpStats += [IE_CLASSLEVELSUM, IE_RACE, IE_SUBRACE]
+elif GameCheck.IsPST():
+	# IsNamelessOne
+	LevelUpStats.append (IE_SPECIFIC)
+
+def InvalidateLevelUpCache (actor=None):
+	"""Drops the cached CanLevelUp results for one or all actors."""
+
+	if actor is None:
+		LevelUpCache.clear ()
+		return
+
+	for key in [key for key in LevelUpCache if key[0] == actor]:
+		del LevelUpCache[key]
+
 def CanLevelUp(actor):
 	"""Returns true if the actor can level up."""
 
+	key = (actor,) + tuple(GemRB.GetPlayerStat (actor, stat) for stat in LevelUpStats)
+	if key in LevelUpCache:
+		LevelUpCache.move_to_end (key)
+		return LevelUpCache[key]
+
+	ret = _CanLevelUp (actor)
+	LevelUpCache[key] = ret
+	if len(LevelUpCache) > LevelUpCacheSize:
+		LevelUpCache.popitem (last=False)
+	return ret
+
+def _CanLevelUp(actor):
 	# get our class and placements for Multi'd and Dual'd characters
 	Class = GUICommon.GetClassRowName (actor)
 	Multi = GUICommon.IsMultiClassed (actor, 1)
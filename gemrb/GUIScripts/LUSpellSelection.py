@@ -37,6 +37,7 @@ SpellsTextArea = 0		# << spell description area
 SpellsSelectPointsLeft = [0]*9	# << spell selections left per level
 Spells = [0]*9			# << spells learnable per level
 SpellTopIndex = 0		# << scroll bar index
+SpellList = None		# << visible part of the spell grid
 SpellBook = []			# << array containing all the spell indexes to learn
 ButtonCount = 24		# number of spell slots in the window
 MemoBook = [0]*ButtonCount			# array containing all the spell indexes to memorize
@@ -70,7 +71,7 @@ def OpenSpellsWindow (actor, table, level, diff, kit=0, gen=0, recommend=True, b
 
 	global SpellsWindow, DoneButton, SpellsSelectPointsLeft, Spells, chargen, SpellPointsLeftLabel
 	global SpellsTextArea, SpellTopIndex, SpellBook, SpellLevel, pc, SpellStart, BonusPoints
-	global KitMask, EnhanceGUI, Memorization, SpellBookType, SpellsPickButton, ButtonCount, Class
+	global KitMask, EnhanceGUI, Memorization, SpellBookType, SpellsPickButton, ButtonCount, Class, SpellList
 
 	#enhance GUI?
 	if (GemRB.GetVar("GUIEnhancements")&GE_SCROLLBARS) and not IWD2:
@@ -157,6 +158,11 @@ def OpenSpellsWindow (actor, table, level, diff, kit=0, gen=0, recommend=True, b
 
 		SpellStart = 0
 
+	# the buttons of the spell grid follow their spells when scrolling
+	Count = ButtonCount + ExtraSpellButtons ()
+	Views = [(SpellsWindow.GetControl (i+SpellStart),) for i in range (Count)]
+	SpellList = GUICommon.VirtualList (Count, GetSpellRow, DrawSpellButton, Views)
+
 	# setup our variables
 	GemRB.SetVar ("SpellTopIndex", 0)
 	Memorization = 0
@@ -260,7 +266,7 @@ def UpdateScrollBar (ScrollBar, SpellCount):
 	# that's 25 if the extra 25th spell slot is available in sorcerer level up
 	if SpellCount > ButtonCount + ExtraSpellButtons():
 		ScrollBar.SetVisible (True)
-		ScrollBar.OnChange (ShowSpells)
+		ScrollBar.OnChange (ScrollSpells)
 
 		extraCount = SpellCount - ButtonCount
 		if chargen:
@@ -369,7 +375,7 @@ def ShowKnownSpells ():
 	# we have a grid of 24 (usually) spells
 	for i in range (ButtonCount):
 		# ensure we can learn this many spells
-		SpellButton = SpellsWindow.GetControl (i+SpellStart)
+		SpellButton = GetSpellButton (i)
 		if i + j >= len (SpellBook) or not SpellBook[i+j]:
 			SpellButton.SetState (IE_GUI_BUTTON_DISABLED)
 			SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_SET)
@@ -380,7 +386,7 @@ def ShowKnownSpells ():
 			SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
 
 		# fill in the button with the spell data
-		Spell = GemRB.GetSpell (Spells[SpellLevel][i+j][0], 1)
+		Spell = Spellbook.GetSpell (Spells[SpellLevel][i+j][0], 1)
 		SpellButton.SetTooltip(Spell['SpellName'])
 		SpellButton.SetValue (i)
 		SpellButton.OnPress (MemorizePress)
@@ -420,7 +426,7 @@ def MemorizePress (btn):
 	i = btn.Value + j
 
 	# get the spell that's been pushed
-	Spell = GemRB.GetSpell (Spells[SpellLevel][i][0], 1)
+	Spell = Spellbook.GetSpell (Spells[SpellLevel][i][0], 1)
 	SpellsTextArea.SetText (Spell["SpellDesc"])
 
 	# make sure we can learn the spell
@@ -448,50 +454,9 @@ def MemorizePress (btn):
 def ShowSpells ():
 	"""Shows the viewable 24 spells."""
 
-	j = RowIndex()
-
 	# we have a grid of 24 spells
-	extraButtons = ExtraSpellButtons ()
-	for i in range (ButtonCount + extraButtons):
-		# ensure we can learn this many spells
-		SpellButton = SpellsWindow.GetControl (i+SpellStart)
-		if i + j >= len (Spells[SpellLevel]):
-			SpellButton.SetState (IE_GUI_BUTTON_DISABLED)
-			SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_SET)
-			continue
-		else:
-			SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
-			SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
-
-		# fill in the button with the spell data
-		Spell = GemRB.GetSpell (Spells[SpellLevel][i+j][0], 1)
-		SpellButton.SetTooltip(Spell['SpellName'])
-		SpellButton.SetVarAssoc("ButtonPressed", i)
-		SpellButton.OnPress (SpellsSelectPress)
-		if GameCheck.IsBG2():
-			SpellButton.SetSprites("GUIBTBUT",0, 0,1,2,3)
-		else:
-			SpellButton.SetSprites("GUIBTBUT",0, 0,1,24,25)
-
-		SpellButton.SetSpellIcon(Spells[SpellLevel][i+j][0], 1)
-		SpellButton.SetFlags(IE_GUI_BUTTON_PICTURE, OP_OR)
-
-		# don't allow the selection of an un-learnable spell
-		if Spells[SpellLevel][i+j][1] == 0:
-			SpellButton.SetState(IE_GUI_BUTTON_LOCKED)
-			# shade red
-			color = {'r' : 200, 'g' : 0, 'b' : 0, 'a' : 100}
-			SpellButton.SetBorder (0, color, 1, 1)
-		elif Spells[SpellLevel][i+j][1] == 1: # learnable
-			SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
-			# unset any borders on this button or an un-learnable from last level
-			# will still shade red even though it is clickable
-			SpellButton.SetBorder (0, None, 0,0)
-		else: # specialist (for iwd2 which has no green frames)
-			# use the green border state for matching specialist spells
-			color = {'r' : 0, 'g' : 200, 'b' : 0, 'a' : 100}
-			SpellButton.SetBorder (0, color, 1,0)
-			SpellButton.SetState (IE_GUI_BUTTON_FAKEDISABLED)
+	SpellList.SetCount (len (Spells[SpellLevel]))
+	SpellList.Scroll (RowIndex ())
 
 	# show which spells are selected
 	ShowSelectedSpells ()
@@ -505,17 +470,72 @@ def ShowSpells ():
 
 	return
 
+def ScrollSpells ():
+	"""Only sets up the spell buttons which got scrolled into view."""
+
+	SpellList.Scroll (RowIndex ())
+	ShowSelectedSpells ()
+	return
+
+def GetSpellButton (i):
+	"""Returns the button currently in the ith place of the spell grid."""
+
+	return SpellList.GetViews (i)[0]
+
+def GetSpellRow (index):
+	return Spellbook.GetSpell (Spells[SpellLevel][index][0], 1)
+
+def DrawSpellButton (i, index, Spell):
+	# ensure we can learn this many spells
+	SpellButton = GetSpellButton (i)
+	if Spell is None:
+		SpellButton.SetState (IE_GUI_BUTTON_DISABLED)
+		SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_SET)
+		return
+
+	SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
+	SpellButton.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
+
+	# fill in the button with the spell data
+	SpellButton.SetTooltip(Spell['SpellName'])
+	SpellButton.SetVarAssoc("ButtonPressed", index) # the button moves along when scrolling
+	SpellButton.OnPress (SpellsSelectPress)
+	if GameCheck.IsBG2():
+		SpellButton.SetSprites("GUIBTBUT",0, 0,1,2,3)
+	else:
+		SpellButton.SetSprites("GUIBTBUT",0, 0,1,24,25)
+
+	SpellButton.SetSpellIcon(Spells[SpellLevel][index][0], 1)
+	SpellButton.SetFlags(IE_GUI_BUTTON_PICTURE, OP_OR)
+
+	# don't allow the selection of an un-learnable spell
+	if Spells[SpellLevel][index][1] == 0:
+		SpellButton.SetState(IE_GUI_BUTTON_LOCKED)
+		# shade red
+		color = {'r': 200, 'g': 0, 'b': 0, 'a': 100}
+		SpellButton.SetBorder (0, color, 1, 1)
+	elif Spells[SpellLevel][index][1] == 1: # learnable
+		SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
+		# unset any borders on this button or an un-learnable from last level
+		# will still shade red even though it is clickable
+		SpellButton.SetBorder (0, None, 0,0)
+	else: # specialist (for iwd2 which has no green frames)
+		# use the green border state for matching specialist spells
+		color = {'r': 0, 'g': 200, 'b': 0, 'a': 100}
+		SpellButton.SetBorder (0, color, 1,0)
+		SpellButton.SetState (IE_GUI_BUTTON_FAKEDISABLED)
+	return
+
 def SpellsSelectPress (btn):
 	"""Toggles the selection of the given spell."""
 
 	global SpellsSelectPointsLeft, Spells, SpellBook
 
 	# get our variables
-	j = RowIndex()
-	i = btn.Value + j
+	i = btn.Value
 
 	# get the spell that's been pushed
-	Spell = GemRB.GetSpell (Spells[SpellLevel][i][0], 1)
+	Spell = Spellbook.GetSpell (Spells[SpellLevel][i][0], 1)
 	SpellsTextArea.SetText (Spell["SpellDesc"])
 
 	# make sure we can learn the spell
@@ -569,7 +589,7 @@ def MarkButton (i, select):
 			state = IE_GUI_BUTTON_LOCKED
 
 	# we have to use the index on the actual grid
-	SpellButton = SpellsWindow.GetControl(i+SpellStart-j)
+	SpellButton = GetSpellButton (i-j)
 	SpellButton.SetState(state)
 	return
 
@@ -521,6 +521,8 @@ def LevelUpDonePress():
 
 	if LevelUpWindow:
 		LevelUpWindow.Close()
+	LUCommon.InvalidateLevelUpCache (pc)
+	GUICommonWindows.InvalidatePortraitStates (pc)
 	GUICommonWindows.UpdatePortraitWindow ()
 	return
 
@@ -5,6 +5,14 @@ import sys
 # 2.6+ only, so we ignore failures
 sys.dont_write_bytecode = True
 
+# optional precompiled startup, see Bytecode.py
+import Bytecode
+Bytecode.Setup ()
+
+# constant modules from their frozen table, see Constants.py
+import Constants
+Constants.Install ()
+
 # these imports may not be used here
 # we include them to ensure they exist when the GUIScript engine initializes
 # we also want anything executed using ExecString to have access to the symbols
@@ -13,17 +21,36 @@ from GUIClasses import *
 from ie_restype import RES_BAM
 
 import GemRB
+import Caches
+
+# empty the script-side data caches whenever a game is loaded
+Caches.Install ()
+
+# opt-in timing of script callbacks and engine calls
+import Profiler
+Profiler.Install ()
 
 def Init():
 	# this function is run after the game type is set
 	# this is where we would run initializations (even on a per-game type basis)
 	
 	print("Python version: " + sys.version)
+
+	# the shared scripts may already come from a bundle, see Bytecode.Setup
+	Bytecode.UseBundle (GemRB.GameType)
+
+	# remember the detected game type for the next start
+	Autodetect = sys.modules.get ("AutodetectCommon")
+	if Autodetect:
+		Autodetect.SaveResult ()
 	
 	# create a global scrollbar for the ScrollView to clone from
 	# but only if we can (would fail in tests)
 	SBArgs = CreateScrollbarARGs ()
 	if GemRB.HasResource (SBArgs[0], RES_BAM):
-		frame = {'x' : 0, 'y' : 0, 'w' : 0, 'h' : 0}
+		frame = {'x': 0, 'y': 0, 'w': 0, 'h': 0}
 		sb = GemRB.CreateView (-1, IE_GUI_SCROLLBAR, frame, SBArgs)
 		sb.AddAlias ("SBGLOB")
+
+	Constants.Update ()
+	Bytecode.Finish ()
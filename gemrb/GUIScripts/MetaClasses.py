@@ -33,7 +33,9 @@
 # will then execute
 # GemRB.GetTableValue(5, "Row", "Col")
 
-from types import MethodType
+import functools
+import time
+from types import FunctionType, MethodType
 
 def add_metaclass(metaclass):
     """Class decorator for creating a class with a metaclass."""
@@ -60,6 +62,85 @@ def MethodAttributeError(f):
 			raise type(e)(str(e) + "\nMethod Docs:\n" + str(f.__doc__))
 	return handler
 
+# every (class, name, function) bridged by metaIDWrapper, so the
+# bindings can be swapped at runtime (see Profiler.py)
+BridgedMethods = []
+
+# the bridged functions are builtins, which unlike python functions don't bind
+# to an instance. Wrapping them in a closure cost a python frame per call, so
+# instead they are bound by a property whose getter is a partial MethodType:
+# both the lookup and the call stay in C. Script functions (eg. the wrappers of
+# the Profiler) bind by themselves and are set as they are. The engine adds
+# the docs of a failing method to its error (see CallInternalMethod).
+def BindMethod(c, key, f):
+	Bindings[(c, key)] = f
+	wrap = MethodFilters.get((c, key))
+	if wrap:
+		f = wrap(f)
+	if isinstance(f, FunctionType):
+		setattr(c, key, f)
+	else:
+		setattr(c, key, property(functools.partial(MethodType, f), doc=f.__doc__))
+
+# (class, name) -> the function currently bound by BindMethod
+Bindings = {}
+# (class, name) -> a function returning a script wrapper for the bound
+# function, applied on every (re)binding (see the retained state in GUIClasses)
+MethodFilters = {}
+
+def SetMethodFilter(c, key, wrap):
+	MethodFilters[(c, key)] = wrap
+	BindMethod(c, key, Bindings[(c, key)])
+
+# the core counts the arguments it passes to a callback by its __code__, which
+# the methods bound from builtins lack, so the functions taking a callback
+# (SetAction, GemRB.SetTimer, ...) get them wrapped
+def GetCallback(handler):
+	if handler is not None and not hasattr(handler, "__code__"):
+		return lambda: handler()
+	return handler
+
+def CallbackFilter(f):
+	def SetAction(self, handler, *args, **kwargs):
+		return f(self, GetCallback(handler), *args, **kwargs)
+
+	SetAction.__doc__ = f.__doc__
+	return SetAction
+
+# the same for the module functions taking a callback as their first argument
+def CallbackArgument(f):
+	def wrapper(handler, *args, **kwargs):
+		return f(GetCallback(handler), *args, **kwargs)
+
+	wrapper.WrapsCallbacks = True
+	wrapper.__doc__ = f.__doc__
+	return wrapper
+
+def Benchmark(calls, repeat=10000):
+	"""Compares the per call cost of the bridged methods with the old binding.
+
+	calls holds (object, method name, arguments) tuples, for example
+	(table, "GetValue", (0, 0)). Returns the report lines."""
+
+	lines = ["%-32s %10s %10s %10s" % ("method", "old us", "new us", "saved us")]
+	for obj, key, args in calls:
+		c = type(obj)
+		bridged = [f for k, n, f in BridgedMethods if n == key and issubclass(c, k)]
+		if not bridged:
+			lines.append("%-32s not a bridged method, skipped" % (c.__name__ + "." + key))
+			continue
+		old = MethodType(MethodAttributeError(bridged[0]), obj)
+		new = getattr(obj, key)
+
+		results = []
+		for f in (old, new):
+			start = time.perf_counter()
+			for i in range(repeat):
+				f(*args)
+			results.append((time.perf_counter() - start) * 1000000 / repeat)
+		lines.append("%-32s %10.3f %10.3f %10.3f" % (c.__name__ + "." + key, results[0], results[1], results[0] - results[1]))
+	return lines
+
 class metaIDWrapper(type):		
 	@classmethod
 	def InitMethod(cls, f = None):
@@ -86,10 +167,6 @@ class metaIDWrapper(type):
 		# we must bind the methods after the class is created (instead of adding to classdict)
 		# otherwise the methods would be class methods instead of instance methods
 		for key in methods:
-			e = MethodAttributeError(methods[key])
-			try:
-				mtype = MethodType(e, None, c)
-				setattr(c, key, mtype)
-			except TypeError: # Python 3
-				setattr(c, key, e) # FIXME?: I dont actually know if this is correct, may have to circle back here after overcoming other errors
+			BindMethod(c, key, methods[key])
+			BridgedMethods.append((c, key, methods[key]))
 		return c
@@ -0,0 +1,192 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# Profiler.py - opt-in timing of script callbacks and engine calls
+# enable it by setting GEMRB_PROFILE_GUISCRIPTS in the environment or by
+# running "prof()" in the console, then show the results with "profdump()"
+#
+# three kinds of calls are measured:
+# - handler: callbacks registered through SetAction (OnPress, OnChange, ...)
+#   after the profiler got enabled
+# - hook: script functions the engine calls by name, see HotFunctions
+# - bridge: GemRB module functions and the methods of the GUIClasses objects
+
+import os
+import sys
+import time
+
+import GemRB
+import MetaClasses
+
+Enabled = False
+Stats = {}
+
+# functions the core runs by name every frame or on every selection change
+HotFunctions = (
+	("GUICommonWindows", "UpdatePortraitWindow"),
+	("GUICommonWindows", "UpdateActionsWindow"),
+	("GUICommonWindows", "SelectionChanged"),
+	("Clock", "UpdateClock"),
+	("GUISTORE", "RedrawStoreShoppingWindow"),
+)
+
+# original GemRB module functions, so Disable can restore them
+BridgeFunctions = {}
+
+def Record (name, elapsed):
+	entry = Stats.get (name)
+	if entry is None:
+		Stats[name] = [1, elapsed, elapsed]
+		return
+
+	entry[0] += 1
+	entry[1] += elapsed
+	if elapsed > entry[2]:
+		entry[2] = elapsed
+
+def Call (name, f, args, kwargs={}):
+	start = time.perf_counter ()
+	try:
+		return f (*args, **kwargs)
+	finally:
+		Record (name, time.perf_counter () - start)
+
+def GetName (f):
+	module = getattr (f, "__module__", None) or "?"
+	name = getattr (f, "__qualname__", None) or getattr (f, "__name__", None) or repr (f)
+	code = getattr (f, "__code__", None)
+	if code and name.endswith ("<lambda>"):
+		name += ":" + str (code.co_firstlineno)
+	return module + "." + name
+
+def WrapHandler (handler):
+	"""Returns a timed handler taking as many arguments as the original.
+
+	The core decides what to pass to a callback by its argument count,
+	so the wrapper has to mirror it."""
+
+	if handler is None or getattr (handler, "Profiled", None):
+		return handler
+
+	name = "handler " + GetName (handler)
+	code = getattr (handler, "__code__", None)
+	count = code.co_argcount if code else 0
+	if count == 0:
+		def timed ():
+			return Call (name, handler, ())
+	elif count == 1:
+		def timed (a):
+			return Call (name, handler, (a,))
+	elif count == 2:
+		def timed (a, b):
+			return Call (name, handler, (a, b))
+	elif count == 3:
+		def timed (a, b, c):
+			return Call (name, handler, (a, b, c))
+	else:
+		return handler
+
+	timed.Profiled = handler
+	return timed
+
+def WrapBridge (name, f, catchHandler=False):
+	def timed (*args, **kwargs):
+		if catchHandler and len(args) > 1:
+			args = (args[0], WrapHandler (args[1])) + args[2:]
+			# the hooked modules are usually imported late, when their windows get set up
+			WrapHotFunctions ()
+		return Call (name, f, args, kwargs)
+
+	timed.Profiled = f
+	timed.__doc__ = f.__doc__
+	return timed
+
+def WrapHotFunctions ():
+	for moduleName, funcName in HotFunctions:
+		module = sys.modules.get (moduleName)
+		func = getattr (module, funcName, None)
+		if func is None or getattr (func, "Profiled", None):
+			continue
+		setattr (module, funcName, WrapBridge ("hook " + moduleName + "." + funcName, func))
+
+def UnwrapHotFunctions ():
+	for moduleName, funcName in HotFunctions:
+		module = sys.modules.get (moduleName)
+		func = getattr (module, funcName, None)
+		if func is not None and getattr (func, "Profiled", None):
+			setattr (module, funcName, func.Profiled)
+
+def Enable ():
+	global Enabled
+
+	if Enabled:
+		return
+	Enabled = True
+
+	for c, key, f in MetaClasses.BridgedMethods:
+		name = "bridge " + c.__name__ + "." + key
+		MetaClasses.BindMethod (c, key, WrapBridge (name, f, key == "SetAction"))
+
+	for key in dir (GemRB):
+		f = getattr (GemRB, key)
+		if key.startswith ("_") or not callable (f) or isinstance (f, type):
+			continue
+		BridgeFunctions[key] = f
+		setattr (GemRB, key, WrapBridge ("bridge GemRB." + key, f))
+
+	WrapHotFunctions ()
+
+def Disable ():
+	global Enabled
+
+	if not Enabled:
+		return
+	Enabled = False
+
+	for c, key, f in MetaClasses.BridgedMethods:
+		MetaClasses.BindMethod (c, key, f)
+	for key, f in BridgeFunctions.items ():
+		setattr (GemRB, key, f)
+	BridgeFunctions.clear ()
+	UnwrapHotFunctions ()
+
+def Reset ():
+	Stats.clear ()
+
+def Install ():
+	if os.environ.get ("GEMRB_PROFILE_GUISCRIPTS"):
+		Enable ()
+
+def Report (limit=40):
+	"""Returns the report lines, the most expensive calls first."""
+
+	lines = ["%-60s %8s %10s %9s %9s" % ("call", "count", "total ms", "avg ms", "max ms")]
+	entries = sorted (Stats.items (), key=lambda e: e[1][1], reverse=True)
+	for name, (count, total, worst) in entries[:limit]:
+		lines.append ("%-60s %8d %10.2f %9.3f %9.3f" % (name, count, total * 1000, total * 1000 / count, worst * 1000))
+	return lines
+
+def Dump (path=None, limit=40):
+	"""Writes the report to path or prints it (to the console, when run from there)."""
+
+	lines = Report (limit)
+	if path:
+		with open (path, "w") as f:
+			f.write ("\n".join (lines) + "\n")
+	else:
+		print ("\n".join (lines))
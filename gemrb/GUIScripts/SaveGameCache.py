@@ -0,0 +1,116 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# SaveGameCache.py - bounded cache of the save game previews and portraits
+# the load and save browsers used to decode the pictures of every visible save
+# on each scroll step. They are now kept by save slot, name and date (the mtime
+# of the preview, to the second), and the pages around the visible one are
+# decoded ahead, one save per timer tick, so scrolling there finds them ready.
+# Any new save has a new date, so the pictures outlive the browsers and are
+# reused the next time one is opened; only deleting or overwriting a save from
+# a browser, which can happen within the same second, drops them explicitly
+
+import collections
+
+import GemRB
+
+Pictures = collections.OrderedDict ()
+# in pictures, a save needs up to seven
+Size = 224
+Hits = 0
+Misses = 0
+
+# bumped by each Prefetch, so the older ones stop
+Generation = 0
+PrefetchDelay = 10 # ticks
+
+def GetKey (game):
+	return (game.GetSaveID (), game.GetName (), game.GetDate ())
+
+def GetPicture (game, index):
+	global Hits, Misses
+
+	key = GetKey (game) + (index,)
+	if key in Pictures:
+		Pictures.move_to_end (key)
+		Hits += 1
+		return Pictures[key]
+
+	if index < 0:
+		picture = game.GetPreview ()
+	else:
+		picture = game.GetPortrait (index)
+	Misses += 1
+	Pictures[key] = picture
+	if len(Pictures) > Size:
+		Pictures.popitem (last=False)
+	return picture
+
+def GetPreview (game):
+	"""Cached game.GetPreview ()."""
+	return GetPicture (game, -1)
+
+def GetPortrait (game, index):
+	"""Cached game.GetPortrait (index)."""
+	return GetPicture (game, index)
+
+def Prefetch (games, top, rows, portraits):
+	"""Decodes the pictures of the pages before and after the visible one in the background."""
+	global Generation
+
+	Generation += 1
+	generation = Generation
+	after = range (top + rows, min (top + 2 * rows, len(games)))
+	before = range (top - 1, max (top - rows, 0) - 1, -1)
+	queue = collections.deque (games[pos] for pos in list(after) + list(before))
+	if not queue:
+		return
+
+	def Step ():
+		if generation != Generation or not queue:
+			return
+		game = queue.popleft ()
+		GetPreview (game)
+		for j in range (portraits):
+			GetPortrait (game, j)
+
+	# a single timer firing once per save: arming another one from the callback
+	# would grow the core's timer list while it is being iterated
+	GemRB.SetTimer (Step, PrefetchDelay, len(queue) - 1)
+
+def Invalidate (game=None):
+	"""Forgets the pictures of one save (eg. when deleting or overwriting it) or all of them."""
+	global Generation
+
+	Generation += 1
+	if game is None:
+		Pictures.clear ()
+		return
+
+	key = GetKey (game)
+	for cached in [k for k in Pictures if k[:3] == key]:
+		del Pictures[cached]
+
+def BrowserClosed (win):
+	"""Stops prefetching, for the closing action of the load and save windows."""
+	global Generation
+
+	Generation += 1
+
+def GetStats ():
+	return {"Hits": Hits, "Misses": Misses, "Count": len(Pictures), "Size": Size}
@@ -17,7 +17,10 @@
 #
 # a library of any functions for spell(book) managment
 
+import collections
+
 import GemRB
+import Caches
 import CommonTables
 import GameCheck
 from GUIDefines import *
@@ -38,12 +41,43 @@ def itemgetter(*items):
 			return tuple(obj[item] for item in items)
 	return g
 
+#################################################################
+# process-wide cache of GetSpell results, shared by chargen, level-up and the
+# action bar, which all keep asking for the same spell headers on every redraw
+# it also serves the listing getters below, so they need no memo of their own:
+# the headers only depend on the resref, not on the actor that knows the spell,
+# and only change when another game or expansion is loaded (see Caches)
+SpellCache = collections.OrderedDict ()
+SpellCacheSize = 512
+
+def GetSpell (resref, silent=0):
+	"""Cached GemRB.GetSpell. Returns a fresh copy, so callers can add their own keys.
+
+	Failed lookups aren't cached, so each one still reports (unless silent)."""
+
+	key = resref.lower ()
+	if key in SpellCache:
+		SpellCache.move_to_end (key)
+		return dict(SpellCache[key])
+
+	spell = GemRB.GetSpell (resref, silent)
+	if spell is None:
+		return None
+
+	SpellCache[key] = spell
+	if len(SpellCache) > SpellCacheSize:
+		SpellCache.popitem (last=False)
+	return dict(spell)
+
+@Caches.Register
+def ClearSpellCache ():
+	SpellCache.clear ()
+
 #################################################################
 # routines for the actionbar spell access code
 
 def GetUsableMemorizedSpells(actor, BookType):
-	memorizedSpells = []
-	spellResRefs = []
+	memorizedSpells = {}
 	for level in range (20): # Saradas NPC teaches you a level 14 special ...
 		spellCount = GemRB.GetMemorizedSpellsCount (actor, BookType, level, False)
 		for i in range (spellCount):
@@ -52,45 +86,32 @@ def GetUsableMemorizedSpells(actor, BookType):
 				# depleted, so skip
 				continue
 			resref = Spell0["SpellResRef"].lower()
-			if resref in spellResRefs:
-				# add another one, so we can get the count more cheaply later
-				spellResRefs.append (resref)
+			if resref in memorizedSpells:
+				memorizedSpells[resref]['MemoCount'] += 1
 				continue
-			spellResRefs.append (resref)
-			Spell = GemRB.GetSpell(resref)
+			Spell = GetSpell (resref)
 			Spell['BookType'] = BookType # just another sorting key
 			Spell['SpellIndex'] = GemRB.GetSpelldataIndex (actor, Spell["SpellResRef"], 1<<BookType) # crucial!
 			if Spell['SpellIndex'] == -1:
 				GemRB.Log (LOG_ERROR, "GetUsableMemorizedSpells", "Memorized spell not found! " + Spell["SpellResRef"] + " of type " + str(1<<BookType))
 			Spell['SpellIndex'] += 1000 * 1<<BookType
-			memorizedSpells.append (Spell)
+			Spell['MemoCount'] = 1
+			memorizedSpells[resref] = Spell
 
-	if not len(memorizedSpells):
-		return []
-
-	# count and remove the duplicates
-	memorizedSpells2 = []
-	for spell in memorizedSpells:
-		resref = spell["SpellResRef"].lower()
-		if resref in spellResRefs:
-			spell['MemoCount'] = spellResRefs.count(resref)
-			while resref in spellResRefs:
-				spellResRefs.remove(resref)
-			memorizedSpells2.append(spell)
-
-	return memorizedSpells2
+	# dicts keep insertion order, so this matches the order of first appearance
+	return list(memorizedSpells.values())
 
 def GetKnownSpells(actor, BookType):
 	knownSpells = []
-	spellResRefs = []
+	spellResRefs = set()
 	for level in range (9):
 		spellCount = GemRB.GetKnownSpellsCount (actor, BookType, level)
 		for i in range (spellCount):
 			Spell0 = GemRB.GetKnownSpell (actor, BookType, level, i)
 			if Spell0["SpellResRef"] in spellResRefs:
 				continue
-			spellResRefs.append (Spell0["SpellResRef"])
-			Spell = GemRB.GetSpell(Spell0["SpellResRef"])
+			spellResRefs.add (Spell0["SpellResRef"])
+			Spell = GetSpell (Spell0["SpellResRef"])
 			Spell['BookType'] = BookType # just another sorting key
 			Spell['MemoCount'] = 0
 			Spell['SpellIndex'] = 1000 * 1<<BookType # this gets assigned properly later
@@ -112,46 +133,38 @@ def GetKnownSpellsDescription(actor, BookType):
 
 def GetKnownSpellsLevel(actor, BookType, level):
 	knownSpells = []
-	spellResRefs = []
+	spellResRefs = set()
 
 	spellCount = GemRB.GetKnownSpellsCount (actor, BookType, level)
 	for i in range (spellCount):
 		Spell0 = GemRB.GetKnownSpell (actor, BookType, level, i)
 		if Spell0["SpellResRef"] in spellResRefs:
 			continue
-		spellResRefs.append (Spell0["SpellResRef"])
-		Spell = GemRB.GetSpell(Spell0["SpellResRef"])
+		spellResRefs.add (Spell0["SpellResRef"])
+		Spell = GetSpell (Spell0["SpellResRef"])
 		Spell['BookType'] = BookType # just another sorting key
 		knownSpells.append (Spell)
 
 	return knownSpells
 
-def index (list, value):
-	for i in range(len(list)):
-		if list[i]==value:
-			return i
-	return -1
-
 def GetMemorizedSpells(actor, BookType, level):
-	memoSpells = []
-	spellResRefs = []
+	memoSpells = {}
 
 	spellCount = GemRB.GetMemorizedSpellsCount (actor, BookType, level, False)
 	for i in range (spellCount):
 		Spell0 = GemRB.GetMemorizedSpell (actor, BookType, level, i)
-		pos = index(spellResRefs,Spell0["SpellResRef"])
-		if pos!=-1:
-			memoSpells[pos]['KnownCount']+=1
-			memoSpells[pos]['MemoCount']+=Spell0["Flags"]
+		resref = Spell0["SpellResRef"]
+		if resref in memoSpells:
+			memoSpells[resref]['KnownCount'] += 1
+			memoSpells[resref]['MemoCount'] += Spell0["Flags"]
 			continue
 
-		spellResRefs.append (Spell0["SpellResRef"])
-		Spell = GemRB.GetSpell(Spell0["SpellResRef"])
+		Spell = GetSpell (resref)
 		Spell['KnownCount'] = 1
 		Spell['MemoCount'] = Spell0["Flags"]
-		memoSpells.append (Spell)
+		memoSpells[resref] = Spell
 
-	return memoSpells
+	return list(memoSpells.values())
 
 # direct access to the spellinfo struct
 # SpellIndex is the index of the spell in the struct, but we add a thousandfold of the spell type for later use in SpellPressed
@@ -160,7 +173,7 @@ def GetSpellinfoSpells(actor, BookType):
 	spellResRefs = GemRB.GetSpelldata (actor)
 	i = 0
 	for resref in spellResRefs:
-		Spell = GemRB.GetSpell(resref)
+		Spell = GetSpell (resref)
 		Spell['BookType'] = BookType # just another sorting key
 		Spell['SpellIndex'] = i + 1000 * 255 # spoofing the type, so any table would work
 		Spell['MemoCount'] = 1
@@ -317,10 +330,48 @@ def SetupSpellIcons(Window, BookType, Start=0, Offset=0):
 # routines used during character generation and levelup
 #################################################################
 
+# iwd2 spell lists, inverted from listspll.2da and listdomn.2da on first use:
+# {(column, level): [resref, ...]}, so we don't rescan the tables for every level
+IWD2SpellIndex = None
+IWD2DomainIndex = None
+
+def BuildSpellListIndex (tableName, resrefColumn):
+	index = {}
+	table = GemRB.LoadTable (tableName)
+	resrefColumn = table.GetColumnIndex (resrefColumn)
+	for i in range(table.GetRowCount ()):
+		resref = table.GetValue (i, resrefColumn)
+		for column in range(table.GetColumnCount (i)):
+			# at which level is the spell given to the actor?
+			level = table.GetValue (i, column)
+			if isinstance(level, int):
+				index.setdefault ((column, level), []).append (resref)
+	return index
+
+@Caches.Register
+def ClearSpellListIndices ():
+	global IWD2SpellIndex, IWD2DomainIndex
+
+	IWD2SpellIndex = IWD2DomainIndex = None
+
+def GetIWD2SpellList (column, level):
+	global IWD2SpellIndex
+
+	if IWD2SpellIndex is None:
+		IWD2SpellIndex = BuildSpellListIndex ("listspll", "SPELL_RES_REF")
+	return IWD2SpellIndex.get ((column, level), [])
+
+def GetIWD2DomainList (column, level):
+	global IWD2DomainIndex
+
+	if IWD2DomainIndex is None:
+		IWD2DomainIndex = BuildSpellListIndex ("listdomn", "DOMAIN_RESREF")
+	return IWD2DomainIndex.get ((column, level), [])
+
 # Used for bards (level-up), sorcerers and mages (cg and level-up).
 # Used for rangers and paladins (level-up) and clerics and druids (both).
 # While iwd2 still has spells.2da, it is actually unused and gives
-# some wrong spells. We need to iterate the whole listspll.2da,
+# some wrong spells. We need the whole listspll.2da (see GetIWD2SpellList),
 # looking at our class column and matching on (target) level
 def GetIWD2Spells (kit, usability, level, baseClass = -1):
 	spells = []
@@ -345,17 +396,8 @@ def GetIWD2Spells (kit, usability, level, baseClass = -1):
 		# only wizards have alignment and school restrictions
 		kit = usability = 0
 
-	spellsTable = GemRB.LoadTable ("listspll")
-	spellCount = spellsTable.GetRowCount ()
-	for i in range(spellCount):
-		# at which level is the spell given to the actor?
-		atLevel = spellsTable.GetValue (i, baseClass)
-		if atLevel != level:
-			continue
-
-		spellRow = spellsTable.GetRowName (i)
-		spellName = spellsTable.GetValue (spellRow, "SPELL_RES_REF")
-		ms = GemRB.GetSpell (spellName, 1)
+	for spellName in GetIWD2SpellList (baseClass, level):
+		ms = GetSpell (spellName, 1)
 		if ms == None:
 			continue
 		# ms['SpellDivine'] is unused in iwd2, since it has separate types for all caster classes
@@ -386,7 +428,7 @@ def GetMageSpells (Kit, Alignment, Level, baseClass = -1):
 	SpellCount = SpellsTable.GetValue ("MAGE", str(Level), GTV_INT)
 	for i in range(SpellCount):
 		SpellName = "SPWI%d%02d"%(Level,i+1)
-		ms = GemRB.GetSpell (SpellName, 1)
+		ms = GetSpell (SpellName, 1)
 		if ms == None:
 			continue
 
@@ -431,13 +473,8 @@ def GetLearnableDomainSpells (pc, Level, baseClassName = -1):
 	# calculate the offset from the first cleric kit
 	KitIndex -= CommonTables.Classes.FindValue ("CLASS", BaseClassIndex+1)
 
-	DomainSpellTable = GemRB.LoadTable ("listdomn")
-	# check everything in case someone wants to mod the spell amount
-	for i in range(DomainSpellTable.GetRowCount ()):
-		if DomainSpellTable.GetValue (i, KitIndex) == Level:
-			SpellName = DomainSpellTable.GetRowName (i)
-			SpellName = DomainSpellTable.GetValue (SpellName, "DOMAIN_RESREF")
-			Learnable.append (SpellName)
+	# the index covers everything in case someone wants to mod the spell amount
+	Learnable = list(GetIWD2DomainList (KitIndex, Level))
 
 	return Learnable
 
@@ -459,7 +496,7 @@ def GetLearnablePriestSpells (Class, Alignment, Level, booktype=0):
 	SpellsTable = GemRB.LoadTable ("spells")
 	for i in range(SpellsTable.GetValue ("PRIEST", str (Level), GTV_INT)):
 		SpellName = "SPPR%d%02d"%(Level,i+1)
-		ms = GemRB.GetSpell(SpellName, 1)
+		ms = GetSpell (SpellName, 1)
 		if ms == None:
 			continue
 		if Class & ms['SpellDivine']:
@@ -556,7 +593,7 @@ def CannotLearnSlotSpell ():
 
 	slot_item = GemRB.GetSlotItem (pc, GemRB.GetVar ("ItemButton"))
 	spell_ref = GemRB.GetItem (slot_item['ItemResRef'])['Spell']
-	spell = GemRB.GetSpell (spell_ref)
+	spell = GetSpell (spell_ref)
 	level = spell['SpellLevel']
 
 	# school conflicts are handled before this is called from inventory
@@ -676,7 +713,7 @@ def RemoveKnownSpells (pc, spelltype, level1=1, level2=1, noslots=0, kit=0):
 			if spelltype == IE_SPELL_TYPE_PRIEST and kit:
 				# get the spell's ref data
 				ref = GemRB.GetKnownSpell (pc, spelltype, level, mod-spell)
-				ref = GemRB.GetSpell (ref['SpellResRef'], 1)
+				ref = GetSpell (ref['SpellResRef'], 1)
 
 				# we have to look at the originalkit as well specifically for ranger/cleric dual-classes
 				# we wouldn't want to remove all cleric spells and druid spells if we lost our cleric class
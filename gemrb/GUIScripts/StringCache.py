@@ -0,0 +1,84 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# StringCache.py - a bounded cache of GemRB.GetString results, for redraw loops
+# only strings without tags are cached: their text doesn't depend on the tokens,
+# so it stays valid however the tokens change. Whether a strref has tags is
+# checked once on the raw text, since the core resolves the tags of some
+# strings (the ones marked for it) even when the caller didn't ask for it.
+# The strref display option also changes the text, so it's part of the key.
+
+import collections
+
+import GemRB
+import Caches
+from GUIDefines import STRING_FLAGS_RAW
+
+# (strref, flags, strref display) -> text
+Strings = collections.OrderedDict ()
+Size = 1024
+# strrefs whose raw text has tags
+Tagged = set ()
+
+# playing sounds is a side effect we mustn't skip
+UncachedFlags = 2 | 4
+
+Hits = 0
+Misses = 0
+Bypassed = 0
+
+def GetString (strref, flags=0):
+	"""Cached GemRB.GetString."""
+	global Hits, Misses, Bypassed
+
+	if flags & UncachedFlags or strref in Tagged:
+		Bypassed += 1
+		return GemRB.GetString (strref, flags)
+
+	key = (strref, flags, GemRB.GetVar ("Strref On"))
+	text = Strings.get (key)
+	if text is not None:
+		Strings.move_to_end (key)
+		Hits += 1
+		return text
+
+	# 256 turns the strref display off, so only the text is checked
+	if "<" in GemRB.GetString (strref, STRING_FLAGS_RAW | 256):
+		Bypassed += 1
+		Tagged.add (strref)
+		return GemRB.GetString (strref, flags)
+
+	Misses += 1
+	text = GemRB.GetString (strref, flags)
+	Strings[key] = text
+	if len(Strings) > Size:
+		Strings.popitem (last=False)
+	return text
+
+@Caches.Register
+def Reset ():
+	Strings.clear ()
+	Tagged.clear ()
+
+def GetStats ():
+	lookups = Hits + Misses + Bypassed
+	return {
+		"Hits": Hits, "Misses": Misses, "Bypassed": Bypassed,
+		"HitRate": Hits / float(lookups) if lookups else 0.0,
+		"Count": len(Strings), "Size": Size, "Tagged": len(Tagged)
+	}
@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
     ("START", "CHU", RES_CHU),
@@ -27,6 +27,5 @@ files = (
 )
 
 
-if CheckFiles(files):
-    GemRB.AddGameTypeHint ("bg1", 80)
+AddSignature ("bg1", 80, files)
 
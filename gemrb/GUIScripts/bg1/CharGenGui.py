@@ -159,9 +159,9 @@ def getMageSpells(TextAreaControl):
 	# arcane spells
 	info = ""
 	for level in range(0, 9):
-		for j in range(0, GemRB.GetKnownSpellsCount (MyChar, IE_SPELL_TYPE_WIZARD, level) ):
+		for j in range(0, GemRB.GetKnownSpellsCount (MyChar, IE_SPELL_TYPE_WIZARD, level)):
 			Spell = GemRB.GetKnownSpell (MyChar, IE_SPELL_TYPE_WIZARD, level, j)
-			Spell = GemRB.GetSpell (Spell['SpellResRef'], 1)['SpellName']
+			Spell = Spellbook.GetSpell (Spell['SpellResRef'], 1)['SpellName']
 			info += GemRB.GetString (Spell) + "\n"
 	if info != "":
 		info = "\n" + info + ""
@@ -299,9 +299,9 @@ def getDivineSpells(TextAreaControl):
 	# divine spells
 	info = ""
 	for level in range(0, 7):
-		for j in range(0, GemRB.GetKnownSpellsCount (MyChar, IE_SPELL_TYPE_PRIEST, level) ):
+		for j in range(0, GemRB.GetKnownSpellsCount (MyChar, IE_SPELL_TYPE_PRIEST, level)):
 			Spell = GemRB.GetKnownSpell (MyChar, IE_SPELL_TYPE_PRIEST, level, j)
-			Spell = GemRB.GetSpell (Spell['SpellResRef'], 1)['SpellName']
+			Spell = Spellbook.GetSpell (Spell['SpellResRef'], 1)['SpellName']
 			info += GemRB.GetString (Spell) + "\n"
 	if info != "":
 		info = "\n" + info + ""
@@ -26,6 +26,7 @@ import GUICommon
 import GUICommonWindows
 import CommonTables
 import InventoryCommon
+import ItemCache
 from GUIDefines import *
 from ie_stats import *
 from ie_slots import *
@@ -34,6 +35,8 @@ def InitInventoryWindow (Window):
 	"""Opens the inventory window."""
 
 	Window.AddAlias("WIN_INV")
+	# the slot buttons are new, none of them is drawn yet
+	InventoryCommon.ForgetSlots ()
 	Window.GetControl (0x1000003f).AddAlias("MsgSys", 1)
 
 	#ground items scrollbar
@@ -140,8 +143,7 @@ def UpdateInventoryWindow (Window = None):
 	#populate inventory slot controls
 	SlotCount = GemRB.GetSlotType (-1)["Count"]
 
-	for i in range (SlotCount):
-		InventoryCommon.UpdateSlot (pc, i)
+	InventoryCommon.UpdateSlots (pc, SlotCount)
 	return
 
 ToggleInventoryWindow = GUICommonWindows.CreateTopWinLoader(2, "GUIINV", GUICommonWindows.ToggleWindow, InitInventoryWindow, UpdateInventoryWindow)
@@ -176,13 +178,12 @@ def RefreshInventoryWindow (Window):
 		Color5 = GemRB.GetPlayerStat (pc, IE_LEATHER_COLOR)
 		Color6 = GemRB.GetPlayerStat (pc, IE_ARMOR_COLOR)
 		Color7 = GemRB.GetPlayerStat (pc, IE_HAIR_COLOR)
-		Button.SetPLT (GUICommon.GetActorPaperDoll (pc),
-			Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 0)
+		Button.SetPLT (GUICommon.GetActorPaperDoll (pc), Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 0)
 
 		# Weapon
-		slot_item = GemRB.GetSlotItem (pc, GemRB.GetEquippedQuickSlot (pc) )
+		slot_item = GemRB.GetSlotItem (pc, GemRB.GetEquippedQuickSlot (pc))
 		if slot_item:
-			item = GemRB.GetItem (slot_item["ItemResRef"])
+			item = ItemCache.GetItem (slot_item["ItemResRef"])
 			if (item['AnimationType'] != ''):
 				Button.SetPLT("WP" + size + item['AnimationType'] + "INV", Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 1)
 
@@ -190,7 +191,7 @@ def RefreshInventoryWindow (Window):
 		slot_item = GemRB.GetSlotItem (pc, 3)
 		if slot_item:
 			itemname = slot_item["ItemResRef"]
-			item = GemRB.GetItem (itemname)
+			item = ItemCache.GetItem (itemname)
 			if (item['AnimationType'] != ''):
 				if (GemRB.CanUseItemType (SLOT_WEAPON, itemname)):
 					#off-hand weapon
@@ -202,7 +203,7 @@ def RefreshInventoryWindow (Window):
 		# Helmet
 		slot_item = GemRB.GetSlotItem (pc, 1)
 		if slot_item:
-			item = GemRB.GetItem (slot_item["ItemResRef"])
+			item = ItemCache.GetItem (slot_item["ItemResRef"])
 			if (item['AnimationType'] != ''):
 				Button.SetPLT("WP" + size + item['AnimationType'] + "INV", Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 3)
 
@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
     ("START", "CHU", RES_CHU),
@@ -36,8 +36,4 @@ demo_files = (
     ("feine22", "TTF", 1),
 )
 
-GemRB.BG2Demo = False
-if CheckFiles(files):
-    GemRB.AddGameTypeHint ("bg2", 90)
-    if CheckFiles(demo_files):
-        GemRB.BG2Demo = True
+AddSignature ("bg2", 90, files, {"BG2Demo": demo_files})
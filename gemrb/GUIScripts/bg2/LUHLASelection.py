@@ -166,7 +166,7 @@ def HLAShowAbilities ():
 		HLARef = HLAAbilities[i+j][0][3:]
 		if not HLARef:
 			continue
-		Spell = GemRB.GetSpell (HLARef)
+		Spell = Spellbook.GetSpell (HLARef)
 		SpellButton.SetTooltip(Spell['SpellName'])
 		SpellButton.SetSpellIcon(HLARef, 1)
 		SpellButton.SetVarAssoc("ButtonPressed", i)
@@ -208,7 +208,7 @@ def HLASelectPress ():
 	i = GemRB.GetVar ("ButtonPressed") + j
 
 	# get the spell that's been pushed
-	Spell = GemRB.GetSpell (HLAAbilities[i][0][3:])
+	Spell = Spellbook.GetSpell (HLAAbilities[i][0][3:])
 	HLATextArea.SetText (Spell["SpellDesc"])
 
 	# make sure we can learn the spell
@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
 	("itinfwin", "png", RES_PNG),
@@ -27,5 +27,4 @@ files = (
 	("riddler", "dlg", RES_DLG)
 )
 
-if CheckFiles (files):
-	GemRB.AddGameTypeHint ("demo", 110)
+AddSignature ("demo", 110, files)
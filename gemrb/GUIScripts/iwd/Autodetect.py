@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
     ("START", "CHU", RES_CHU),
@@ -34,10 +34,8 @@ files_how = (
     ("TRACKING", "2DA", RES_2DA),
 )
 
-if CheckFiles(files):
-    if CheckFiles(files_how):
-        GemRB.AddGameTypeHint ("how", 95)
-    else:
-        GemRB.AddGameTypeHint ("iwd", 90)
+# both match with HoW installed, its higher weight wins
+AddSignature ("how", 95, files + files_how)
+AddSignature ("iwd", 90, files)
 
 
@@ -1914,7 +1914,7 @@ def MageSpellsSelect(SpellTable, Level, SpellLevel):
 		SpellButton = MageSpellsWindow.GetControl (i + 2)
 		SpellButton.SetFlags (IE_GUI_BUTTON_PICTURE|IE_GUI_BUTTON_CHECKBOX, OP_OR)
 		if i < len(Learnable):
-			Spell = GemRB.GetSpell (Learnable[i])
+			Spell = Spellbook.GetSpell (Learnable[i])
 			SpellButton.SetSpellIcon(Learnable[i], 1)
 			SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
 			SpellButton.OnPress (MageSpellsSelectPress)
@@ -1955,7 +1955,7 @@ def MageSpellsSelectPress():
 		i = i + 1
 		Spell = Spell >> 1
 
-	Spell = GemRB.GetSpell (Learnable[i])
+	Spell = Spellbook.GetSpell (Learnable[i])
 	MageSpellsTextArea.SetText (Spell["SpellDesc"])
 
 	if SpellMask < MageSpellBook:
@@ -2031,7 +2031,7 @@ def MageSpellsMemorize(SpellTable, Level, SpellLevel):
 		while (j < len(Learnable)) and (((1 << j) & MageSpellBook) == 0):
 			j = j + 1
 		if j < len(Learnable):
-			Spell = GemRB.GetSpell (Learnable[j])
+			Spell = Spellbook.GetSpell (Learnable[j])
 			SpellButton.SetTooltip(Spell["SpellName"])
 			SpellButton.SetSpellIcon(Learnable[j], 1)
 			SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
@@ -2073,7 +2073,7 @@ def MageMemorizeSelectPress():
 		i = i + 1
 		Spell = Spell >> 1
 
-	Spell = GemRB.GetSpell (Learnable[i])
+	Spell = Spellbook.GetSpell (Learnable[i])
 	MageMemorizeTextArea.SetText (Spell["SpellDesc"])
 
 	if SpellMask < MageMemorized:
@@ -2150,7 +2150,7 @@ def PriestSpellsMemorize(SpellTable, Level, SpellLevel):
 		SpellButton = PriestMemorizeWindow.GetControl (i + 2)
 		SpellButton.SetFlags (IE_GUI_BUTTON_PICTURE|IE_GUI_BUTTON_CHECKBOX, OP_OR)
 		if i < len(Learnable):
-			Spell = GemRB.GetSpell (Learnable[i])
+			Spell = Spellbook.GetSpell (Learnable[i])
 			SpellButton.SetTooltip(Spell["SpellName"])
 			SpellButton.SetSpellIcon(Learnable[i], 1)
 			SpellButton.SetState (IE_GUI_BUTTON_ENABLED)
@@ -2190,7 +2190,7 @@ def PriestMemorizeSelectPress():
 		i = i + 1
 		Spell = Spell >> 1
 
-	Spell=GemRB.GetSpell (Learnable[i])
+	Spell = Spellbook.GetSpell (Learnable[i])
 	PriestMemorizeTextArea.SetText (Spell["SpellDesc"])
 
 	if SpellMask < PriestMemorized:
@@ -26,6 +26,7 @@ import GUICommon
 import CommonTables
 import GUICommonWindows
 import InventoryCommon
+import ItemCache
 from GUIDefines import *
 from ie_stats import *
 from ie_slots import *
@@ -35,6 +36,8 @@ def InitInventoryWindow (Window):
 	"""Opens the inventory window."""
 
 	Window.AddAlias("WIN_INV")
+	# the slot buttons are new, none of them is drawn yet
+	InventoryCommon.ForgetSlots ()
 	Window.GetControl (0x1000003f).AddAlias("MsgSys", 1)
 
 	#ground items scrollbar
@@ -120,8 +123,7 @@ def UpdateInventoryWindow (Window = None):
 	#populate inventory slot controls
 	SlotCount = GemRB.GetSlotType (-1)["Count"]
 
-	for i in range (SlotCount):
-		InventoryCommon.UpdateSlot (pc, i)
+	InventoryCommon.UpdateSlots (pc, SlotCount)
 	return
 
 ToggleInventoryWindow = GUICommonWindows.CreateTopWinLoader(2, "GUIINV", GUICommonWindows.ToggleWindow, InitInventoryWindow, UpdateInventoryWindow)
@@ -155,9 +157,9 @@ def RefreshInventoryWindow (Window):
 	size = CommonTables.Pdolls.GetValue (row, "SIZE")
 
 	# Weapon
-	slot_item = GemRB.GetSlotItem (pc, GemRB.GetEquippedQuickSlot (pc) )
+	slot_item = GemRB.GetSlotItem (pc, GemRB.GetEquippedQuickSlot (pc))
 	if slot_item:
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		if (item['AnimationType'] != ''):
 			Button.SetPLT("WP" + size + item['AnimationType'] + "INV", Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 1)
 
@@ -165,7 +167,7 @@ def RefreshInventoryWindow (Window):
 	slot_item = GemRB.GetSlotItem (pc, 3)
 	if slot_item:
 		itemname = slot_item["ItemResRef"]
-		item = GemRB.GetItem (itemname)
+		item = ItemCache.GetItem (itemname)
 		if (item['AnimationType'] != ''):
 			if (GemRB.CanUseItemType (SLOT_WEAPON, itemname)):
 				#off-hand weapon
@@ -177,7 +179,7 @@ def RefreshInventoryWindow (Window):
 	# Helmet
 	slot_item = GemRB.GetSlotItem (pc, 1)
 	if slot_item:
-		item = GemRB.GetItem (slot_item["ItemResRef"])
+		item = ItemCache.GetItem (slot_item["ItemResRef"])
 		if (item['AnimationType'] != ''):
 			Button.SetPLT("WP" + size + item['AnimationType'] + "INV", Color1, Color2, Color3, Color4, Color5, Color6, Color7, 0, 3)
 
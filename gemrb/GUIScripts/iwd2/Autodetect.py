@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
     ("START", "CHU", RES_CHU),
@@ -34,6 +34,5 @@ files = (
 )
 
 
-if CheckFiles(files):
-    GemRB.AddGameTypeHint ("iwd2", 100)
+AddSignature ("iwd2", 100, files)
 
@@ -39,59 +39,125 @@ PointsLeft = 0
 CharGen = 0
 ButtonCount = 0
 LUStat = 0
+FeatKitColumn = None
 
 # returns the number of feat levels (for example cleave can be taken twice)
 def MultiLevelFeat(feat):
-	global FeatReqTable
-	return FeatReqTable.GetValue(feat, "MAX_LEVEL")
-
-def IsFeatUsable(feat):
-	global FeatReqTable
+	return FeatReqs[feat][4]
+
+# the relational operators of featreq.2da, like DiffCore in the core
+# compares unsigned base stats
+FeatOps = (
+	lambda a, b: a <= b, # LESS_OR_EQUALS
+	lambda a, b: a == b, # EQUALS
+	lambda a, b: a < b, # LESS_THAN
+	lambda a, b: a > b, # GREATER_THAN
+	lambda a, b: a >= b, # GREATER_OR_EQUALS
+	lambda a, b: a != b, # NOT_EQUALS
+	lambda a, b: (a & b) == a, # BINARY_LESS_OR_EQUALS
+	lambda a, b: (a & b) == b, # BINARY_MORE_OR_EQUALS
+	lambda a, b: (a & b) != 0, # BINARY_INTERSECT
+	lambda a, b: (a & b) == 0, # BINARY_NOT_INTERSECT
+	lambda a, b: (a & b) != a, # BINARY_MORE
+	lambda a, b: (a & b) != b, # BINARY_LESS
+)
+
+# featreq.2da compiled by CompileFeatReqs, indexed like the rows of feats.2da:
+# (callback, stats, values, ops, max level) with stats/values/ops holding the
+# A-D columns
+FeatReqs = []
+# the stats referenced by FeatReqs
+FeatReqStats = ()
+# (slot, LUStat, LevelDiff) and the results of the last evaluation
+FeatState = None
+FeatUsable = []
+
+def CompileFeatReqs():
+	global FeatReqs, FeatReqStats, FeatState
+
+	FeatReqs = []
+	stats = set()
+	for i in range(FeatTable.GetRowCount()):
+		feat = FeatTable.GetRowName(i)
+		a_value = FeatReqTable.GetValue(feat, "A_VALUE")
+		if a_value < 0:
+			#string, the name of a Check_ function
+			callback = FeatReqTable.GetValue(feat, "A_STAT", GTV_STR)
+			a_stat = 0
+		else:
+			#stat
+			callback = None
+			a_stat = FeatReqTable.GetValue(feat, "A_STAT", GTV_STAT)
+		reqStats = (a_stat,) + tuple(FeatReqTable.GetValue(feat, col + "_STAT", GTV_STAT) for col in "BCD")
+		values = (a_value,) + tuple(FeatReqTable.GetValue(feat, col + "_VALUE") for col in "BCD")
+		ops = tuple(FeatReqTable.GetValue(feat, col + "_OP") for col in "ABCD")
+		FeatReqs.append((callback, reqStats, values, ops, FeatReqTable.GetValue(feat, "MAX_LEVEL")))
+		if not callback:
+			stats.update(reqStats)
+
+	FeatReqStats = tuple(stats)
+	FeatState = None
+
+def GetFeatValues(reqStats, values, levelDiff):
+	# feint a level increase
+	if LUStat > 0 and LUStat in reqStats:
+		i = reqStats.index(LUStat)
+		values = list(values)
+		values[i] = max(0, values[i] - levelDiff)
+	return values
+
+def CheckFeatReq(req, slot, statVector, levelDiff):
+	callback, reqStats, values, ops, levels = req
+	values = GetFeatValues(reqStats, values, levelDiff)
+	if callback:
+		# the same arguments GemRB.CheckFeatCondition passes to the callbacks
+		return globals()["Check_" + callback](slot, reqStats[1], values[1], reqStats[2], values[2], reqStats[3], values[3], *ops)
+
+	# (a or b) and (c or d), skipping the unused (zeroed) columns
+	ret = True
+	for i in range(4):
+		if i == 2 and not ret:
+			return False
+		if not reqStats[i] and not values[i]:
+			continue
+		compare = FeatOps[ops[i]] if 0 <= ops[i] < len(FeatOps) else FeatOps[0]
+		result = compare(statVector[reqStats[i]], values[i] & 0xffffffff)
+		if i % 2:
+			ret = ret or result
+		else:
+			ret = result
+	return ret
 
-	a_value = FeatReqTable.GetValue(feat, "A_VALUE")
-	if a_value<0:
-		#string
-		a_stat = FeatReqTable.GetValue(feat, "A_STAT", GTV_STR)
-	else:
-		#stat
-		a_stat = FeatReqTable.GetValue(feat, "A_STAT", GTV_STAT)
-	b_stat = FeatReqTable.GetValue(feat, "B_STAT", GTV_STAT)
-	c_stat = FeatReqTable.GetValue(feat, "C_STAT", GTV_STAT)
-	d_stat = FeatReqTable.GetValue(feat, "D_STAT", GTV_STAT)
-	b_value = FeatReqTable.GetValue(feat, "B_VALUE")
-	c_value = FeatReqTable.GetValue(feat, "C_VALUE")
-	d_value = FeatReqTable.GetValue(feat, "D_VALUE")
-	a_op = FeatReqTable.GetValue(feat, "A_OP")
-	b_op = FeatReqTable.GetValue(feat, "B_OP")
-	c_op = FeatReqTable.GetValue(feat, "C_OP")
-	d_op = FeatReqTable.GetValue(feat, "D_OP")
+def UpdateFeatUsable():
+	"""Checks all feats at once, refetching the stats only if the simulated level-up changed."""
+	global FeatState, FeatUsable
 
 	if CharGen:
 		slot = GemRB.GetVar ("Slot")
 	else:
 		slot = GemRB.GameGetSelectedPCSingle ()
+	levelDiff = GemRB.GetVar ("LevelDiff") if LUStat > 0 else 0
 
-	# feint a level increase
-	if LUStat > 0:
-		stats = [ a_stat, b_stat, c_stat, d_stat ]
-		vals = [ a_value, b_value, c_value, d_value ]
-		for i in range(len(stats)):
-			if stats[i] == LUStat:
-				vals[i] -= GemRB.GetVar ("LevelDiff")
-				vals[i] = max(0, vals[i])
-				# there must be a better way (using append() to construct the list (same id) is not enough)!?
-				a_value = vals[0]
-				b_value = vals[1]
-				c_value = vals[2]
-				d_value = vals[3]
-				break
-
-	return GemRB.CheckFeatCondition(slot, a_stat, a_value, b_stat, b_value, c_stat, c_value, d_stat, d_value, a_op, b_op, c_op, d_op)
+	state = (slot, LUStat, levelDiff)
+	if state != FeatState:
+		FeatState = state
+		statVector = {}
+		for stat in FeatReqStats:
+			statVector[stat] = GemRB.GetPlayerStat (slot, stat, 1) & 0xffffffff
+		FeatUsable = [None if req[0] else CheckFeatReq(req, slot, statVector, levelDiff) for req in FeatReqs]
+
+	# the callbacks can depend on the feats picked so far, so they stay live
+	for i, req in enumerate(FeatReqs):
+		if req[0]:
+			FeatUsable[i] = CheckFeatReq(req, slot, None, levelDiff)
+
+def IsFeatUsable(feat):
+	return FeatUsable[feat]
 
 # checks if a feat was granted due to class/kit/race and returns the number
 # of granted levels. The bonuses aren't cumulative.
 def GetBaseValue(feat):
-	global FeatsClassColumn, RaceColumn, KitName
+	global FeatsClassColumn, RaceColumn
 
 	Val = 0
 	if CharGen:
@@ -106,11 +172,8 @@ def GetBaseValue(feat):
 		Val = GemRB.HasFeat (pc, feat) # actually returns count
 
 	Val3 = 0
-	# only cleric kits have feat bonuses in the original, but the column names are shortened
-	KitName = KitName.replace("CLERIC_","C_")
-	KitColumn = FeatTable.GetColumnIndex(KitName)
-	if KitColumn != None:
-		Val3 = FeatTable.GetValue(feat, KitColumn)
+	if FeatKitColumn != None:
+		Val3 = FeatTable.GetValue(feat, FeatKitColumn)
 		if Val3 > Val:
 			Val = Val3
 
@@ -122,20 +185,20 @@ def RedrawFeats():
 	SumLabel = FeatWindow.GetControl(0x1000000c)
 	if PointsLeft == 0:
 		DoneButton.SetState(IE_GUI_BUTTON_ENABLED)
-		SumLabel.SetColor ({'r' : 255, 'g' : 255, 'b' : 255})
+		SumLabel.SetColor ({'r': 255, 'g': 255, 'b': 255})
 	else:
 		DoneButton.SetState(IE_GUI_BUTTON_DISABLED)
-		SumLabel.SetColor ({'r' : 255, 'g' : 255, 'b' : 0})
+		SumLabel.SetColor ({'r': 255, 'g': 255, 'b': 0})
 
-	SumLabel.SetText(str(PointsLeft) )
+	SumLabel.SetText(str(PointsLeft))
+	UpdateFeatUsable()
 
 	for i in range(ButtonCount):
-		Pos=TopIndex+i
+		Pos = TopIndex+i
 		FeatName = FeatTable.GetValue(Pos, 1)
 		Label = FeatWindow.GetControl(0x10000001+i)
 		Label.SetText(FeatName)
 
-		FeatName=FeatTable.GetRowName(Pos) #row name
 		FeatValue = GemRB.GetVar("Feat "+str(Pos))
 
 		ButtonPlus = FeatWindow.GetControl(i*2+14)
@@ -143,19 +206,19 @@ def RedrawFeats():
 		if FeatValue == 0:
 			ButtonMinus.SetState(IE_GUI_BUTTON_DISABLED)
 			# check if feat is usable - can be taken
-			if IsFeatUsable(FeatName):
+			if IsFeatUsable(Pos):
 				ButtonPlus.SetState(IE_GUI_BUTTON_ENABLED)
-				Label.SetColor ({'r' : 255, 'g' : 255, 'b' : 255})
+				Label.SetColor ({'r': 255, 'g': 255, 'b': 255})
 			else:
 				ButtonPlus.SetState(IE_GUI_BUTTON_DISABLED)
-				Label.SetColor ({'r' : 150, 'g' : 150, 'b' : 150})
+				Label.SetColor ({'r': 150, 'g': 150, 'b': 150})
 		else:
 			ButtonPlus.SetState(IE_GUI_BUTTON_DISABLED)
-			Label.SetColor ({'r' : 150, 'g' : 150, 'b' : 150})
+			Label.SetColor ({'r': 150, 'g': 150, 'b': 150})
 			# check for maximum if there are more feat levels
-			if MultiLevelFeat(FeatName) > FeatValue and IsFeatUsable(FeatName):
+			if MultiLevelFeat(Pos) > FeatValue and IsFeatUsable(Pos):
 				ButtonPlus.SetState(IE_GUI_BUTTON_ENABLED)
-				Label.SetColor ({'r' : 255, 'g' : 255, 'b' : 255})
+				Label.SetColor ({'r': 255, 'g': 255, 'b': 255})
 
 			BaseValue = GemRB.GetVar("BaseFeatValue " + str(Pos))
 			if FeatValue > BaseValue:
@@ -165,9 +228,9 @@ def RedrawFeats():
 
 		if PointsLeft == 0:
 			ButtonPlus.SetState(IE_GUI_BUTTON_DISABLED)
-			Label.SetColor ({'r' : 150, 'g' : 150, 'b' : 150})
+			Label.SetColor ({'r': 150, 'g': 150, 'b': 150})
 
-		levels = FeatReqTable.GetValue(FeatName, "MAX_LEVEL")
+		levels = MultiLevelFeat(Pos)
 		FeatValueCounter = FeatValue
 		# count backwards, since the controls follow each other in rtl order,
 		# while we need to change the bams in ltr order
@@ -207,7 +270,7 @@ def OpenFeatsWindow(chargen=0):
 	global FeatWindow, TextAreaControl, DoneButton, TopIndex
 	global FeatTable, FeatReqTable
 	global KitName, PointsLeft, ButtonCount, CharGen
-	global KitColumn, RaceColumn, FeatsClassColumn, LUStat
+	global KitColumn, RaceColumn, FeatsClassColumn, LUStat, FeatKitColumn
 
 	CharGen = chargen
 
@@ -258,6 +321,11 @@ def OpenFeatsWindow(chargen=0):
 	FeatTable = GemRB.LoadTable("feats")
 	RowCount = FeatTable.GetRowCount()
 	FeatReqTable = GemRB.LoadTable("featreq")
+	CompileFeatReqs()
+
+	# only cleric kits have feat bonuses in the original, but the column names are shortened
+	KitName = KitName.replace("CLERIC_","C_")
+	FeatKitColumn = FeatTable.GetColumnIndex(KitName)
 
 	for i in range(RowCount):
 		featBase = GetBaseValue(i)
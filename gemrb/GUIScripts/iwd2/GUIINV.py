@@ -44,6 +44,8 @@ def InitInventoryWindow (Window):
 	global InventoryWindow
 
 	Window.AddAlias("WIN_INV")
+	# the slot buttons are new, none of them is drawn yet
+	InventoryCommon.ForgetSlots ()
 	InventoryWindow = Window
 
 	#ground items scrollbar
@@ -157,8 +159,7 @@ def UpdateInventoryWindow (Window = None):
 	RefreshInventoryWindow ()
 	# populate inventory slot controls
 	SlotCount = GemRB.GetSlotType (-1)["Count"]
-	for i in range (SlotCount):
-		InventoryCommon.UpdateSlot (pc, i)
+	InventoryCommon.UpdateSlots (pc, SlotCount)
 	return
 
 InventoryCommon.UpdateInventoryWindow = UpdateInventoryWindow
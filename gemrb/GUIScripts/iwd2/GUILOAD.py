@@ -23,6 +23,7 @@
 
 import GemRB
 import LoadScreen
+import SaveGameCache
 from GameCheck import MAX_PARTY_SIZE
 from GUIDefines import *
 
@@ -36,8 +37,9 @@ def OnLoad ():
 
 	GemRB.SetToken ("SaveDir", "mpsave") # iwd2 is always using 'mpsave'
 	LoadWindow = GemRB.LoadWindow (0, "GUILOAD")
+	LoadWindow.SetAction (SaveGameCache.BrowserClosed, ACTION_WINDOW_CLOSED)
 
-	CancelButton=LoadWindow.GetControl (22)
+	CancelButton = LoadWindow.GetControl (22)
 	CancelButton.SetText (13727)
 	CancelButton.OnPress (LoadWindow.Close)
 	CancelButton.MakeEscape()
@@ -88,10 +90,10 @@ def ScrollBarPress ():
 		Button1 = LoadWindow.GetControl (55+i)
 		Button2 = LoadWindow.GetControl (60+i)
 		ScreenShotButton = LoadWindow.GetControl (1 + i)
-		if ActPos<len(Games):
+		if ActPos < len(Games):
 			Button1.SetState (IE_GUI_BUTTON_ENABLED)
 			Button2.SetState (IE_GUI_BUTTON_ENABLED)
-			ScreenShotButton.SetPicture (Games[ActPos].GetPreview())
+			ScreenShotButton.SetPicture (SaveGameCache.GetPreview (Games[ActPos]))
 			Slotname = Games[ActPos].GetName()
 			GameDate = Games[ActPos].GetGameDate()
 			SaveDate = Games[ActPos].GetDate()
@@ -113,11 +115,13 @@ def ScrollBarPress ():
 		Label.SetText (SaveDate)
 
 		for j in range (min(6, MAX_PARTY_SIZE)):
-			Button=LoadWindow.GetControl (25 + i*min(6, MAX_PARTY_SIZE) + j)
-			if ActPos<len(Games):
-				Button.SetPicture (Games[ActPos].GetPortrait(j))
+			Button = LoadWindow.GetControl (25 + i*min(6, MAX_PARTY_SIZE) + j)
+			if ActPos < len(Games):
+				Button.SetPicture (SaveGameCache.GetPortrait (Games[ActPos], j))
 			else:
 				Button.SetPicture (None)
+
+	SaveGameCache.Prefetch (Games, Pos, 5, min(6, MAX_PARTY_SIZE))
 	return
 
 def LoadGamePress (btn):
@@ -134,6 +138,7 @@ def DeleteGameConfirm (btn):
 
 	TopIndex = GemRB.GetVar ("TopIndex")
 	Pos = TopIndex + btn.Value
+	SaveGameCache.Invalidate (Games[Pos])
 	GemRB.DeleteSaveGame(Games[Pos])
 	del Games[Pos]
 	if TopIndex > 0:
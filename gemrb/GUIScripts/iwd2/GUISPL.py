@@ -310,7 +310,7 @@ def OpenSpellBookSpellInfoWindow ():
 		ResRef = ms['SpellResRef']
 	else:
 		ResRef = KnownSpellList[index - 100 + GemRB.GetVar ("SpellTopIndex")]["SpellResRef"]
-	spell = GemRB.GetSpell (ResRef)
+	spell = Spellbook.GetSpell (ResRef)
 
 	Label = Window.GetControl (0x0fffffff)
 	Label.SetText (spell['SpellName'])
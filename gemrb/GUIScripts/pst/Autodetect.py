@@ -1,6 +1,6 @@
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 files = (
     ("START", "CHU", RES_CHU),
@@ -13,5 +13,4 @@ files = (
 )
 
 
-if CheckFiles(files):
-    GemRB.AddGameTypeHint ("pst", 100)
+AddSignature ("pst", 100, files)
@@ -425,7 +425,7 @@ def UpdateFloatMenuSpell (pc, i):
 		Button.SetSpellIcon (SpellResRef)
 		Button.SetText ("%d" % spell_list[i + float_menu_index]["MemoCount"])
 
-		spell = GemRB.GetSpell (SpellResRef)
+		spell = Spellbook.GetSpell (SpellResRef)
 		Button.SetTooltip (spell['SpellName'])
 		Button.OnPress (GUICommonWindows.SpellPressed)
 		Button.SetVarAssoc ("Spell", spell_list[i + float_menu_index]['SpellIndex'])
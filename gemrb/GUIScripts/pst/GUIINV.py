@@ -26,6 +26,7 @@ import GUICommon
 import CommonTables
 import GUICommonWindows
 import InventoryCommon
+import ItemCache
 from GUIDefines import *
 from ie_stats import *
 from ie_slots import *
@@ -63,6 +64,8 @@ def InitInventoryWindow (Window):
 	global AvSlotsTable
 
 	Window.AddAlias("WIN_INV")
+	# the slot buttons are new, none of them is drawn yet
+	InventoryCommon.ForgetSlots ()
 
 	AvSlotsTable = GemRB.LoadTable ('avslots')
 	Window.GetControl(0x1000003d).AddAlias("MsgSys", 1)
@@ -166,8 +169,7 @@ def UpdateInventoryWindow (Window = None):
 	InventoryCommon.SlotMap = SlotMap
 
 	# populate inventory slot controls
-	for i in range (46):
-		InventoryCommon.UpdateSlot (pc, i)
+	InventoryCommon.UpdateSlots (pc, 46)
 
 ToggleInventoryWindow = GUICommonWindows.CreateTopWinLoader(3, "GUIINV", GUICommonWindows.ToggleWindow, InitInventoryWindow, UpdateInventoryWindow, WINDOW_TOP|WINDOW_HCENTER)
 OpenInventoryWindow = GUICommonWindows.CreateTopWinLoader(3, "GUIINV", GUICommonWindows.OpenWindowOnce, InitInventoryWindow, UpdateInventoryWindow, WINDOW_TOP|WINDOW_HCENTER)
@@ -229,7 +231,7 @@ def RefreshInventoryWindow (Window):
 		Button.SetAction (InventoryCommon.OnDragItemGround, IE_ACT_DRAG_DROP_DST)
 		Slot = GemRB.GetContainerItem (pc, i+TopIndex)
 		if Slot != None:
-			item = GemRB.GetItem (Slot['ItemResRef'])
+			item = ItemCache.GetItem (Slot['ItemResRef'])
 			identified = Slot["Flags"] & IE_INV_ITEM_IDENTIFIED
 
 			Button.SetItemIcon (Slot['ItemResRef'])
@@ -29,6 +29,7 @@
 import GemRB
 import GUICommon
 import GUICommonWindows
+import StringCache
 from GUIDefines import *
 
 # list of all assigned (0) or completed (1) quests
@@ -155,80 +156,107 @@ def PopulateQuestsList ():
 	GemRB.SetVar ('SelectedQuest', -1)
 	QuestDesc.Clear ()
 	
-	lookup = lambda quest: int(GemRB.GetINIQuestsKey (str (quest[0]), 'title', '0'))
-	opts = ['- ' + GemRB.GetString(lookup(q)) for q in quests[selected_quest_class]]
+	opts = ['- ' + StringCache.GetString (QuestRules[q[0]][2]) for q in quests[selected_quest_class]]
 	QuestsList.SetColor (ColorWhitish, TA_COLOR_OPTIONS)
 	QuestsList.SetOptions(opts)
-	
-def EvaluateCondition (var, value, condition):
-	cur_value = int (GemRB.GetGameVar (var))
-
-	if condition == 'EQ':
-		return cur_value == int (value)
-	if condition == 'NE':
-		return cur_value != int (value)
-	elif condition == 'GT':
-		return cur_value > int (value)
-	elif condition == 'LT':
-		return cur_value < int (value)
-	else:
-		print('Unknown condition in quests.ini:', condition)
-		return None
-
-def EvaluateQuest (index):
-	tag = str (index)
-
-	endings = int (GemRB.GetINIQuestsKey (tag, 'possibleEndings', '1'))
 
-	for e in range (endings):
-		if e == 0:
-			suff = ''
-		else:
-			suff = chr (ord ('A') + e)
-
-		completed = 1
-		cc = int (GemRB.GetINIQuestsKey (tag, 'completeChecks' + suff, '0'))
-		for i in range (1, cc + 1):
-			var = GemRB.GetINIQuestsKey (tag, 'cVar' + suff + str (i), '')
-			value = GemRB.GetINIQuestsKey (tag, 'cValue' + suff + str (i), '0')
-			condition = GemRB.GetINIQuestsKey (tag, 'cCondition' + suff + str (i), 'EQ')
-
-			completed = completed and EvaluateCondition (var, value, condition)
+# quests.ini compiled by CompileQuests: per quest a tuple of the endings
+# ((checks, descCompleted), ...), the assigned (checks, descAssigned) and the
+# title strref, with the checks as tuples of (var, compare, value)
+QuestRules = None
+# game variable -> indices of the quests checking it
+QuestVars = {}
+# the variables and quest results of the last evaluation
+QuestSnapshot = {}
+QuestResults = {}
+
+Conditions = {
+	'EQ': lambda cur, value: cur == value,
+	'NE': lambda cur, value: cur != value,
+	'GT': lambda cur, value: cur > value,
+	'LT': lambda cur, value: cur < value,
+}
+
+def CompileChecks (index, tag, prefix, suff, count):
+	checks = []
+	for i in range (1, count + 1):
+		var = GemRB.GetINIQuestsKey (tag, prefix + 'Var' + suff + str (i), '')
+		value = int (GemRB.GetINIQuestsKey (tag, prefix + 'Value' + suff + str (i), '0'))
+		condition = GemRB.GetINIQuestsKey (tag, prefix + 'Condition' + suff + str (i), 'EQ')
+
+		compare = Conditions.get (condition)
+		if compare is None:
+			print('Unknown condition in quests.ini:', condition)
+			compare = lambda cur, value: False
+		checks.append ((var, compare, value))
+		QuestVars.setdefault (var, []).append (index)
+	return tuple (checks)
+
+def CompileQuests ():
+	"""Reads quests.ini once, turning every quest into its checks."""
+	global QuestRules
+
+	QuestRules = []
+	count = int (GemRB.GetINIQuestsKey ('init', 'questcount', '0'))
+	for index in range (count):
+		tag = str (index)
+		endings = []
+		for e in range (int (GemRB.GetINIQuestsKey (tag, 'possibleEndings', '1'))):
+			if e == 0:
+				suff = ''
+			else:
+				suff = chr (ord ('A') + e)
+
+			cc = int (GemRB.GetINIQuestsKey (tag, 'completeChecks' + suff, '0'))
+			checks = CompileChecks (index, tag, 'c', suff, cc)
+			endings.append ((checks, GemRB.GetINIQuestsKey (tag, 'descCompleted' + suff, '0')))
+
+		ac = int (GemRB.GetINIQuestsKey (tag, 'assignedChecks', '0'))
+		assigned = (CompileChecks (index, tag, 'a', '', ac), GemRB.GetINIQuestsKey (tag, 'descAssigned', '0'))
+		title = int (GemRB.GetINIQuestsKey (tag, 'title', '0'))
+		QuestRules.append ((tuple (endings), assigned, title))
+
+def EvaluateChecks (checks):
+	for var, compare, value in checks:
+		if not compare (QuestSnapshot[var], value):
+			return False
+	return True
 
-			if not completed: break
+def EvaluateQuest (index):
+	endings, assigned, title = QuestRules[index]
 
-		if completed:
-			desc = GemRB.GetINIQuestsKey (tag, 'descCompleted' + suff, '0')
+	for checks, desc in endings:
+		if EvaluateChecks (checks):
 			return (1, desc)
 
-
-	assigned = 1
-	ac = int (GemRB.GetINIQuestsKey (tag, 'assignedChecks', '0'))
-	for i in range (1, ac + 1):
-		var = GemRB.GetINIQuestsKey (tag, 'aVar' + str (i), '')
-		value = GemRB.GetINIQuestsKey (tag, 'aValue' + str (i), '0')
-		condition = GemRB.GetINIQuestsKey (tag, 'aCondition' + str (i), 'EQ')
-
-		assigned = assigned and EvaluateCondition (var, value, condition)
-
-		if not assigned: break
-
-	if assigned:
-		desc = GemRB.GetINIQuestsKey (tag, 'descAssigned', '0')
-		return (0, desc)
+	if EvaluateChecks (assigned[0]):
+		return (0, assigned[1])
 
 	return None
 
-
 def EvaluateAllQuests ():
+	if QuestRules is None:
+		CompileQuests ()
+
+	# only redo the quests checking a variable that changed since the last time
+	dirty = set ()
+	for var, indices in QuestVars.items ():
+		value = int (GemRB.GetGameVar (var))
+		if QuestSnapshot.get (var) != value:
+			QuestSnapshot[var] = value
+			dirty.update (indices)
+	if len(QuestResults) < len(QuestRules):
+		dirty.update (range (len(QuestRules)))
+
+	for index in dirty:
+		QuestResults[index] = EvaluateQuest (index)
+
 	del quests[0][:]
 	del quests[1][:]
-
-	count = int (GemRB.GetINIQuestsKey ('init', 'questcount', '0'))
-	for i in range (count):
-		res = EvaluateQuest (i)
+	for index in range (len(QuestRules)):
+		res = QuestResults[index]
 		if res:
-			quests[res[0]].append ((i, res[1]))
+			quests[res[0]].append ((index, res[1]))
 			
 
 ###################################################
@@ -278,10 +306,8 @@ def OnJournalBeastSelect ():
 	row = GemRB.GetVar ('SelectedBeast')
 	b = beasts[selected_beast_class][row]
 	
-	desc = GemRB.GetINIBeastsKey (str (b), 'desc0', '0')
-	BeastDesc.SetText (int (desc)) 
-
-	image = GemRB.GetINIBeastsKey (str (b), 'imageKnown', '')
+	klass, name, desc, image = BeastRules[b]
+	BeastDesc.SetText (desc)
 	BeastImage.SetPicture (image)
 	
 def OnJournalPCPress ():
@@ -302,26 +328,38 @@ def PopulateBeastsList ():
 	BeastDesc.Clear ()
 	BeastImage.SetPicture ('default')
 
-	lookup = lambda beast: int(GemRB.GetINIBeastsKey (str (beast), 'name', '0'))
-	opts = [GemRB.GetString(lookup(b)) for b in beasts[selected_beast_class]]
+	opts = [StringCache.GetString (BeastRules[b][1]) for b in beasts[selected_beast_class]]
 	BeastsList.SetColor (ColorWhitish, TA_COLOR_OPTIONS)
 	BeastsList.SetOptions(opts)
 
-def EvaluateAllBeasts ():
-	del beasts[0][:]
-	del beasts[1][:]
+# beast.ini compiled by CompileBeasts: per beast a tuple of its class, name,
+# description and image
+BeastRules = None
 
+def CompileBeasts ():
+	global BeastRules
+
+	BeastRules = []
 	count = int (GemRB.GetINIBeastsKey ('init', 'beastcount', '0'))
-	
 	for i in range (count):
-		if not GemRB.GameIsBeastKnown (i):
-			continue
+		tag = str (i)
+		klass = int (GemRB.GetINIBeastsKey (tag, 'class', '0'))
+		name = int (GemRB.GetINIBeastsKey (tag, 'name', '0'))
+		desc = int (GemRB.GetINIBeastsKey (tag, 'desc0', '0'))
+		image = GemRB.GetINIBeastsKey (tag, 'imageKnown', '')
+		BeastRules.append ((klass, name, desc, image))
 
-		klass = int (GemRB.GetINIBeastsKey (str (i), 'class', '0'))
-		beasts[klass].append (i)
-		
-	beasts[0].sort()
-	beasts[1].sort()
+def EvaluateAllBeasts ():
+	if BeastRules is None:
+		CompileBeasts ()
+
+	del beasts[0][:]
+	del beasts[1][:]
+
+	# the indices are visited in order, so the lists come out sorted
+	for i, beast in enumerate (BeastRules):
+		if GemRB.GameIsBeastKnown (i):
+			beasts[beast[0]].append (i)
 
 
 ###################################################
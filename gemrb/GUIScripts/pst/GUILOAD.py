@@ -23,6 +23,7 @@
 import GemRB
 import GUICommon
 import LoadScreen
+import SaveGameCache
 from GameCheck import MAX_PARTY_SIZE
 from GUIDefines import *
 
@@ -35,7 +36,8 @@ def OnLoad ():
 	global LoadWindow, TextAreaControl, Games, ScrollBar
 
 	LoadWindow = GemRB.LoadWindow (0, "GUILOAD")
-	CancelButton=LoadWindow.GetControl (46)
+	LoadWindow.SetAction (SaveGameCache.BrowserClosed, ACTION_WINDOW_CLOSED)
+	CancelButton = LoadWindow.GetControl (46)
 	CancelButton.SetText (4196)
 	CancelButton.OnPress (LoadWindow.Close)
 	CancelButton.MakeEscape()
@@ -113,19 +115,21 @@ def ScrollBarPress ():
 		Label = LoadWindow.GetControl (0x10000008+i)
 		Label.SetText (Slotname)
 
-		Button=LoadWindow.GetControl (1+i)
-		if ActPos<len(Games):
-			Button.SetPicture (Games[ActPos].GetPreview())
+		Button = LoadWindow.GetControl (1+i)
+		if ActPos < len(Games):
+			Button.SetPicture (SaveGameCache.GetPreview (Games[ActPos]))
 		else:
 			Button.SetPicture (None)
 		for j in range (min(6, MAX_PARTY_SIZE)):
 			Button = LoadWindow.GetControl (22+i*min(6, MAX_PARTY_SIZE)+j)
 			if not Button:
 				continue
-			if ActPos<len(Games):
-				Button.SetPicture (Games[ActPos].GetPortrait(j))
+			if ActPos < len(Games):
+				Button.SetPicture (SaveGameCache.GetPortrait (Games[ActPos], j))
 			else:
 				Button.SetPicture (None)
+
+	SaveGameCache.Prefetch (Games, Pos, 4, min(6, MAX_PARTY_SIZE))
 	return
 
 def LoadGamePress ():
@@ -141,10 +145,11 @@ def DeleteGameConfirm ():
 	global Games
 
 	TopIndex = GemRB.GetVar ("TopIndex")
-	Pos = TopIndex +GemRB.GetVar ("LoadIdx")
+	Pos = TopIndex + GemRB.GetVar ("LoadIdx")
+	SaveGameCache.Invalidate (Games[Pos])
 	GemRB.DeleteSaveGame(Games[Pos])
 	del Games[Pos]
-	if TopIndex>0:
+	if TopIndex > 0:
 		TopIndex = TopIndex - 1
 	ScrollBar.SetVarAssoc ("TopIndex", TopIndex, 0, max(0, len(Games) - 4))
 	ScrollBarPress ()
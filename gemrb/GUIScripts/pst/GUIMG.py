@@ -25,6 +25,7 @@ import GemRB
 import GUICommon
 import CommonTables
 import GUICommonWindows
+import Spellbook
 from GUIDefines import *
 from ie_stats import *
 
@@ -89,7 +90,7 @@ def UpdateMageWindow (Window=None):
 			else:
 				Icon.OnPress (OnMageUnmemorizeSpell)
 			Icon.OnRightPress (OpenMageSpellInfoWindow)
-			spell = GemRB.GetSpell (ms['SpellResRef'])
+			spell = Spellbook.GetSpell (ms['SpellResRef'])
 			Icon.SetTooltip (spell['SpellName'])
 			MageMemorizedSpellList.append (ms['SpellResRef'])
 			Icon.EnableBorder (0, ms['Flags'] == 0)
@@ -117,7 +118,7 @@ def UpdateMageWindow (Window=None):
 		Icon.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
 		Icon.OnPress (OnMageMemorizeSpell)
 		Icon.OnRightPress (OpenMageSpellInfoWindow)
-		spell = GemRB.GetSpell (ks['SpellResRef'])
+		spell = Spellbook.GetSpell (ks['SpellResRef'])
 		Icon.SetTooltip (spell['SpellName'])
 		MageKnownSpellList.append (ks['SpellResRef'])
 
@@ -161,7 +162,7 @@ def OpenMageSpellInfoWindow ():
 	else:
 		ResRef = MageKnownSpellList[index - 100]
 
-	spell = GemRB.GetSpell (ResRef)
+	spell = Spellbook.GetSpell (ResRef)
 
 	Label = Window.GetControl (0x0fffffff)
 	Label.SetText (spell['SpellName'])
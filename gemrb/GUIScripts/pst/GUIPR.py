@@ -25,6 +25,7 @@ import GemRB
 import GUICommon
 import CommonTables
 import GUICommonWindows
+import Spellbook
 from GUIDefines import *
 from ie_stats import *
 from ie_action import ACT_CAST
@@ -90,7 +91,7 @@ def UpdatePriestWindow (Window):
 			else:
 				Icon.OnPress (OnPriestUnmemorizeSpell)
 			Icon.OnRightPress (OpenPriestSpellInfoWindow)
-			spell = GemRB.GetSpell (ms['SpellResRef'])
+			spell = Spellbook.GetSpell (ms['SpellResRef'])
 			Icon.SetTooltip (spell['SpellName'])
 			PriestMemorizedSpellList.append (ms['SpellResRef'])
 			Icon.EnableBorder (0, ms['Flags'] == 0)
@@ -116,7 +117,7 @@ def UpdatePriestWindow (Window):
 		Icon.SetFlags (IE_GUI_BUTTON_NO_IMAGE, OP_NAND)
 		Icon.OnPress (OnPriestMemorizeSpell)
 		Icon.OnRightPress (OpenPriestSpellInfoWindow)
-		spell = GemRB.GetSpell (ks['SpellResRef'])
+		spell = Spellbook.GetSpell (ks['SpellResRef'])
 		Icon.SetTooltip (spell['SpellName'])
 		PriestKnownSpellList.append (ks['SpellResRef'])
 		Icon.SetVarAssoc ("SpellButton", 100 + i)
@@ -163,7 +164,7 @@ def OpenPriestSpellInfoWindow ():
 	else:
 		ResRef = PriestKnownSpellList[index - 100]
 
-	spell = GemRB.GetSpell (ResRef)
+	spell = Spellbook.GetSpell (ResRef)
 
 	Label = Window.GetControl (0x0fffffff)
 	Label.SetText (spell['SpellName'])
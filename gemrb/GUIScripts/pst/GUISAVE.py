@@ -24,6 +24,7 @@
 import GemRB
 import GUIClasses
 import LoadScreen
+import SaveGameCache
 import GUIOPT
 from GUIDefines import *
 
@@ -48,6 +49,7 @@ def OpenSaveWindow ():
 		return
 
 	SaveWindow = Window = GemRB.LoadWindow (0, "GUISAVE")
+	Window.SetAction (SaveGameCache.BrowserClosed, ACTION_WINDOW_CLOSED)
 	OptionsWindow = GemRB.GetView("OPTWIN")
 
 	# Cancel button
@@ -103,7 +105,7 @@ def ScrollBarPress():
 			Slottime = Games[ActPos].GetDate ()
 			Button1.SetState (IE_GUI_BUTTON_ENABLED)
 			Button2.SetState (IE_GUI_BUTTON_ENABLED)
-			PreviewButton.SetPicture (Games[ActPos].GetPreview())
+			PreviewButton.SetPicture (SaveGameCache.GetPreview (Games[ActPos]))
 		elif ActPos == len(Games):
 			Slotname = 28647 # "Empty"
 			Slottime = ""
@@ -126,10 +128,12 @@ def ScrollBarPress():
 		for j in range (6):
 			Button = Window.GetControl (22 + i*6 + j)
 			if ActPos < len(Games):
-				Button.SetPicture (Games[ActPos].GetPortrait(j))
+				Button.SetPicture (SaveGameCache.GetPortrait (Games[ActPos], j))
 			else:
 				Button.SetPicture (None)
 
+	SaveGameCache.Prefetch (Games, Pos, 4, 6)
+
 
 def SaveGamePress ():
 	OpenSaveDetailWindow ()
@@ -139,10 +143,11 @@ def DeleteGameConfirm():
 	global Games
 
 	TopIndex = GemRB.GetVar("TopIndex")
-	Pos = TopIndex +GemRB.GetVar("SaveIdx")
+	Pos = TopIndex + GemRB.GetVar("SaveIdx")
+	SaveGameCache.Invalidate (Games[Pos])
 	GemRB.DeleteSaveGame (Games[Pos])
 	del Games[Pos]
-	if TopIndex>0:
+	if TopIndex > 0:
 		TopIndex -= 1
 		GemRB.SetVar ("TopIndex", TopIndex)
 	ScrollBar.SetVarAssoc("TopIndex", TopIndex, 0, max (0, len(Games) - 4 + 1))
@@ -284,6 +289,7 @@ def ConfirmedSaveGame ():
 	#LoadScreen.StartLoadScreen (LoadScreen.LS_TYPE_SAVING)
 	CloseSaveWindow ()
 	if Pos < len(Games):
+		SaveGameCache.Invalidate (Games[Pos])
 		GemRB.SaveGame (Games[Pos], Slotname)
 	else:
 		GemRB.SaveGame (None, Slotname)
@@ -20,14 +20,12 @@
 
 ###################################################
 
+import collections
+
 import GemRB
 from maze_defs import *
 from GUIDefines import STR_AREANAME
 
-rooms = None
-max = 0
-dims = 0
-entries = None
 offx = (0,0,1,0,-1)
 offy = (0,-1,0,1,0)
 #wallbits = (0, WALL_WEST, WALL_NORTH, WALL_EAST, WALL_SOUTH)
@@ -35,96 +33,150 @@ wallbits = (0, WALL_NORTH, WALL_EAST, WALL_SOUTH, WALL_WEST)
 entrances = ("", "Entry3", "Entry4", "Entry1", "Entry2")
 doors = ("", "northdoor", "eastdoor", "southdoor", "westdoor")
 anims = ("", "a13xxdn", "a13xxde", "a13xxds", "a13xxdw")
-aposx=(0,1012,1005,505,380)
-aposy=(0,524,958,996,562)
-cposx=(686,886,497)
-cposy=(498,722,726)
-
-def Possible(posx, posy):
-	global entries
-
-	pos = posx*MAZE_MAX_DIM+posy
-
-	if entries[pos]:
-		return -1
-	return pos
+aposx = (0,1012,1005,505,380)
+aposy = (0,524,958,996,562)
+cposx = (686,886,497)
+cposy = (498,722,726)
+
+# header fields in GemRB.GetMazeHeader naming
+HeaderFields = (
+	("Pos1X", MH_POS1X), ("Pos1Y", MH_POS1Y), ("Pos2X", MH_POS2X), ("Pos2Y", MH_POS2Y),
+	("Pos3X", MH_POS3X), ("Pos3Y", MH_POS3Y), ("Pos4X", MH_POS4X), ("Pos4Y", MH_POS4Y),
+	("TrapCount", MH_TRAPCOUNT), ("Inited", MH_INITED)
+)
+
+class MazeModel(object):
+	"""A maze kept in local lists, mirroring the engine's maze data.
+
+	Nothing reaches the engine before Commit, so mazes can be generated and
+	checked without a game. Positions are x*MAZE_MAX_DIM+y, like the engine's."""
+
+	def __init__ (self, dims):
+		self.Dims = dims
+		self.Walls = [0] * MAZE_ENTRY_COUNT
+		# None for fields that were never set
+		self.Traps = [None] * MAZE_ENTRY_COUNT
+		self.Overrides = [None] * MAZE_ENTRY_COUNT
+		self.Visited = [None] * MAZE_ENTRY_COUNT
+		self.Header = {"MazeX": dims, "MazeY": dims}
+		for name, field in HeaderFields:
+			self.Header[name] = 0
+
+	def AddWalls (self, pos, value):
+		"""Adds wall bits to an entry and the matching ones to its neighbours, like SetMazeEntry."""
+
+		self.Walls[pos] |= value
+		if value & WALL_SOUTH and pos % MAZE_MAX_DIM != MAZE_MAX_DIM - 1:
+			self.Walls[pos + 1] |= WALL_NORTH
+		if value & WALL_NORTH and pos % MAZE_MAX_DIM:
+			self.Walls[pos - 1] |= WALL_SOUTH
+		if value & WALL_EAST and pos + MAZE_MAX_DIM < MAZE_ENTRY_COUNT:
+			self.Walls[pos + MAZE_MAX_DIM] |= WALL_WEST
+		if value & WALL_WEST and pos >= MAZE_MAX_DIM:
+			self.Walls[pos - MAZE_MAX_DIM] |= WALL_EAST
+
+	def GetEntry (self, pos):
+		"""Returns the entry in GemRB.GetMazeEntry format."""
+
+		trap = self.Traps[pos]
+		if trap is None:
+			trap = -1
+		return {"Walls": self.Walls[pos], "Trapped": trap, "Override": self.Overrides[pos] or 0, "Visited": self.Visited[pos] or 0}
+
+	def Commit (self):
+		"""Replaces the engine's maze with this one."""
+
+		GemRB.SetupMaze (self.Dims, self.Dims)
+		for pos in range (MAZE_ENTRY_COUNT):
+			if self.Overrides[pos] is not None:
+				GemRB.SetMazeEntry (pos, ME_OVERRIDE, self.Overrides[pos])
+			if self.Traps[pos] is not None:
+				GemRB.SetMazeEntry (pos, ME_TRAP, self.Traps[pos])
+			# the neighbours already carry their half of each wall
+			if self.Walls[pos]:
+				GemRB.SetMazeEntry (pos, ME_WALLS, self.Walls[pos])
+			if self.Visited[pos] is not None:
+				GemRB.SetMazeEntry (pos, ME_VISITED, self.Visited[pos])
+		# MH_INITED is last, it marks the maze as complete
+		for name, field in HeaderFields:
+			GemRB.SetMazeData (field, self.Header[name])
+
+def ReadMaze ():
+	"""Returns a model of the engine's current maze or None."""
 
-def GetPossible (pos):
-	posx = pos/MAZE_MAX_DIM
+	header = GemRB.GetMazeHeader()
+	if header == None:
+		return None
+
+	model = MazeModel (header["MazeX"])
+	model.Header.update (header)
+	for pos in range (MAZE_ENTRY_COUNT):
+		entry = GemRB.GetMazeEntry(pos)
+		model.Walls[pos] = entry["Walls"]
+		model.Traps[pos] = entry["Trapped"]
+		model.Overrides[pos] = entry["Override"]
+		model.Visited[pos] = entry["Visited"]
+	return model
+
+def GetPossible (entries, dims, pos):
+	posx = pos//MAZE_MAX_DIM
 	posy = pos-posx*MAZE_MAX_DIM
+	# the order matters for the rolls
 	possible = []
-
-	if posx>0:
-		newpos = Possible(posx-1, posy)
-		if newpos!=-1:
-			possible[:0] = [newpos]
-	if posy>0:
-		newpos = Possible(posx, posy-1)
-		if newpos!=-1:
-			possible[:0] = [newpos]
-	if posx<dims-1:
-		newpos = Possible(posx+1, posy)
-		if newpos!=-1:
-			possible[:0] = [newpos]
-	if posy<dims-1:
-		newpos = Possible(posx, posy+1)
-		if newpos!=-1:
-			possible[:0] = [newpos]
-
+	for x, y, ok in ((posx, posy+1, posy < dims-1), (posx+1, posy, posx < dims-1), (posx, posy-1, posy > 0), (posx-1, posy, posx > 0)):
+		if ok and not entries[x*MAZE_MAX_DIM+y]:
+			possible.append (x*MAZE_MAX_DIM+y)
 	return possible
 
+def GrowsEverywhere (entries, dims, pos):
+	free = sum (1 for x in range(dims) for y in range(dims) if not entries[x*MAZE_MAX_DIM+y])
+	seen = set ()
+	frontier = collections.deque ([pos])
+	while frontier:
+		for newpos in GetPossible (entries, dims, frontier.popleft ()):
+			if newpos not in seen:
+				seen.add (newpos)
+				frontier.append (newpos)
+	return len(seen) == free
+
 #loads a 2da and sets it up as maze
 def LoadMazeFrom2da(tablename):
 	MazeTable = GemRB.LoadTable(tablename)
 	if MazeTable == None:
-		return
+		return None
 	size = MazeTable.GetValue(-1,-1)
-	GemRB.SetupMaze(size, size)
+	model = MazeModel (size)
 	traps = 0
 	for i in range(MazeTable.GetRowCount()):
 		Area = MazeTable.GetRowName(i)
-		OVERRIDE = MazeTable.GetValue(Area,"OVERRIDE")
 		TRAPTYPE = MazeTable.GetValue(Area,"TRAPTYPE")
-		WALLS = MazeTable.GetValue(Area,"WALLS")
-		VISITED = MazeTable.GetValue(Area,"VISITED")
 		pos = ConvertPos(int(Area[4:])-1)
-		GemRB.SetMazeEntry(pos, ME_OVERRIDE, OVERRIDE)
-		GemRB.SetMazeEntry(pos, ME_TRAP, TRAPTYPE)
-		GemRB.SetMazeEntry(pos, ME_WALLS, WALLS)
-		GemRB.SetMazeEntry(pos, ME_VISITED, VISITED)
-		if TRAPTYPE>=0:
+		model.Overrides[pos] = MazeTable.GetValue(Area,"OVERRIDE")
+		model.Traps[pos] = TRAPTYPE
+		model.AddWalls (pos, MazeTable.GetValue(Area,"WALLS"))
+		model.Visited[pos] = MazeTable.GetValue(Area,"VISITED")
+		if TRAPTYPE >= 0:
 			traps = traps+1
 
+	header = model.Header
 	#disabling special rooms
-	GemRB.SetMazeData(MH_POS1X, -1)
-	GemRB.SetMazeData(MH_POS1Y, -1)
-	GemRB.SetMazeData(MH_POS2X, -1)
-	GemRB.SetMazeData(MH_POS2Y, -1)
+	header["Pos1X"] = header["Pos1Y"] = -1
+	header["Pos2X"] = header["Pos2Y"] = -1
 	#adding foyer coordinates (middle of bottom)
-	GemRB.SetMazeData(MH_POS3X, size/2)
-	GemRB.SetMazeData(MH_POS3Y, size-1)
+	header["Pos3X"] = size//2
+	header["Pos3Y"] = size-1
 	#adding engine room coordinates (bottom right)
-	GemRB.SetMazeData(MH_POS4X, size-1)
-	GemRB.SetMazeData(MH_POS4Y, size-1)
+	header["Pos4X"] = size-1
+	header["Pos4Y"] = size-1
 	#adding trap
-	GemRB.SetMazeData(MH_TRAPCOUNT, traps)
+	header["TrapCount"] = traps
 	#finish
-	GemRB.SetMazeData(MH_INITED, 1)
-	return
-
-def AddRoom (pos):
-	global rooms
-	global entries
-
-	rooms[len(rooms):]=[pos]
-	entries[pos] = 1
-	return
-
-def MainRoomFits (pos1x, pos1y, pos):
-	global entries
+	header["Inited"] = 1
+	return model
 
+def MainRoomFits (model, entries, dims, pos1x, pos1y, pos):
 	room = pos1x*MAZE_MAX_DIM+pos1y
-	if room==pos:
+	if room == pos:
 		return False
 
 	south = pos1x*MAZE_MAX_DIM+pos1y+1
@@ -132,23 +184,29 @@ def MainRoomFits (pos1x, pos1y, pos):
 		return False
 
 	north = pos1x*MAZE_MAX_DIM+pos1y-1
-	if north==pos:
+	if north == pos:
 		return False
 
-	GemRB.SetMazeEntry(room, ME_WALLS, WALL_SOUTH)
 	entries[room] = 1
 	entries[north] = 1
+	# it mustn't cut off any room from the first one, the maze couldn't grow there
+	if not GrowsEverywhere (entries, dims, pos):
+		entries[room] = 0
+		entries[north] = 0
+		return False
+
+	model.AddWalls (room, WALL_SOUTH)
 	return True
 
-def zeros (size):
-	return size*[0]
+def PrintMaze(model=None):
+	"""Prints the given maze, else the engine's."""
 
-def PrintMaze():
-	header = GemRB.GetMazeHeader()
-	if header==None or header["Inited"]==0:
+	model = model or ReadMaze ()
+	if model == None or model.Header["Inited"] == 0:
 		print("There is no maze or it is not initialized!")
 		return
 
+	header = model.Header
 	MazeX = header["MazeX"]
 	MazeY = header["MazeY"]
 	MainX = header["Pos1X"]
@@ -161,17 +219,14 @@ def PrintMaze():
 	for y in range (MazeY):
 		line = ""
 		for x in range (MazeX):
-			pos = MAZE_MAX_DIM*x+y
-			entry = GemRB.GetMazeEntry(pos)
-			if entry["Walls"]&WALL_NORTH:
+			if model.Walls[MAZE_MAX_DIM*x+y]&WALL_NORTH:
 				line = line + "+ "
 			else:
 				line = line + "+-"
 		print(line + "+")
 		line = ""
 		for x in range (MazeX):
-			pos = MAZE_MAX_DIM*x+y
-			entry = GemRB.GetMazeEntry(pos)
+			entry = model.GetEntry (MAZE_MAX_DIM*x+y)
 			if entry["Walls"]&WALL_WEST:
 				line = line + " "
 			else:
@@ -198,17 +253,12 @@ def ConvertPos (pos):
 	return ((pos&7)<<3)|(pos>>3)
 
 ###################################################
-def CreateMaze ():
-	global max
-	global dims
-	global entries
-	global rooms
+def GenerateMaze (mazedifficulty, Roll=None):
+	"""Generates a random maze without touching the engine's one.
 
-	if GemRB.GetGameVar("EnginInMaze")>0:
-		LoadMazeFrom2da("easymaze")
-		return
+	Roll replaces GemRB.Roll, see MazeCheck.MakeRoll."""
 
-	mazedifficulty = GemRB.GetGameVar("MazeDifficulty")
+	Roll = Roll or GemRB.Roll
 
 	#make sure there are no more traps than rooms
 	#make sure dimensions don't exceed maximum possible
@@ -222,100 +272,96 @@ def CreateMaze ():
 		dims = 8
 		traps = 20
 
-	entries = zeros(MAZE_ENTRY_COUNT)
-	rooms = []
+	model = MazeModel (dims)
+	header = model.Header
+	entries = [0] * MAZE_ENTRY_COUNT
+	rooms = collections.deque ()
 
-	GemRB.SetupMaze(dims, dims)
 	for x in range(dims, MAZE_MAX_DIM):
 		for y in range(dims, MAZE_MAX_DIM):
 			pos = x*MAZE_MAX_DIM+y
 			entries[pos] = 1
 
-	nordomx = GemRB.Roll(1, dims-1, -1)
-	nordomy = GemRB.Roll(1, dims, -1)
+	nordomx = Roll(1, dims-1, -1)
+	nordomy = Roll(1, dims, -1)
 	pos = nordomx*MAZE_MAX_DIM+nordomy
 	entries[pos] = 1
-	GemRB.SetMazeEntry(pos, ME_WALLS, WALL_EAST)
+	model.AddWalls (pos, WALL_EAST)
 	pos = nordomx*MAZE_MAX_DIM+nordomy+MAZE_MAX_DIM
-	AddRoom(pos)
-	if (mazedifficulty>1):
-		GemRB.SetMazeData(MH_POS2X, nordomx)
-		GemRB.SetMazeData(MH_POS2Y, nordomy)
-		pos1x = GemRB.Roll(1, dims, -1)
-		pos1y = GemRB.Roll(1, dims-2, 0)
-		while not MainRoomFits(pos1x, pos1y, pos):
-			pos1x = GemRB.Roll(1, dims, -1)
-			pos1y = GemRB.Roll(1, dims-2, 0)
-		GemRB.SetMazeData(MH_POS1X, pos1x)
-		GemRB.SetMazeData(MH_POS1Y, pos1y)
+	rooms.append (pos)
+	entries[pos] = 1
+	if (mazedifficulty > 1):
+		header["Pos2X"] = nordomx
+		header["Pos2Y"] = nordomy
+		pos1x = Roll(1, dims, -1)
+		pos1y = Roll(1, dims-2, 0)
+		while not MainRoomFits(model, entries, dims, pos1x, pos1y, pos):
+			pos1x = Roll(1, dims, -1)
+			pos1y = Roll(1, dims-2, 0)
+		header["Pos1X"] = pos1x
+		header["Pos1Y"] = pos1y
 	else:
-		GemRB.SetMazeData(MH_POS1X, -1)
-		GemRB.SetMazeData(MH_POS1Y, -1)
-		GemRB.SetMazeData(MH_POS2X, -1)
-		GemRB.SetMazeData(MH_POS2Y, -1)
+		header["Pos1X"] = header["Pos1Y"] = -1
+		header["Pos2X"] = header["Pos2Y"] = -1
 
-	oldentries = entries
 	for i in range(traps):
-		posx = GemRB.Roll(1, dims, -1)
-		posy = GemRB.Roll(1, dims, -1)
+		posx = Roll(1, dims, -1)
+		posy = Roll(1, dims, -1)
 		pos = posx*MAZE_MAX_DIM+posy
 		while entries[pos]:
 			pos = pos + 1
-			if pos>=MAZE_ENTRY_COUNT:
-				posx = 0
-				posy = 0
+			if pos >= MAZE_ENTRY_COUNT:
 				pos = 0
-			else:
-				posx = pos/MAZE_MAX_DIM
-				posy = pos-posx*MAZE_MAX_DIM
-		GemRB.SetMazeEntry(pos, ME_TRAP, GemRB.Roll(1, 3, -1) )
-
-	entries = oldentries
-	while len(rooms)>0:
-		pos = rooms.pop(0)
-		posx = pos/MAZE_MAX_DIM
-		posy = pos-posx*MAZE_MAX_DIM
-		possible = GetPossible(pos)
+		model.Traps[pos] = Roll(1, 3, -1)
+
+	while rooms:
+		pos = rooms.popleft ()
+		possible = GetPossible(entries, dims, pos)
 		plen = len(possible)
-		if plen>0:
-			if plen==1:
+		if plen > 0:
+			if plen == 1:
 				newpos = possible[0]
 			else:
 				#adding item back if we got room to grow
-				AddRoom(pos)
-				newpos = possible[GemRB.Roll(1, plen, -1) ]
-			if entries[newpos]==0:
+				rooms.append (pos)
+				newpos = possible[Roll(1, plen, -1)]
+			if entries[newpos] == 0:
 				if newpos+1 == pos:
-					GemRB.SetMazeEntry(pos, ME_WALLS, WALL_NORTH)
+					model.AddWalls (pos, WALL_NORTH)
 				elif pos+1 == newpos:
-					GemRB.SetMazeEntry(pos, ME_WALLS, WALL_SOUTH)
+					model.AddWalls (pos, WALL_SOUTH)
 				elif pos+MAZE_MAX_DIM == newpos:
-					GemRB.SetMazeEntry(pos, ME_WALLS, WALL_EAST)
+					model.AddWalls (pos, WALL_EAST)
 				elif newpos+MAZE_MAX_DIM == pos:
-					GemRB.SetMazeEntry(pos, ME_WALLS, WALL_WEST)
+					model.AddWalls (pos, WALL_WEST)
 				else:
 					print("Something went wrong at pos: ", pos, " newpos: ", newpos)
-				AddRoom(newpos)
+				rooms.append (newpos)
+				entries[newpos] = 1
 
 	#adding foyer coordinates
-	x = GemRB.Roll(1,dims,-1)
-	while x!=nordomx and dims-1!=nordomy:
-		x=GemRB.Roll(1,dims,-1)
-
-	GemRB.SetMazeData(MH_POS3X, GemRB.Roll(1,dims,-1) )
-	GemRB.SetMazeData(MH_POS3Y, dims-1)
+	header["Pos3X"] = Roll(1,dims,-1)
+	header["Pos3Y"] = dims-1
 
 	#setting engine room coordinates to hidden (accessible from foyer)
-	GemRB.SetMazeData(MH_POS4X, -1)
-	GemRB.SetMazeData(MH_POS4Y, -1)
+	header["Pos4X"] = header["Pos4Y"] = -1
 	#adding traps
-	GemRB.SetMazeData(MH_TRAPCOUNT, traps)
+	header["TrapCount"] = traps
 	#finish
-	GemRB.SetMazeData(MH_INITED, 1)
+	header["Inited"] = 1
+	return model
+
+def CreateMaze ():
+	if GemRB.GetGameVar("EnginInMaze") > 0:
+		model = LoadMazeFrom2da("easymaze")
+	else:
+		model = GenerateMaze (GemRB.GetGameVar("MazeDifficulty"))
+	if model:
+		model.Commit ()
 	return
 
 def FormatAreaName(pos):
-	if pos<9:
+	if pos < 9:
 		return "AR130"+str(pos+1)
 	return "AR13"+str(pos+1)
 
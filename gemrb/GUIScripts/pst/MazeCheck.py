@@ -0,0 +1,95 @@
+# GemRB - Infinity Engine Emulator
+# Copyright (C) 2026 The GemRB Project
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+
+# MazeCheck.py - verification of the modron maze generator in Maze.py
+# it only works on local maze models, so it leaves the game's maze alone:
+#   import MazeCheck; MazeCheck.Benchmark ()
+# in the console of a pst game generates and checks a batch of mazes
+
+import collections
+import random
+import time
+
+from maze_defs import *
+import Maze
+
+def MakeRoll (seed=None):
+	"""Returns a seeded replacement for GemRB.Roll, for reproducible mazes."""
+
+	rng = random.Random (seed)
+	def Roll (dice, size, add):
+		return sum (rng.randint (1, size) for i in range (dice)) + add
+	return Roll
+
+def CheckMaze (model):
+	"""Returns the problems of a generated maze, an empty list for a good one."""
+
+	problems = []
+	dims = model.Dims
+	header = model.Header
+	blocked = set ()
+	if header["Pos1X"] >= 0:
+		# the cell north of the wizard's lair is left out of the maze
+		blocked.add (header["Pos1X"]*MAZE_MAX_DIM+header["Pos1Y"]-1)
+
+	cells = [x*MAZE_MAX_DIM+y for x in range(dims) for y in range(dims)]
+	for pos in cells:
+		walls = model.Walls[pos]
+		for bit, back, step in ((WALL_SOUTH, WALL_NORTH, 1), (WALL_EAST, WALL_WEST, MAZE_MAX_DIM)):
+			if walls & bit:
+				other = pos + step
+				if other not in cells:
+					problems.append ("exit out of the maze at %d" % pos)
+				elif not model.Walls[other] & back:
+					problems.append ("one sided exit between %d and %d" % (pos, other))
+		trap = model.Traps[pos]
+		if trap is not None and not 0 <= trap <= 2:
+			problems.append ("bad trap %d at %d" % (trap, pos))
+
+	# every other cell is reachable
+	start = cells[0] if not blocked or cells[0] not in blocked else cells[1]
+	seen = set ([start])
+	frontier = collections.deque ([start])
+	while frontier:
+		pos = frontier.popleft ()
+		walls = model.Walls[pos]
+		for bit, step in ((WALL_SOUTH, 1), (WALL_NORTH, -1), (WALL_EAST, MAZE_MAX_DIM), (WALL_WEST, -MAZE_MAX_DIM)):
+			if walls & bit and pos + step not in seen:
+				seen.add (pos + step)
+				frontier.append (pos + step)
+	unreachable = set (cells) - seen - blocked
+	if unreachable:
+		problems.append ("unreachable cells: " + str (sorted (unreachable)))
+	return problems
+
+def Benchmark (count=1000, seed=0, mazedifficulty=2):
+	"""Generates and checks count mazes without the engine, printing the rate."""
+
+	Roll = MakeRoll (seed)
+	start = time.perf_counter ()
+	for i in range (count):
+		model = Maze.GenerateMaze (mazedifficulty, Roll)
+	generated = time.perf_counter () - start
+
+	bad = 0
+	Roll = MakeRoll (seed)
+	for i in range (count):
+		if CheckMaze (Maze.GenerateMaze (mazedifficulty, Roll)):
+			bad += 1
+	print ("%d mazes in %.3f s (%.0f/s), %d failed the checks" % (count, generated, count / generated, bad))
+	return bad
@@ -18,7 +18,7 @@
 
 import GemRB
 from ie_restype import *
-from AutodetectCommon import CheckFiles
+from AutodetectCommon import AddSignature
 
 # NB: python insists on at least two entries
 files = (
@@ -26,5 +26,4 @@ files = (
 	("PALETTE0", "PNG", RES_PNG)
 )
 
-if CheckFiles (files):
-	GemRB.AddGameTypeHint ("test", 110)
+AddSignature ("test", 110, files)
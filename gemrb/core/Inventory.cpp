@@ -165,6 +165,9 @@ void Inventory::AddItem(CREItem *item)
 
 void Inventory::CalculateWeight()
 {
+	if (Owner) {
+		Owner->BumpStatsRevision();
+	}
 	Weight = 0;
 	for (const auto slot : Slots) {
 		if (!slot) {
@@ -1332,6 +1335,7 @@ void Inventory::SetEquipped(ieWordSigned slot, ieWord header)
 
 void Inventory::CacheAllWeaponInfo() const
 {
+	Owner->BumpStatsRevision();
 	CacheWeaponInfo(false);
 	if (Owner->IsDualWielding()) {
 		CacheWeaponInfo(true);
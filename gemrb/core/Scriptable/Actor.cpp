@@ -393,6 +393,23 @@ void Actor::SetDefaultActions(int qslot, ieByte slot1, ieByte slot2, ieByte slot
 	DefaultButtons[2]=slot3;
 }
 
+// the portrait window memoizes the name and icons of each pc, so tell it when they change
+static void InvalidatePortrait(const Actor* actor)
+{
+	if (!actor->InParty) return;
+
+	ScriptEngine::FunctionParameters params;
+	params.push_back(ScriptEngine::Parameter(actor->InParty));
+	core->GetGUIScriptEngine()->RunFunction("GUICommonWindows", "InvalidatePortraitStates", params, false);
+	core->SetEventFlag(EF_PORTRAIT);
+}
+
+void Actor::BumpStatsRevision()
+{
+	static ieDword lastRevision = 0;
+	StatsRevision = ++lastRevision;
+}
+
 void Actor::SetName(String str, unsigned char type)
 {
 	String* name = nullptr;
@@ -407,6 +424,7 @@ void Actor::SetName(String str, unsigned char type)
 	if (type == 0) {
 		LongName = ShortName;
 	}
+	InvalidatePortrait(this);
 }
 
 void Actor::SetName(ieStrRef strref, unsigned char type)
@@ -2454,6 +2472,7 @@ bool Actor::SetStat(unsigned int StatIndex, stat_t Value, int pcf)
 		Modified[StatIndex] = Value;
 	}
 	if (previous!=Value) {
+		BumpStatsRevision();
 		if (pcf) {
 			PostChangeFunctionType f = post_change_functions[StatIndex];
 			if (f) {
@@ -2762,6 +2781,7 @@ void Actor::RefreshEffects(bool first, const stats_t& previous)
 
 	for (int i=0; i < MAX_STATS; ++i) {
 		if (first || Modified[i]!=previous[i]) {
+			BumpStatsRevision();
 			PostChangeFunctionType f = post_change_functions[i];
 			if (f) {
 				(*f)(this, previous[i], Modified[i]);
@@ -2801,6 +2821,8 @@ void Actor::RefreshEffects(bool first, const stats_t& previous)
 	if (PCStats && PCStats->States != previousStates) {
 		core->SetEventFlag(EF_PORTRAIT);
 		previousStates = PCStats->States;
+		BumpStatsRevision();
+		InvalidatePortrait(this);
 	}
 	if (Immobile()) {
 		timeStartStep = game->Ticks;
@@ -5904,6 +5926,7 @@ int Actor::LearnSpell(const ResRef& spellname, ieDword flags, int bookmask, int
 		bookmask = GetBookMask();
 	}
 	int explev = spellbook.LearnSpell(spell, flags&LS_MEMO, bookmask, kit, level);
+	BumpStatsRevision();
 	HCStrings message = HCStrings::count;
 	if (flags&LS_LEARN) {
 		core->GetTokenDictionary()->SetAt("SPECIALABILITYNAME", core->GetString(spell->SpellName));
@@ -360,6 +360,10 @@ public:
 
 	PCStatsStruct* PCStats = nullptr;
 	PCStatsStruct::StateArray previousStates;
+	// renewed whenever the stats, equipment, spells or portrait states change,
+	// so the GUI can tell when its per-actor summaries need rebuilding;
+	// the values are unique across actors
+	ieDword StatsRevision = 0;
 	ResRef SmallPortrait;
 	ResRef LargePortrait;
 	/** 0: NPC, 1-8 party slot */
@@ -636,6 +640,8 @@ public:
 	{
 		return attackProjectile;
 	}
+	/* gives StatsRevision a new value */
+	void BumpStatsRevision();
 	void SetName(String str, unsigned char type);
 	void SetName(ieStrRef strref, unsigned char type);
 	/* Returns by how much movement speed should be divided to account for loot weight */
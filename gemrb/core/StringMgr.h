@@ -59,6 +59,7 @@ enum class STRING_FLAGS : uint32_t {
 	SPEECH			= 4,
 	ALLOW_ZERO		= 8, // 0 strref is allowed
 	RESOLVE_TAGS	= 16,
+	RAW				= 32, // don't resolve tags, even for strings marked for it
 	STRREFOFF		= 256,
 };
 
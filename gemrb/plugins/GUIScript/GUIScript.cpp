@@ -482,6 +482,8 @@ level value without a token, you'll need this.\n\
     * 1   - display strrefs on\n\
     * 2   - play attached sound\n\
     * 4   - speech (stop previous sound)\n\
+    * 16  - resolve tags\n\
+    * 32  - raw, don't resolve any tags\n\
     * 256 - strref off (overrides cfg)\n\
 \n\
 **Return value:** A string with resolved tokens.\
@@ -2456,6 +2458,49 @@ static PyObject* GemRB_View_SetFlags(PyObject* self, PyObject* args)
 	RETURN_BOOL(view->SetFlags( Flags, Operation ));
 }
 
+PyDoc_STRVAR( GemRB_View_RefreshAttributes__doc,
+"===== View_RefreshAttributes =====\n\
+\n\
+**Prototype:** View_RefreshAttributes (GView)\n\
+\n\
+**Metaclass Prototype:** RefreshAttributes ()\n\
+\n\
+**Description:** Copies the current state of a View into the attributes set \n\
+when its object was constructed: Flags, for controls also VarName and Value \n\
+and for windows HasFocus. Used for objects kept around between lookups.\n\
+\n\
+**Parameters:**\n\
+  * GView - the view's reference\n\
+\n\
+**Return value:** boolean, false if the view doesn't exist anymore"
+);
+
+static PyObject* GemRB_View_RefreshAttributes(PyObject* self, PyObject* args)
+{
+	PARSE_ARGS( args, "O", &self );
+
+	const View* view = GetView<View>(self);
+	if (!view) {
+		Py_RETURN_FALSE;
+	}
+	PyObject_SetAttrString(self, "Flags", DecRef(PyLong_FromLong, view->Flags()));
+
+	const Control* ctl = dynamic_cast<const Control*>(view);
+	const Window* win = dynamic_cast<const Window*>(view);
+	if (ctl) {
+		PyObject_SetAttrString(self, "VarName", DecRef(PyString_FromStringView, ctl->DictVariable()));
+		Control::value_t val = ctl->GetValue();
+		if (val == Control::INVALID_VALUE) {
+			PyObject_SetAttrString(self, "Value", Py_None);
+		} else {
+			PyObject_SetAttrString(self, "Value", DecRef(PyLong_FromUnsignedLong, val));
+		}
+	} else if (win) {
+		PyObject_SetAttrString(self, "HasFocus", DecRef(PyBool_FromLong, win->HasFocus()));
+	}
+	Py_RETURN_TRUE;
+}
+
 PyDoc_STRVAR( GemRB_View_SetResizeFlags__doc,
 "===== View_SetResizeFlags =====\n\
 \n\
@@ -6337,6 +6382,34 @@ static PyObject* GemRB_SetPlayerStat(PyObject * /*self*/, PyObject* args)
 	Py_RETURN_NONE;
 }
 
+PyDoc_STRVAR( GemRB_GetPlayerRevision__doc,
+"===== GetPlayerRevision =====\n\
+\n\
+**Prototype:** GemRB.GetPlayerRevision (globalID)\n\
+\n\
+**Description:** Returns a counter that grows whenever the actor's stats, \n\
+equipment, known spells or portrait states change. The values are unique \n\
+across actors, so scripts can compare it to a stored one to tell if \n\
+something built from these is still current.\n\
+\n\
+**Parameters:**\n\
+  * globalID - party ID or global ID of the actor to use\n\
+\n\
+**Return value:** numeric\n\
+\n\
+**See also:** [GetPlayerStat](GetPlayerStat.md), [GetPlayerStates](GetPlayerStates.md)"
+);
+
+static PyObject* GemRB_GetPlayerRevision(PyObject * /*self*/, PyObject* args)
+{
+	int globalID;
+	PARSE_ARGS( args,  "i", &globalID );
+	GET_GAME();
+	GET_ACTOR_GLOBAL();
+
+	return PyLong_FromLong(actor->StatsRevision);
+}
+
 PyDoc_STRVAR( GemRB_GetPlayerScript__doc,
 "===== GetPlayerScript =====\n\
 \n\
@@ -9663,6 +9736,8 @@ PyDoc_STRVAR( GemRB_GetSystemVariable__doc,
     * SV_GAMEPATH = 3 - game path\n\
     * SV_TOUCH = 4 - are we using touch input mode?\n\
     * SV_SAVEPATH = 5 - path to the parent of save/mpsave/bpsave dir\n\
+    * SV_OVERRIDEPATH = 6 - the game's override dir\n\
+    * SV_CDPATHS = 7 - tuple of the data dirs of all the CDs, as searched for resources\n\
 \n\
 **Return value:** This function returns -1 if the index is invalid.\n\
 \n\
@@ -9682,6 +9757,22 @@ static PyObject* GemRB_GetSystemVariable(PyObject * /*self*/, PyObject* args)
 		case SV_GAMEPATH: strlcpy(path, core->config.GamePath, _MAX_PATH); break;
 		case SV_TOUCH: value = EventMgr::TouchInputEnabled; break;
 		case SV_SAVEPATH: strlcpy(path, core->config.SavePath, _MAX_PATH); break;
+		case SV_OVERRIDEPATH: PathJoin(path, core->config.GamePath, core->config.GameOverridePath, nullptr); break;
+		case SV_CDPATHS:
+			{
+				PyObject* paths = PyList_New(0);
+				for (const auto& cd : core->config.CD) {
+					for (const std::string& cdPath : cd) {
+						PathJoin(path, cdPath.c_str(), core->config.GameDataPath, nullptr);
+						PyObject* pyPath = PyString_FromString(path);
+						PyList_Append(paths, pyPath);
+						Py_DECREF(pyPath);
+					}
+				}
+				PyObject* ret = PyList_AsTuple(paths);
+				Py_DECREF(paths);
+				return ret;
+			}
 		default: value = -1; break;
 	}
 	if (path[0]) {
@@ -13190,6 +13281,7 @@ static PyMethodDef GemRBMethods[] = {
 	METHOD(GetPlayerPortrait, METH_VARARGS),
 	METHOD(GetPlayerStat, METH_VARARGS),
 	METHOD(GetPlayerStates, METH_VARARGS),
+	METHOD(GetPlayerRevision, METH_VARARGS),
 	METHOD(GetPlayerScript, METH_VARARGS),
 	METHOD(GetPlayerSound, METH_VARARGS),
 	METHOD(GetPlayerString, METH_VARARGS),
@@ -13353,6 +13445,7 @@ static PyMethodDef GemRBInternalMethods[] = {
 	METHOD(View_AddAlias, METH_VARARGS),
 	METHOD(View_AddSubview, METH_VARARGS),
 	METHOD(View_GetFrame, METH_VARARGS),
+	METHOD(View_RefreshAttributes, METH_VARARGS),
 	METHOD(View_SetBackground, METH_VARARGS),
 	METHOD(View_SetEventProxy, METH_VARARGS),
 	METHOD(View_SetFrame, METH_VARARGS),
@@ -13409,6 +13502,35 @@ PyDoc_STRVAR( GemRB_internal__doc,
 PyMODINIT_FUNC PyInit__GemRB();
 PyMODINIT_FUNC PyInit_GemRB();
 
+// the metaclasses bind the _GemRB methods directly, so these are called through
+// a shim that adds the docs of the method to the errors it raises
+static PyObject* CallInternalMethod(PyObject* self, PyObject* args)
+{
+	const PyMethodDef* method = static_cast<const PyMethodDef*>(PyCapsule_GetPointer(self, nullptr));
+	PyObject* ret = method->ml_meth(nullptr, args);
+	if (ret || !method->ml_doc || !PyErr_Occurred()) {
+		return ret;
+	}
+
+	PyObject* type;
+	PyObject* value;
+	PyObject* traceback;
+	PyErr_Fetch(&type, &value, &traceback);
+	PyErr_NormalizeException(&type, &value, &traceback);
+	PyObject* msg = value ? PyObject_Str(value) : nullptr;
+	if (!msg) {
+		PyErr_Clear();
+		PyErr_Restore(type, value, traceback);
+		return nullptr;
+	}
+	PyErr_Format(type, "%U\nMethod Docs:\n%s", msg, method->ml_doc);
+	Py_DECREF(msg);
+	Py_XDECREF(type);
+	Py_XDECREF(value);
+	Py_XDECREF(traceback);
+	return nullptr;
+}
+
 PyMODINIT_FUNC
 PyInit__GemRB()
 {
@@ -13417,13 +13539,37 @@ PyInit__GemRB()
 		"_GemRB",     /* m_name */
 		GemRB_internal__doc,  /* m_doc */
 		-1,                  /* m_size */
-		GemRBInternalMethods,    /* m_methods */
+		NULL,                /* m_methods */
 		NULL,                /* m_reload */
 		NULL,                /* m_traverse */
 		NULL,                /* m_clear */
 		NULL,                /* m_free */
 	};
-	return PyModule_Create(&moddef);
+	static std::vector<PyMethodDef> shims;
+
+	PyObject* module = PyModule_Create(&moddef);
+	if (!module) {
+		return nullptr;
+	}
+	PyObject* moduleName = PyModule_GetNameObject(module);
+	shims.clear();
+	for (const PyMethodDef* method = GemRBInternalMethods; method->ml_name; ++method) {
+		shims.push_back({ method->ml_name, CallInternalMethod, method->ml_flags, method->ml_doc });
+	}
+	// the vector doesn't grow anymore, so the definitions keep their addresses
+	for (size_t i = 0; i < shims.size(); ++i) {
+		PyObject* capsule = PyCapsule_New(&GemRBInternalMethods[i], nullptr, nullptr);
+		PyObject* func = capsule ? PyCFunction_NewEx(&shims[i], capsule, moduleName) : nullptr;
+		Py_XDECREF(capsule);
+		if (!func || PyModule_AddObject(module, shims[i].ml_name, func) < 0) {
+			Py_XDECREF(func);
+			Py_XDECREF(moduleName);
+			Py_DECREF(module);
+			return nullptr;
+		}
+	}
+	Py_XDECREF(moduleName);
+	return module;
 }
 
 PyMODINIT_FUNC
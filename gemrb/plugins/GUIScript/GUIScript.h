@@ -35,7 +35,9 @@ enum {
    SV_HEIGHT,
    SV_GAMEPATH,
    SV_TOUCH,
-   SV_SAVEPATH
+   SV_SAVEPATH,
+   SV_OVERRIDEPATH,
+   SV_CDPATHS
 };
 
 class GUIScript : public ScriptEngine {
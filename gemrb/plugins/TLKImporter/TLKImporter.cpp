@@ -375,7 +375,7 @@ String TLKImporter::GetString(ieStrRef strref, STRING_FLAGS flags)
 		}
 	}
 
-	if (bool(flags & STRING_FLAGS::RESOLVE_TAGS) || (type & 4)) {
+	if (!(flags & STRING_FLAGS::RAW) && (bool(flags & STRING_FLAGS::RESOLVE_TAGS) || (type & 4))) {
 		string = ResolveTags(string);
 	}
 	if (type & 2 && bool(flags & STRING_FLAGS::SOUND) && !SoundResRef.IsEmpty()) {